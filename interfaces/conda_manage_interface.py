@@ -1,18 +1,19 @@
 # interfaces/conda_manage_interface.py
+import time
 from pathlib import Path
+from PySide6.QtCore import QTimer
 from qfluentwidgets import LineEdit, PushButton
-from typing import Any, Self, List, Dict, Optional
+from typing import Any, Self, List, Dict, Mapping, Optional, Set
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout
 
-from utils.style_util import green_style
+from utils.style_util import Style, green_style
 from interfaces.interface import Interface
-from utils import config_util, gui_util, delay_util
+from utils import config_util, gui_util, delay_util, env_sync_util, inventory_util, process_util
 from utils.platform_util import is_windows, is_linux, run_command
 
 
-group_style: str = green_style.get_groupbox_style()
-button_style: str = green_style.get_button_style()
-lable_style: str = green_style.get_lable_style()
+# 页面配色, 由全局样式表按动态属性应用
+page_style: Style = green_style
 
 config_path: Path = config_util.config_path
 environment_yaml_path: Path = Path("./environment.yml")
@@ -25,18 +26,18 @@ class CondaManageInterface(Interface):
         self.setObjectName("CondaManageInterface")
         # 初始化 UI
         self.init_ui()
+        # 修改后自动保存被修改的项: 项目版本写入 pyproject.toml, 其余写入 environment.yml
+        self.config_sections = {"project": (config_path, "project"), "environment": (environment_yaml_path, "")}
+        self.autosaver = gui_util.AutoSaver(self, self.save_ui_to_config)
+        self.autosaver.watch("project", "version", self.project_version_input)
+        self.autosaver.watch("environment", "name", self.env_name_input)
+        for widget in [self.python_version_input, self.conda_container, self.pip_container]:
+            self.autosaver.watch("environment", "dependencies", widget)
         # 加载配置到 UI
         self.load_config_to_ui()
         # 延时变量
         self.delay_variables: Dict[str, Any] = {
-            "conda_version": {
-                "var": None,
-                "object": self.conda_version_label,
-                "command": ["conda", "--version"],
-                "prefix": "Conda Version: ",
-                "err": "未找到, 请确保 Conda 已安装",
-                "operate": delay_util.set_label_text,
-            },
+            "conda_version": delay_util.create_delay_var("conda_version", self.conda_version_label),
         }
 
     def init_ui(self: Self) -> None:
@@ -45,53 +46,84 @@ class CondaManageInterface(Interface):
         # 标题区域
         self.title_label: QLabel = gui_util.LabelBuilder.create(self.content_widget, self.main_layout, content="Conda 环境管理")
         # 信息区域
-        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=group_style)
+        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=page_style)
         info_layout: QVBoxLayout = QVBoxLayout(info_group)
-        self.conda_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=lable_style)
+        self.conda_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=page_style)
         # 操作区域
-        action_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "操作", style=group_style)
+        action_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "操作", style=page_style)
         action_layout: QVBoxLayout = QVBoxLayout(action_group)
         action_btn_layout: QHBoxLayout = QHBoxLayout()
         action_layout.addLayout(action_btn_layout)
         action_btn_layout.addStretch()
-        self.build_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "构建环境", slot=self.build_env, style=button_style)
-        self.save_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "保存配置", slot=self.save_ui_to_config, style=button_style)
-        self.activate_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "激活环境", slot=self.activate_venv, style=button_style)
-        self.export_pip_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "导出 requirements", slot=self.export_requirements, style=button_style)
-        self.export_conda_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "导出 environment.yml", slot=self.export_environment, style=button_style)
+        self.build_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "构建环境", slot=self.build_env, style=page_style)
+        self.save_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "保存配置", slot=lambda: self.save_ui_to_config(), style=page_style)
+        self.activate_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "激活环境", slot=self.activate_venv, style=page_style)
+        self.export_pip_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "导出 requirements", slot=self.export_requirements, style=page_style)
+        self.export_conda_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "导出 environment.yml", slot=self.export_environment, style=page_style)
+        self.export_spec_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, f"导出 {inventory_util.SPEC_FILE_NAME}", slot=self.export_spec, style=page_style)
         action_btn_layout.addStretch()
         # 环境参数区域
-        env_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "环境参数", style=group_style)
+        env_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "环境参数", style=page_style)
         env_layout: QVBoxLayout = QVBoxLayout(env_group)
-        self.env_name_input: LineEdit = gui_util.InputBuilder.create(self, env_layout, "环境名称", "输入环境名称(默认: .venv)", lable_style=lable_style)
-        self.python_version_input: LineEdit = gui_util.InputBuilder.create(self, env_layout, "Python 版本", "输入 Python 版本(默认: 3.10)", lable_style=lable_style)
+        self.env_name_input: LineEdit = gui_util.InputBuilder.create(self, env_layout, "环境名称", "输入环境名称(默认: .venv)", lable_style=page_style)
+        self.python_version_input: LineEdit = gui_util.InputBuilder.create(self, env_layout, "Python 版本", "输入 Python 版本(默认: 3.10)", lable_style=page_style)
         # 项目元数据区域
-        metadata_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "项目元数据", style=group_style)
+        metadata_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "项目元数据", style=page_style)
         metadata_layout: QVBoxLayout = QVBoxLayout(metadata_group)
-        self.project_version_input: LineEdit = gui_util.InputBuilder.create(self, metadata_layout, "项目版本", "输入项目版本(例如: 0.0.1)", lable_style=lable_style)
+        self.project_version_input: LineEdit = gui_util.InputBuilder.create(self, metadata_layout, "项目版本", "输入项目版本(例如: 0.0.1)", lable_style=page_style)
         # pip 包管理区域
-        pip_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "pip 包管理", style=group_style)
+        pip_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "pip 包管理", style=page_style)
         pip_layout: QVBoxLayout = QVBoxLayout(pip_group)
         self.pip_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, pip_layout, "输入 pip 包名")
-        self.pip_add_btn: PushButton = gui_util.ButtonBuilder.create(self, pip_layout, "添加", slot=lambda: self.pip_container.add_row(""), style=green_style.get_button_style())
+        self.pip_add_btn: PushButton = gui_util.ButtonBuilder.create(self, pip_layout, "添加", slot=lambda: self.pip_container.add_row(""), style=green_style)
         # conda 包管理区域
-        conda_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "conda 包管理", style=group_style)
+        conda_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "conda 包管理", style=page_style)
         conda_layout: QVBoxLayout = QVBoxLayout(conda_group)
         self.conda_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, conda_layout, "输入 conda 包名")
-        self.conda_add_btn: PushButton = gui_util.ButtonBuilder.create(self, conda_layout, "添加", slot=lambda: self.conda_container.add_row(""), style=green_style.get_button_style())
+        self.conda_add_btn: PushButton = gui_util.ButtonBuilder.create(self, conda_layout, "添加", slot=lambda: self.conda_container.add_row(""), style=green_style)
+        # 已安装的包区域
+        inventory_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "已安装的包", style=page_style)
+        inventory_layout: QVBoxLayout = QVBoxLayout(inventory_group)
+        self.inventory_label: QLabel = gui_util.LabelBuilder.create(self, inventory_layout, style=page_style)
+        self.inventory_table: gui_util.SortableTableView = gui_util.TableBuilder.create(self, inventory_layout, ["名称", "版本", "安装者", "大小"], min_height=300)
+        self.refresh_inventory_btn: PushButton = gui_util.ButtonBuilder.create(self, inventory_layout, "刷新", slot=self.refresh_inventory, style=page_style)
+        # 输出区域
+        self.attach_console(style=page_style)
+
+    def showEvent(self: Self, event: Any) -> None:
+        """显示时刷新包清单(目录未变化时直接使用缓存)"""
+        super().showEvent(event)
+        QTimer.singleShot(0, self.refresh_inventory)
+
+    def refresh_inventory(self: Self) -> None:
+        """读取当前环境的包清单"""
+
+        start: float = time.perf_counter()
+        inventory: inventory_util.Inventory = inventory_util.package_inventory.get(self.get_env_prefix())
+        self.inventory_label.setText(inventory_util.format_summary(inventory, time.perf_counter() - start))
+        self.inventory_table.set_rows(inventory_util.get_rows(inventory))
 
-    def load_config_to_ui(self: Self) -> None:
-        """从配置文件加载数据到 UI"""
+    def load_config_to_ui(self: Self, force: bool = False) -> None:
+        """从配置文件加载数据到 UI, 配置文件自上次加载或保存后未变化时跳过"""
+
+        if not force and not self.is_config_stale():
+            return
+        with self.autosaver.suspend():
+            self._load_config_to_ui()
+        self.mark_config_synced()
+
+    def _load_config_to_ui(self: Self) -> None:
+        """将配置写入各控件"""
 
         # 加载项目元数据
         if config_path.exists():
-            config: Dict[str, Any] = config_util.load_toml(config_path)
+            config: Mapping[str, Any] = config_util.config_store.view()
             # 加载项目版本
             if "project" in config and "version" in config["project"]:
                 self.project_version_input.setText(config["project"]["version"])
         # 加载环境配置
         if environment_yaml_path.exists():
-            config: Dict[str, Any] = config_util.load_yaml(environment_yaml_path)
+            config: Mapping[str, Any] = config_util.config_store.view(environment_yaml_path)
             # 设置环境名称
             env_name: str = config.get("name", ".venv")
             self.env_name_input.setText(env_name)
@@ -112,28 +144,39 @@ class CondaManageInterface(Interface):
             # 添加 pip 包
             pip_packages: List[str] = []
             for dep in config.get("dependencies", []):
-                if isinstance(dep, dict) and "pip" in dep:
+                if isinstance(dep, Mapping) and "pip" in dep:
                     for pip_dep in dep["pip"]:
                         pip_packages.append(pip_dep)
             self.pip_container.set_items(pip_packages)
 
-    def save_ui_to_config(self: Self) -> None:
-        """将当前UI状态保存到配置文件"""
+    def save_ui_to_config(self: Self, dirty: Optional[Dict[str, Set[str]]] = None) -> None:
+        """将当前UI状态保存到配置文件, dirty 为 None 时完整保存, 否则只写入被修改的项"""
 
+        full: bool = dirty is None or not all(path.exists() for path in self.config_paths)
+        if full:
+            self.autosaver.reset()
+            dirty = {"project": {"version"}, "environment": {"name", "dependencies"}}
         # 保存项目元数据到 pyproject.toml
         if not config_path.exists():
             self.init_project()
-        config: Dict[str, Any] = config_util.load_toml(config_path)
-        # 更新项目版本
-        config["project"]["version"] = self.get_project_version()
-        config_util.save_toml(config, config_path)
+        if "project" in dirty:
+            config: Dict[str, Any] = config_util.load_toml(config_path)
+            # 更新项目版本
+            config.setdefault("project", {})["version"] = self.get_project_version()
+            config_util.save_toml(config, config_path)
         # 保存环境配置到 environment.yml
-        environment_yaml: Dict[str, Any] = config_util.load_yaml(environment_yaml_path)
-        # 只更新环境构建部分
-        environment_yaml.update({"name": self.get_env_name(), "dependencies": self.collect_dependencies()})
-        config_util.save_yaml(environment_yaml, environment_yaml_path)
-        self.load_config_to_ui()
-        gui_util.MessageDisplay.success(self, "保存配置成功")
+        if "environment" in dirty:
+            environment_yaml: Dict[str, Any] = config_util.load_yaml(environment_yaml_path)
+            # 只更新环境构建部分
+            if "name" in dirty["environment"]:
+                environment_yaml["name"] = self.get_env_name()
+            if "dependencies" in dirty["environment"]:
+                environment_yaml["dependencies"] = self.collect_dependencies()
+            config_util.save_yaml(environment_yaml, environment_yaml_path)
+        # 写入的内容即 UI 当前状态, 无需重新加载
+        self.mark_config_synced()
+        if full:
+            gui_util.MessageDisplay.success(self, "保存配置成功")
 
     def collect_dependencies(self) -> list:
         """收集所有依赖项"""
@@ -148,20 +191,24 @@ class CondaManageInterface(Interface):
         return deps
 
     def build_env(self: Self) -> None:
-        """构建环境"""
+        """构建环境, 环境已与 environment.yml 一致时询问是否仍要构建"""
 
         # 获取参数
         env_name: str = self.get_env_name()
-        # 保存到配置
-        self.save_ui_to_config()
+        # 写入尚未保存的修改
+        self.flush_config()
+        in_sync, reason = env_sync_util.check(Path.cwd() / env_name, env_sync_util.get_conda_inputs(environment_yaml_path))
+        if in_sync and not gui_util.MessageDisplay.confirm(self, "环境已是最新", f"{reason}, 仍要运行 conda env create?", yes_text="强制构建"):
+            return
         # 执行命令
-        gui_util.MessageDisplay.info(self, "开始环境构建")
-        command: str = ""
-        if is_windows():
-            command = f'conda env create --file "{environment_yaml_path}" --prefix ".\\{env_name}"'
-        elif is_linux():
-            command = f'conda env create --file "{environment_yaml_path}" --prefix "./{env_name}"'
-        run_command(command)
+        self.run_job("环境构建", [["conda", "env", "create", "--file", str(environment_yaml_path), "--prefix", str(Path(".") / env_name)]], cpus=1, on_finish=lambda job: self.on_build_finished(job, env_name))
+
+    def on_build_finished(self: Self, job: process_util.Job, env_name: str) -> None:
+        """构建成功后在环境中记录本次的 environment.yml 与包清单"""
+
+        if job.state == process_util.JobState.SUCCEEDED:
+            env_sync_util.record(Path.cwd() / env_name, env_sync_util.get_conda_inputs(environment_yaml_path))
+        self.refresh_inventory()
 
     def activate_venv(self: Self) -> None:
         """激活环境"""
@@ -180,25 +227,29 @@ class CondaManageInterface(Interface):
             else:
                 script: Path = Path.cwd() / env_name / "bin" / "activate"
             command = f'source "{script}"'
+        # 激活依赖 shell 内建命令, 仍通过 shell 执行
         run_command(command)
 
     def export_requirements(self: Self) -> None:
-        """导出依赖 requirements.txt"""
+        """导出依赖 requirements.txt, 直接读取环境中的包元数据"""
 
-        env_name: str = self.get_env_name()
-        gui_util.MessageDisplay.info(self, "开始导出 requirements.txt")
-        command: str = ""
-        if is_windows():
-            python_path: Path = Path.cwd() / env_name / "Scripts" / "python.exe"
-            command = f'"{python_path}" -m pip freeze > ./requirements.txt'
-        elif is_linux():
-            conda_envs: Path = Path.home() / ".conda" / "envs" / env_name
-            if conda_envs.exists():
-                python_path: Path = conda_envs / "bin" / "python"
-            else:
-                python_path: Path = Path.cwd() / env_name / "bin" / "python"
-            command = f'"{python_path}" -m pip freeze > ./requirements.txt'
-        run_command(command)
+        inventory: inventory_util.Inventory = inventory_util.package_inventory.get(self.get_env_prefix())
+        if not inventory.distributions:
+            gui_util.MessageDisplay.error(self, f"未找到环境 {self.get_env_name()} 中已安装的 Python 包")
+            return
+        config_util.atomic_write(Path("./requirements.txt"), inventory.format_requirements())
+        gui_util.MessageDisplay.success(self, f"已导出 {len(inventory.distributions)} 个包到 requirements.txt")
+
+    def export_spec(self: Self) -> None:
+        """导出显式 conda spec(含下载地址与 md5, conda create --file 可精确重建环境)"""
+
+        inventory: inventory_util.Inventory = inventory_util.package_inventory.get(self.get_env_prefix())
+        spec: str = inventory.format_conda_spec()
+        if not spec:
+            gui_util.MessageDisplay.error(self, f"未找到环境 {self.get_env_name()} 中的 conda 包")
+            return
+        config_util.atomic_write(Path(".") / inventory_util.SPEC_FILE_NAME, spec)
+        gui_util.MessageDisplay.success(self, f"已导出 {len(inventory.conda_packages)} 个包到 {inventory_util.SPEC_FILE_NAME}")
 
     def export_environment(self: Self) -> None:
         """导出依赖 environment.yml"""
@@ -206,13 +257,7 @@ class CondaManageInterface(Interface):
         # 获取参数
         env_name: str = self.get_env_name()
         # 执行命令
-        gui_util.MessageDisplay.info(self, "开始导出 environment.yml")
-        command: str = ""
-        if is_windows():
-            command = f'conda env export -p ".\\{env_name}" > ./environment.yml'
-        elif is_linux():
-            command = f'conda env export -p "./{env_name}" > ./environment.yml'
-        run_command(command)
+        self.run_job("导出 environment.yml", [["conda", "env", "export", "-p", str(Path(".") / env_name)]], stdout_path=environment_yaml_path)
 
     def init_project(self: Self) -> None:
         """初始化 uv 配置文件"""
@@ -231,6 +276,15 @@ class CondaManageInterface(Interface):
         env_name: str = self.env_name_input.text().strip()
         return env_name if env_name else ".venv"
 
+    def get_env_prefix(self: Self) -> Path:
+        """环境目录: Linux 下优先使用 ~/.conda/envs 中的同名环境, 否则为项目中的目录"""
+
+        env_name: str = self.get_env_name()
+        conda_envs: Path = Path.home() / ".conda" / "envs" / env_name
+        if is_linux() and conda_envs.exists():
+            return conda_envs
+        return Path.cwd() / env_name
+
     def get_python_version(self: Self) -> str:
         """带默认参数地获取 Python 版本"""
 
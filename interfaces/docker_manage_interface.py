@@ -3,14 +3,13 @@ from pathlib import Path
 from typing import Any, Self, Dict, Optional
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox
 
-from utils.style_util import blue_style
+from utils.style_util import Style, blue_style
 from interfaces.interface import Interface
 from utils import config_util, gui_util, delay_util
 
 
-group_style: str = blue_style.get_groupbox_style()
-button_style: str = blue_style.get_button_style()
-lable_style: str = blue_style.get_lable_style()
+# 页面配色, 由全局样式表按动态属性应用
+page_style: Style = blue_style
 
 config_path: Path = config_util.config_path
 
@@ -25,14 +24,7 @@ class DockerManageInterface(Interface):
         self.init_ui()
         # 延时变量
         self.delay_variables: Dict[str, Any] = {
-            "docker_version": {
-                "var": None,
-                "object": self.docker_version_label,
-                "command": ["docker", "--version"],
-                "prefix": "Docker Version: ",
-                "err": "未找到, 请确保 Docker 已安装",
-                "operate": delay_util.set_label_text,
-            },
+            "docker_version": delay_util.create_delay_var("docker_version", self.docker_version_label),
         }
 
     def init_ui(self: Self) -> None:
@@ -41,6 +33,6 @@ class DockerManageInterface(Interface):
         # 标题区域
         self.title_label: QLabel = gui_util.LabelBuilder.create(self.content_widget, self.main_layout, content="Docker 管理")
         # 信息区域
-        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=group_style)
+        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=page_style)
         info_layout: QVBoxLayout = QVBoxLayout(info_group)
-        self.docker_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=lable_style)
+        self.docker_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=page_style)
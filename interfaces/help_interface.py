@@ -4,7 +4,8 @@ from typing import Self, Optional
 from qfluentwidgets import HyperlinkButton
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
 
-from utils.style_util import TITLE_STYLE
+from utils import gui_util
+from utils.style_util import TITLE_ROLE
 
 
 class HelpInterface(QWidget):
@@ -21,7 +22,7 @@ class HelpInterface(QWidget):
         layout.setAlignment(Qt.AlignCenter)  # pyright: ignore[reportAttributeAccessIssue]
         # 标题
         title: QLabel = QLabel("帮助与支持", self)
-        title.setStyleSheet(TITLE_STYLE)
+        gui_util.apply_style(title, role=TITLE_ROLE)
         # 仓库链接跳转按钮
         gitee_btn: HyperlinkButton = HyperlinkButton(
             "https://gitee.com/knightfemale/Ouroboros",
@@ -3,6 +3,7 @@ from PySide6.QtCore import Qt
 from qfluentwidgets import PrimaryPushButton
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QHBoxLayout
 
+from utils import gui_util
 from utils.style_util import yellow_style, green_style, blue_style, purple_style
 
 
@@ -23,16 +24,16 @@ class HomeInterface(QWidget):
         button_layout.setAlignment(Qt.AlignCenter)  # pyright: ignore[reportAttributeAccessIssue]
         self.nuitka_button = PrimaryPushButton("Nuitka 编译打包", self)
         self.nuitka_button.setFixedSize(180, 60)
-        self.nuitka_button.setStyleSheet(yellow_style.get_button_style())
+        gui_util.apply_style(self.nuitka_button, yellow_style)
         self.conda_button = PrimaryPushButton("Conda 环境管理", self)
         self.conda_button.setFixedSize(180, 60)
-        self.conda_button.setStyleSheet(green_style.get_button_style())
+        gui_util.apply_style(self.conda_button, green_style)
         self.docker_button = PrimaryPushButton("Docker 管理", self)
         self.docker_button.setFixedSize(180, 60)
-        self.docker_button.setStyleSheet(blue_style.get_button_style())
+        gui_util.apply_style(self.docker_button, blue_style)
         self.uv_button = PrimaryPushButton("UV 环境管理", self)
         self.uv_button.setFixedSize(180, 60)
-        self.uv_button.setStyleSheet(purple_style.get_button_style())
+        gui_util.apply_style(self.uv_button, purple_style)
         # 添加到布局
         button_layout.addWidget(self.nuitka_button)
         button_layout.addSpacing(40)
@@ -1,11 +1,12 @@
 # interfaces/interface.py
 from PySide6.QtCore import Qt
-from typing import Any, Self, Dict, Optional
+from pathlib import Path
+from typing import Any, Self, Dict, List, Callable, Optional, Set, Tuple
 from qfluentwidgets import SingleDirectionScrollArea
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QFrame
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QFrame, QGroupBox
 
-from utils import delay_util
-from utils.style_util import BACKGROUND_STYLE
+from utils import config_util, config_watch_util, delay_util, gui_util, process_util
+from utils.style_util import Style, PAGE_ROLE
 
 
 class Interface(QWidget):
@@ -19,7 +20,7 @@ class Interface(QWidget):
         scroll_area = SingleDirectionScrollArea(self)
         scroll_area.setWidgetResizable(True)
         scroll_area.setFrameShape(QFrame.NoFrame)  # pyright: ignore[reportAttributeAccessIssue]
-        scroll_area.setStyleSheet(BACKGROUND_STYLE)
+        gui_util.apply_style(scroll_area, role=PAGE_ROLE)
         scroll_area.setWidget(self.content_widget)
         # 设置主布局为滚动区域
         self.outer_layout: QVBoxLayout = QVBoxLayout(self)
@@ -28,9 +29,160 @@ class Interface(QWidget):
         self.setLayout(self.outer_layout)
         # 延时变量
         self.delay_variables: Dict[str, Dict[str, Any]] = {}
+        # 本页面提交且未结束的任务: 任务编号 -> 结束回调
+        self.pending_jobs: Dict[int, Optional[Callable[[process_util.Job], None]]] = {}
+        gui_util.get_job_notifier().changed.connect(self.on_job_changed)
+        # 自动保存的配置段 -> (所在文件, 点分路径前缀), 由使用配置的页面设置
+        self.config_sections: Dict[str, Tuple[Path, str]] = {}
+        # 最近一次加载或保存后各配置文件的状态
+        self.synced_stamps: Dict[Path, Any] = {}
+        # 修改后防抖自动保存, 由使用配置的页面创建
+        self.autosaver: Optional[gui_util.AutoSaver] = None
+        watcher: config_watch_util.ConfigWatcher = config_watch_util.get_config_watcher()
+        watcher.changed.connect(self.on_config_changed)
+        watcher.ready.connect(self.on_config_ready, Qt.QueuedConnection)  # pyright: ignore[reportAttributeAccessIssue]
 
     def showEvent(self: Self, event: Any) -> None:
         """当界面显示时触发"""
         super().showEvent(event)
         for key, value in self.delay_variables.items():
             delay_util.set_delay_var(self, value)
+
+    @property
+    def config_paths(self: Self) -> List[Path]:
+        """页面读写的配置文件(绝对路径)"""
+
+        return list(dict.fromkeys(path.absolute() for path, _ in self.config_sections.values()))
+
+    def is_config_stale(self: Self, path: Optional[Path] = None) -> bool:
+        """配置文件(默认全部)自上次加载或保存后是否有变化, 刚写入的内容无需重新加载"""
+
+        paths: List[Path] = [path.absolute()] if path else self.config_paths
+        return any(self.config_stamp(p) != self.synced_stamps.get(p, False) for p in paths)
+
+    def mark_config_synced(self: Self, path: Optional[Path] = None) -> None:
+        """记录 UI 与配置文件(默认全部)已一致"""
+
+        for p in [path.absolute()] if path else self.config_paths:
+            self.synced_stamps[p] = self.config_stamp(p)
+
+    @staticmethod
+    def config_stamp(path: Path) -> Any:
+        """配置文件的状态, 项目配置还包括合并进来的全局配置"""
+
+        store: config_util.ConfigStore = config_util.config_store
+        if path == store.project_path.absolute():
+            return (config_util.ConfigStore.stat_key(path), config_util.ConfigStore.stat_key(store.global_path))
+        return config_util.ConfigStore.stat_key(path)
+
+    def load_config_to_ui(self: Self, force: bool = False) -> None:
+        """从配置文件加载数据到 UI, 由使用配置的页面重写, 默认不做任何事"""
+
+    def save_ui_to_config(self: Self, dirty: Optional[Dict[str, Set[str]]] = None) -> None:
+        """保存 UI 状态到配置文件, dirty 为 None 时完整保存, 否则只写入被修改的项; 由使用配置的页面重写, 默认不做任何事"""
+
+    def flush_config(self: Self) -> None:
+        """执行操作前写入尚未保存的修改, 配置文件缺失时完整保存一次"""
+
+        if not all(path.exists() for path in self.config_paths):
+            self.save_ui_to_config()
+        elif self.autosaver:
+            self.autosaver.flush()
+
+    def dirty_config_keys(self: Self, path: Path) -> Dict[str, Tuple[str, str]]:
+        """未保存的修改在 path 中对应的键: 点分路径 -> (配置段, 配置项)"""
+
+        keys: Dict[str, Tuple[str, str]] = {}
+        for section, items in (self.autosaver.dirty if self.autosaver else {}).items():
+            file, prefix = self.config_sections[section]
+            if file.absolute() == path:
+                for key in items:
+                    keys[f"{prefix}.{key}" if prefix else key] = (section, key)
+        return keys
+
+    def on_config_changed(self: Self, path: Path, keys: Set[str]) -> None:
+        """配置文件被外部修改: 只在影响本页面时重新加载, 保留未冲突的未保存修改, 冲突时询问"""
+
+        if path not in self.config_paths or not self.is_config_stale(path):
+            # 与本页面无关, 或是本页面刚写入的内容
+            return
+        prefixes: List[str] = [prefix for file, prefix in self.config_sections.values() if file.absolute() == path]
+        affected: Set[str] = {key for key in keys if any(config_watch_util.affects(key, prefix) for prefix in prefixes)}
+        if not affected:
+            self.mark_config_synced(path)
+            return
+        message: str = f"{path.name} 已被外部修改, 已重新加载: {', '.join(sorted(affected))}"
+        if self.autosaver is None:
+            # 没有自动保存的页面不会有未保存的修改, 直接重新加载
+            self.load_config_to_ui(force=True)
+            gui_util.MessageDisplay.info(self, message)
+            return
+        dirty: Dict[str, Tuple[str, str]] = self.dirty_config_keys(path)
+        conflicts: List[str] = sorted(d for d in dirty if any(config_watch_util.affects(key, d) for key in affected))
+        # 选择保留本地修改时, 冲突项稍后自动保存时覆盖文件中的值
+        if conflicts and self.ask_conflict(path, conflicts):
+            for key in conflicts:
+                section, item = dirty.pop(key)
+                self.autosaver.discard(section, item)
+        # 重新加载后恢复未保存的修改, 它们仍会在稍后写入
+        pending: List[Tuple[Any, Any]] = [(widget, gui_util.read_value(widget)) for section, item in dirty.values() for widget in self.autosaver.widgets[(section, item)]]
+        self.load_config_to_ui(force=True)
+        with self.autosaver.suspend():
+            for widget, value in pending:
+                gui_util.write_value(widget, value)
+        gui_util.MessageDisplay.info(self, message)
+
+    def on_config_ready(self: Self) -> None:
+        """监视器在后台记录初始内容之前本页面已加载: 期间文件的修改不会再通知, 按整段变化处理"""
+
+        for path in self.config_paths:
+            if path.exists() and self.is_config_stale(path):
+                self.on_config_changed(path, {prefix for file, prefix in self.config_sections.values() if file.absolute() == path})
+
+    def ask_conflict(self: Self, path: Path, keys: List[str]) -> bool:
+        """外部修改与未保存的修改冲突时询问, 返回 True 表示使用文件中的内容"""
+
+        return gui_util.MessageDisplay.confirm(
+            self,
+            "配置冲突",
+            f"{path.name} 已被外部修改, 以下未保存的修改与之冲突:\n{chr(10).join(keys)}\n\n使用文件中的内容, 还是保留当前修改(稍后覆盖文件中的这些项)?",
+            "使用文件内容",
+            "保留我的修改",
+        )
+
+    def attach_console(self: Self, title: str = "输出", style: str | Style = "") -> gui_util.ConsolePanel:
+        """在页面底部添加输出控制台, 显示本页面提交的任务输出"""
+
+        group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, title, style=style)
+        layout: QVBoxLayout = QVBoxLayout(group)
+        self.console: gui_util.ConsolePanel = gui_util.ConsolePanel(self, layout, self.objectName())
+        return self.console
+
+    def run_job(
+        self: Self,
+        name: str,
+        commands: List[List[str]],
+        cpus: int = 0,
+        stdout_path: Optional[Path] = None,
+        on_finish: Optional[Callable[[process_util.Job], None]] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> process_util.Job:
+        """通过进程管理器执行任务, 结束后提示结果"""
+
+        gui_util.MessageDisplay.info(self, f"开始{name}")
+        job: process_util.Job = process_util.process_manager.submit(name, commands, cpus=cpus, stdout_path=stdout_path, group=self.objectName(), env=env)
+        self.pending_jobs[job.id] = on_finish
+        return job
+
+    def on_job_changed(self: Self, job: process_util.Job) -> None:
+        """任务状态变化(GUI 线程)"""
+
+        if job.id not in self.pending_jobs or not job.finished:
+            return
+        on_finish: Optional[Callable[[process_util.Job], None]] = self.pending_jobs.pop(job.id)
+        if job.state == process_util.JobState.SUCCEEDED:
+            gui_util.MessageDisplay.success(self, process_util.format_job(job))
+        else:
+            gui_util.MessageDisplay.error(self, process_util.format_job(job))
+        if on_finish:
+            on_finish(job)
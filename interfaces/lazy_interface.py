@@ -0,0 +1,37 @@
+# interfaces/lazy_interface.py
+import importlib
+from typing import Any, Optional, Self
+from PySide6.QtWidgets import QWidget, QVBoxLayout
+
+from utils import startup_profile_util
+
+
+class LazyInterface(QWidget):
+    """导航占位页面: 首次显示时才导入模块并创建真正的页面"""
+
+    def __init__(self: Self, module: str, class_name: str, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent=parent)
+        # 导航项以占位页面的对象名为路由键, 与真正页面的对象名区分
+        self.setObjectName(f"{class_name}Placeholder")
+        self.module: str = module
+        self.class_name: str = class_name
+        self.page: Optional[QWidget] = None
+        self.page_layout: QVBoxLayout = QVBoxLayout(self)
+        self.page_layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def interface(self: Self) -> Any:
+        """真正的页面, 尚未创建时立即创建"""
+
+        if self.page is None:
+            with startup_profile_util.measure(f"创建页面 {self.class_name}", "页面"):
+                page_class: type = getattr(importlib.import_module(self.module), self.class_name)
+                self.page = page_class(self)
+            self.page_layout.addWidget(self.page)
+        return self.page
+
+    def showEvent(self: Self, event: Any) -> None:
+        """首次显示(导航或 switchTo)时创建页面"""
+
+        self.interface
+        super().showEvent(event)
@@ -0,0 +1,187 @@
+# interfaces/main_window.py
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Self, Set
+from PySide6.QtCore import Qt, QAbstractEventDispatcher, QEvent, QObject, QTimer
+from PySide6.QtWidgets import QApplication, QWidget
+from qfluentwidgets import FluentWindow, NavigationItemPosition, FluentIcon
+
+# 导入自定义页面(其余页面首次显示时才导入)
+from interfaces.home_interface import HomeInterface
+from interfaces.lazy_interface import LazyInterface
+
+from utils import icon_util, config_util, config_watch_util, delay_util, gui_util, process_util, startup_profile_util
+
+
+class FirstPaintProbe(QObject):
+    """记录窗口首次绘制的时间, 输出后可选地退出"""
+
+    def __init__(self: Self, window: "MainWindow", begin: float, exit_after: bool) -> None:
+        super().__init__(window)
+        self.window: "MainWindow" = window
+        # 计时起点(time.perf_counter)
+        self.begin: float = begin
+        self.exit_after: bool = exit_after
+        window.installEventFilter(self)
+
+    def eventFilter(self: Self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            self.window.removeEventFilter(self)
+            # 等本次绘制完成后再输出
+            QTimer.singleShot(0, self.report)
+        return False
+
+    def report(self: Self) -> None:
+        elapsed: float = (time.perf_counter() - self.begin) * 1000
+        pages: List[str] = [page.class_name for page in self.window.findChildren(LazyInterface) if page.page is not None]
+        print(f"首次绘制: {elapsed:.0f}ms (窗口构建 {self.window.build_time * 1000:.0f}ms, 已创建页面: {', '.join(pages) or '无'})", flush=True)
+        if self.exit_after:
+            QApplication.quit()
+
+
+class StartupProfileProbe(QObject):
+    """启动分析: 记录首次绘制与事件循环首次空闲, 随后逐个创建其余页面, 写入报告后退出"""
+
+    def __init__(self: Self, window: "MainWindow", profiler: startup_profile_util.StartupProfiler) -> None:
+        super().__init__(window)
+        self.window: "MainWindow" = window
+        self.profiler: startup_profile_util.StartupProfiler = profiler
+        window.installEventFilter(self)
+        # 事件循环即将阻塞等待新事件, 即首次空闲
+        self.dispatcher: QAbstractEventDispatcher = QAbstractEventDispatcher.instance()
+        self.dispatcher.aboutToBlock.connect(self.on_idle)
+
+    def eventFilter(self: Self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Type.Paint:
+            self.window.removeEventFilter(self)
+            self.profiler.mark("首次绘制")
+        return False
+
+    def on_idle(self: Self) -> None:
+        # 窗口显示后首轮事件可能先于绘制处理完, 以首次绘制之后的空闲为准
+        if "首次绘制" not in self.profiler.marks:
+            return
+        self.dispatcher.aboutToBlock.disconnect(self.on_idle)
+        self.profiler.mark("首次空闲")
+        QTimer.singleShot(0, self.finish)
+
+    def finish(self: Self) -> None:
+        # 其余页面首次打开时的创建耗时
+        for page in self.window.findChildren(LazyInterface):
+            page.interface
+        self.profiler.imports.uninstall()
+        report: Dict[str, Any] = self.profiler.write()
+        print(startup_profile_util.format_summary(report), flush=True)
+        print(f"报告已写入 {startup_profile_util.report_path}", flush=True)
+        QApplication.quit()
+
+
+def hook_stylesheets(profiler: startup_profile_util.StartupProfiler) -> None:
+    """统计 setStyleSheet 的调用次数与耗时, 按调用方所在的包归类"""
+
+    def wrap(original: Callable[[Any, str], None]) -> Callable[[Any, str], None]:
+        def timed(widget: Any, sheet: str) -> None:
+            source: str = sys._getframe(1).f_globals.get("__name__", "").split(".")[0]
+            start: float = time.perf_counter()
+            original(widget, sheet)
+            profiler.add_stylesheet(source, time.perf_counter() - start)
+
+        return timed
+
+    QWidget.setStyleSheet = wrap(QWidget.setStyleSheet)
+    QApplication.setStyleSheet = wrap(QApplication.setStyleSheet)
+
+
+class MainWindow(FluentWindow):
+    def __init__(self: Self) -> None:
+        start: float = time.perf_counter()
+        super().__init__()
+        # 全局样式表在创建页面之前设置, 各控件创建时只应用一次样式
+        gui_util.install_stylesheet()
+        # 创建窗口
+        self.setWindowTitle(f"Ouroboros-{Path.cwd().name}")
+        self.resize(1280, 720)
+        # 配置文件在后台线程中解析, 完成后读取控制台配置
+        watcher: config_watch_util.ConfigWatcher = config_watch_util.get_config_watcher()
+        watcher.ready.connect(self.on_config_ready, Qt.QueuedConnection)  # pyright: ignore[reportAttributeAccessIssue]
+        watcher.changed.connect(self.on_config_changed)
+        watcher.start()
+        # 创建子界面实例: 首页直接创建, 其余页面先注册占位页面
+        with startup_profile_util.measure("创建页面 HomeInterface", "页面"):
+            self.homeInterface: HomeInterface = HomeInterface(self)
+        self.nuitka_build_interface: LazyInterface = LazyInterface("interfaces.nuitka_build_interface", "NuitkaBuildInterface", self)
+        self.conda_manage_interface: LazyInterface = LazyInterface("interfaces.conda_manage_interface", "CondaManageInterface", self)
+        self.docker_manage_interface: LazyInterface = LazyInterface("interfaces.docker_manage_interface", "DockerManageInterface", self)
+        self.uv_manage_interface: LazyInterface = LazyInterface("interfaces.uv_manage_interface", "UVManageInterface", self)
+        self.settingInterface: LazyInterface = LazyInterface("interfaces.setting_interface", "SettingInterface", self)
+        self.helpInterface: LazyInterface = LazyInterface("interfaces.help_interface", "HelpInterface", self)
+        # 添加导航项
+        self.add_navigation_items()
+        # 连接首页按钮信号
+        self.homeInterface.nuitka_button.clicked.connect(lambda: self.switchTo(self.nuitka_build_interface))
+        self.homeInterface.conda_button.clicked.connect(lambda: self.switchTo(self.conda_manage_interface))
+        self.homeInterface.docker_button.clicked.connect(lambda: self.switchTo(self.docker_manage_interface))
+        self.homeInterface.uv_button.clicked.connect(lambda: self.switchTo(self.uv_manage_interface))
+        self.build_time: float = time.perf_counter() - start
+
+    def on_config_ready(self: Self) -> None:
+        """后台解析完成, 读取控制台与探测配置, 按配置在后台预热全部版本探测"""
+
+        config: Mapping[str, Any] = config_util.config_store.view()
+        process_util.process_manager.configure(config)
+        pool: delay_util.ProbePool = delay_util.get_probe_pool()
+        pool.configure(config)
+        if delay_util.get_probe_config(config)["warm_on_startup"]:
+            pool.warm_all()
+
+    def on_config_changed(self: Self, path: Path, keys: Set[str]) -> None:
+        """控制台或探测配置被外部修改时重新读取"""
+
+        if any(config_watch_util.affects(key, "tool.ouroboros.console") for key in keys):
+            process_util.process_manager.configure(config_util.config_store.view())
+        if any(config_watch_util.affects(key, "tool.ouroboros.probes") for key in keys):
+            delay_util.get_probe_pool().configure(config_util.config_store.view())
+
+    def add_navigation_items(self: Self) -> None:
+        # 添加主导航项
+        self.addSubInterface(
+            self.homeInterface,
+            FluentIcon.HOME,
+            "首页",
+        )
+        self.addSubInterface(
+            self.nuitka_build_interface,
+            icon_util.FluentIcon.NUITKA,
+            "Nuitka 编译打包",
+        )
+        self.addSubInterface(
+            self.conda_manage_interface,
+            icon_util.FluentIcon.CONDA,
+            "Conda 环境管理",
+        )
+        self.addSubInterface(
+            self.docker_manage_interface,
+            icon_util.FluentIcon.DOCKER,
+            "Docker 环境管理",
+        )
+        self.addSubInterface(
+            self.uv_manage_interface,
+            icon_util.FluentIcon.UV,
+            "UV 环境管理",
+        )
+        self.addSubInterface(
+            self.settingInterface,
+            FluentIcon.SETTING,
+            "设置",
+            position=NavigationItemPosition.BOTTOM,
+        )
+        # 添加底部导航
+        self.addSubInterface(
+            self.helpInterface,
+            FluentIcon.HELP,
+            "帮助与支持",
+            position=NavigationItemPosition.BOTTOM,
+        )
+        # 默认选中首页
+        self.switchTo(self.homeInterface)
@@ -1,22 +1,97 @@
 # interfaces/nuitka_build_interface.py
 import multiprocessing
 from pathlib import Path
-from typing import Any, Self, List, Dict, Optional
-from qfluentwidgets import LineEdit, ModelComboBox, SwitchButton, PushButton
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout
+from typing import Any, Self, List, Dict, Mapping, Optional, Set, Tuple
+from PySide6.QtCore import QThread, QTimer, Signal
+from qfluentwidgets import LineEdit, ModelComboBox, SwitchButton, PushButton, TableWidget
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QTableWidgetItem
 
 from interfaces.interface import Interface
-from utils.platform_util import run_command
-from utils.style_util import yellow_style, green_style
-from utils import config_util, gui_util, delay_util, python_path_util
+from utils.style_util import Style, yellow_style, green_style
+from utils import config_util, gui_util, delay_util, python_path_util, build_cache_util, build_matrix_util, build_history_util, jobs_util, import_graph_util, benchmark_util, ccache_util, nuitka_util
 
 
-group_style: str = yellow_style.get_groupbox_style()
-button_style: str = yellow_style.get_button_style()
-lable_style: str = yellow_style.get_lable_style()
+# 页面配色, 由全局样式表按动态属性应用
+page_style: Style = yellow_style
 
 config_path: Path = config_util.config_path
 
+# 构建方案下拉框中的固定选项
+DEFAULT_PROFILE: str = "默认"
+ALL_PROFILES: str = "全部方案(并行)"
+# 命令预览的防抖间隔(毫秒)
+PREVIEW_DELAY: int = 150
+# 比较时的缺失值
+MISSING: object = object()
+
+
+class MatrixThread(QThread):
+    """在后台并行构建多个方案"""
+
+    # 信号: 是否全部成功, 汇总文本
+    finished_summary: Signal = Signal(bool, str)
+
+    def __init__(self: Self, parent: Optional[QWidget], profiles: List[Optional[str]]) -> None:
+        super().__init__(parent)
+        self.profiles: List[Optional[str]] = profiles
+
+    def run(self: Self) -> None:
+        # 任何异常都要发出结束信号, 否则页面的构建按钮一直处于禁用状态
+        try:
+            nuitka_config: Mapping[str, Any] = nuitka_util.load_nuitka_config()
+            cache: Optional[build_cache_util.BuildCache] = build_cache_util.BuildCache.from_config(config_util.config_store.view())
+            results: List[build_matrix_util.BuildResult] = build_matrix_util.run_matrix(
+                self.profiles,
+                nuitka_config,
+                nuitka_util.generate_nuitka_args,
+                python_path_util.get_python_path(),
+                cache,
+                group="NuitkaBuildInterface",
+            )
+            summary: str = build_matrix_util.format_summary(results)
+            # 构建成功后依次测试启动耗时
+            benchmark_config: Dict[str, Any] = benchmark_util.get_benchmark_config(config_util.config_store.view())
+            if benchmark_config["after_build"]:
+                succeeded: List[Optional[str]] = [profile for profile, result in zip(self.profiles, results) if result.returncode == 0]
+                records, errors = benchmark_util.benchmark_profiles(succeeded, nuitka_config, benchmark_config)
+                summary = "\n".join([summary, benchmark_util.format_comparison(records), *errors])
+        except Exception as e:
+            self.finished_summary.emit(False, str(e))
+            return
+        self.finished_summary.emit(all(r.returncode == 0 for r in results), summary)
+
+
+class BenchmarkThread(QThread):
+    """在后台测试构建产物的启动耗时"""
+
+    # 信号: 是否全部成功, 汇总文本
+    finished_summary: Signal = Signal(bool, str)
+
+    def __init__(self: Self, parent: Optional[QWidget], profiles: List[Optional[str]]) -> None:
+        super().__init__(parent)
+        self.profiles: List[Optional[str]] = profiles
+
+    def run(self: Self) -> None:
+        benchmark_config: Dict[str, Any] = benchmark_util.get_benchmark_config(config_util.config_store.view())
+        records, errors = benchmark_util.benchmark_profiles(self.profiles, nuitka_util.load_nuitka_config(), benchmark_config)
+        success: bool = not errors and all(r["returncode"] == 0 for r in records)
+        self.finished_summary.emit(success, "\n".join([benchmark_util.format_comparison(records), *errors]))
+
+
+class AnalyzeThread(QThread):
+    """在后台分析入口文件的导入图"""
+
+    # 信号: 分析结果, 失败时为错误信息
+    finished_report: Signal = Signal(object)
+
+    def run(self: Self) -> None:
+        try:
+            report: import_graph_util.ImportReport = import_graph_util.analyze(nuitka_util.load_nuitka_config(), python_path_util.get_python_path())
+        except (OSError, ValueError) as e:
+            self.finished_report.emit(str(e))
+            return
+        self.finished_report.emit(report)
+
 
 class NuitkaBuildInterface(Interface):
     def __init__(self: Self, parent: Optional[QWidget] = None) -> None:
@@ -25,18 +100,12 @@ class NuitkaBuildInterface(Interface):
         self.setObjectName("NuitkaBuildInterface")
         # 初始化 UI
         self.init_ui()
+        self.bind_fields()
         # 加载配置到 UI
         self.load_config_to_ui()
         # 延时变量
         self.delay_variables: Dict[str, Any] = {
-            "nuitka_version": {
-                "var": None,
-                "object": self.nuitka_version_label,
-                "command": ["", "-m", "nuitka", "--version"],
-                "prefix": "Nuitka Version: ",
-                "err": "未找到, 请确保 Nuitka 已安装",
-                "operate": delay_util.set_label_text,
-            },
+            "nuitka_version": delay_util.create_delay_var("nuitka_version", self.nuitka_version_label),
         }
 
     def init_ui(self: Self) -> None:
@@ -45,82 +114,230 @@ class NuitkaBuildInterface(Interface):
         # 标题区域
         self.title_label: QLabel = gui_util.LabelBuilder.create(self.content_widget, self.main_layout, content="Nuitka 编译打包")
         # 信息区域
-        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=group_style)
+        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=page_style)
         info_layout: QVBoxLayout = QVBoxLayout(info_group)
-        self.nuitka_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=lable_style)
+        self.nuitka_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=page_style)
+        # 构建历史区域
+        history_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "构建历史", style=page_style)
+        history_layout: QVBoxLayout = QVBoxLayout(history_group)
+        self.breakdown_label: QLabel = gui_util.LabelBuilder.create(self, history_layout, style=page_style)
+        self.trend_label: QLabel = gui_util.LabelBuilder.create(self, history_layout, style=page_style)
+        # 启动测试区域
+        benchmark_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "启动测试", style=page_style)
+        benchmark_layout: QVBoxLayout = QVBoxLayout(benchmark_group)
+        self.benchmark_table: TableWidget = TableWidget(self)
+        self.benchmark_table.setColumnCount(8)
+        self.benchmark_table.setHorizontalHeaderLabels(["方案", "提交", "冷启动", "热启动", "峰值内存", "体积", "文件数", "退出码"])
+        self.benchmark_table.verticalHeader().hide()
+        self.benchmark_table.setMinimumHeight(200)
+        benchmark_layout.addWidget(self.benchmark_table)
+        self.benchmark_after_build_switch: SwitchButton = gui_util.SwitchBuilder.create(self, benchmark_layout, "构建后测试启动", lable_style=page_style)
+        benchmark_btn_layout: QHBoxLayout = QHBoxLayout()
+        benchmark_layout.addLayout(benchmark_btn_layout)
+        benchmark_btn_layout.addStretch()
+        self.benchmark_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, benchmark_btn_layout, "测试启动", slot=self.start_benchmark, style=page_style)
+        benchmark_btn_layout.addStretch()
         # 操作区域
-        action_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "操作", style=group_style)
+        action_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "操作", style=page_style)
         action_layout: QVBoxLayout = QVBoxLayout(action_group)
         action_btn_layout: QHBoxLayout = QHBoxLayout()
         action_layout.addLayout(action_btn_layout)
         action_btn_layout.addStretch()
-        self.build_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "编译打包", slot=self.start_packaging, style=button_style)
-        self.save_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "保存配置", slot=self.save_ui_to_config, style=button_style)
+        self.build_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "编译打包", slot=self.start_packaging, style=page_style)
+        self.save_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "保存配置", slot=lambda: self.save_ui_to_config(), style=page_style)
         action_btn_layout.addStretch()
-        self.command_preview: LineEdit = gui_util.InputBuilder.create(self, action_layout, "命令预览", "生成的命令将显示在这里", lable_style=lable_style)
+        self.profile_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, action_layout, "构建方案", [DEFAULT_PROFILE], lable_style=page_style)
+        self.profile_combo.currentTextChanged.connect(lambda _: self.refresh_profile_views())
+        self.command_preview: LineEdit = gui_util.InputBuilder.create(self, action_layout, "命令预览", "生成的命令将显示在这里", lable_style=page_style)
         # 基本选项区域
-        options_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "基本选项", style=group_style)
+        options_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "基本选项", style=page_style)
         options_layout: QVBoxLayout = QVBoxLayout(options_group)
-        self.entry_input: LineEdit = gui_util.InputBuilder.create(self, options_layout, "Python 入口文件", "输入 Python 入口文件(例如: ./main.py)", lable_style=lable_style)
-        self.output_name_input: LineEdit = gui_util.InputBuilder.create(self, options_layout, "输出文件名", "输出文件名(默认: 入口文件名)", lable_style=lable_style)
-        self.output_dir_input: LineEdit = gui_util.InputBuilder.create(self, options_layout, "输出目录", "输出目录(默认: 根目录)", lable_style=lable_style)
+        self.interpreter_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, options_layout, "解释器", [python_path_util.AUTO_INTERPRETER], lable_style=page_style)
+        self.interpreter_label: QLabel = gui_util.LabelBuilder.create(self, options_layout, style=page_style)
+        self.entry_input: LineEdit = gui_util.InputBuilder.create(self, options_layout, "Python 入口文件", "输入 Python 入口文件(例如: ./main.py)", lable_style=page_style)
+        self.output_name_input: LineEdit = gui_util.InputBuilder.create(self, options_layout, "输出文件名", "输出文件名(默认: 入口文件名)", lable_style=page_style)
+        self.output_dir_input: LineEdit = gui_util.InputBuilder.create(self, options_layout, "输出目录", "输出目录(默认: 根目录)", lable_style=page_style)
         cpu_count: int = multiprocessing.cpu_count()
-        jobs_options: List[str] = [str(i) for i in range(1, cpu_count + 1)]
+        jobs_options: List[str] = [jobs_util.AUTO_JOBS] + [str(i) for i in range(1, cpu_count + 1)]
         self.default_job: str = str(cpu_count - 1) if cpu_count > 1 else "1"
-        self.jobs_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, options_layout, "并行任务数", jobs_options, current_text=self.default_job, lable_style=lable_style)
-        self.build_mode_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, options_layout, "构建模式", ["独立模式", "单文件模式", "模块模式"], lable_style=lable_style)
-        self.disable_console_switch: SwitchButton = gui_util.SwitchBuilder.create(self, options_layout, "禁用控制台", lable_style=lable_style)
-        self.remove_output_switch: SwitchButton = gui_util.SwitchBuilder.create(self, options_layout, "删除构建文件夹", lable_style=lable_style)
+        self.jobs_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, options_layout, "并行任务数", jobs_options, current_text=self.default_job, lable_style=page_style)
+        self.build_mode_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, options_layout, "构建模式", ["独立模式", "单文件模式", "模块模式"], lable_style=page_style)
+        self.disable_console_switch: SwitchButton = gui_util.SwitchBuilder.create(self, options_layout, "禁用控制台", lable_style=page_style)
+        self.remove_output_switch: SwitchButton = gui_util.SwitchBuilder.create(self, options_layout, "删除构建文件夹", lable_style=page_style)
         # 显式导入区域
-        import_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "显式导入", style=group_style)
+        import_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "显式导入", style=page_style)
         import_layout: QVBoxLayout = QVBoxLayout(import_group)
         # 启用包区域
-        package_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "启用包", style=group_style)
+        package_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "启用包", style=page_style)
         package_layout: QVBoxLayout = QVBoxLayout(package_group)
         self.packages_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, package_layout, "输入包名(例如: numpy)")
-        self.add_package_btn: PushButton = gui_util.ButtonBuilder.create(self, package_layout, "添加包", slot=lambda: self.packages_container.add_row(""), style=green_style.get_button_style())
+        self.add_package_btn: PushButton = gui_util.ButtonBuilder.create(self, package_layout, "添加包", slot=lambda: self.packages_container.add_row(""), style=green_style)
         # 启用模块区域
-        module_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "启用模块", style=group_style)
+        module_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "启用模块", style=page_style)
         module_layout: QVBoxLayout = QVBoxLayout(module_group)
         self.modules_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, module_layout, "输入模块名(例如: sys)")
-        self.add_module_btn = gui_util.ButtonBuilder.create(self, module_layout, "添加模块", slot=lambda: self.modules_container.add_row(""), style=green_style.get_button_style())
+        self.add_module_btn = gui_util.ButtonBuilder.create(self, module_layout, "添加模块", slot=lambda: self.modules_container.add_row(""), style=green_style)
         # 启用插件区域
-        plugin_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "启用插件", style=group_style)
+        plugin_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "启用插件", style=page_style)
         plugin_layout: QVBoxLayout = QVBoxLayout(plugin_group)
         self.plugins_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, plugin_layout, "输入插件名(例如: pyside6)")
-        self.add_plugin_btn: PushButton = gui_util.ButtonBuilder.create(self, plugin_layout, "添加插件", slot=lambda: self.plugins_container.add_row(""), style=green_style.get_button_style())
+        self.add_plugin_btn: PushButton = gui_util.ButtonBuilder.create(self, plugin_layout, "添加插件", slot=lambda: self.plugins_container.add_row(""), style=green_style)
         # 禁用导入项区域
-        no_import_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "禁用导入项", style=group_style)
+        no_import_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "禁用导入项", style=page_style)
         no_import_layout: QVBoxLayout = QVBoxLayout(no_import_group)
         self.no_imports_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, no_import_layout, "输入导入项名(例如: *.tests)")
-        self.add_no_import_btn: PushButton = gui_util.ButtonBuilder.create(self, no_import_layout, "添加导入项", slot=lambda: self.no_imports_container.add_row(""), style=green_style.get_button_style())
+        self.add_no_import_btn: PushButton = gui_util.ButtonBuilder.create(self, no_import_layout, "添加导入项", slot=lambda: self.no_imports_container.add_row(""), style=green_style)
         # 包含文件区域
-        file_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "包含文件", style=group_style)
+        file_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "包含文件", style=page_style)
         file_layout: QVBoxLayout = QVBoxLayout(file_group)
         self.files_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, file_layout, "输入文件路径(格式: 源文件=目标路径)")
-        self.add_file_btn: PushButton = gui_util.ButtonBuilder.create(self, file_layout, "添加文件", slot=lambda: self.files_container.add_row(""), style=green_style.get_button_style())
+        self.add_file_btn: PushButton = gui_util.ButtonBuilder.create(self, file_layout, "添加文件", slot=lambda: self.files_container.add_row(""), style=green_style)
         # 包含目录区域
-        dir_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "包含目录", style=group_style)
+        dir_group: QGroupBox = gui_util.GroupBuilder.create(self, import_layout, "包含目录", style=page_style)
         dir_layout: QVBoxLayout = QVBoxLayout(dir_group)
         self.dirs_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, dir_layout, "输入目录路径(格式: 源目录=目标路径)")
-        self.add_dir_btn: PushButton = gui_util.ButtonBuilder.create(self, dir_layout, "添加目录", slot=lambda: self.dirs_container.add_row(""), style=green_style.get_button_style())
+        self.add_dir_btn: PushButton = gui_util.ButtonBuilder.create(self, dir_layout, "添加目录", slot=lambda: self.dirs_container.add_row(""), style=green_style)
         # 高级选项区域
-        advanced_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "高级选项", style=group_style)
+        advanced_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "高级选项", style=page_style)
         advanced_layout: QVBoxLayout = QVBoxLayout(advanced_group)
-        self.compiler_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, advanced_layout, "编译器", ["Auto", "MSVC", "MinGW64", "Clang"], lable_style=lable_style)
-        self.show_scons_switch: SwitchButton = gui_util.SwitchBuilder.create(self, advanced_layout, "显示 Scons 命令", lable_style=lable_style)
-        self.assume_yes_switch: SwitchButton = gui_util.SwitchBuilder.create(self, advanced_layout, "自动同意下载", lable_style=lable_style)
+        self.compiler_combo: ModelComboBox = gui_util.ComboBoxBuilder.create(self, advanced_layout, "编译器", ["Auto", "MSVC", "MinGW64", "Clang"], lable_style=page_style)
+        self.show_scons_switch: SwitchButton = gui_util.SwitchBuilder.create(self, advanced_layout, "显示 Scons 命令", lable_style=page_style)
+        self.assume_yes_switch: SwitchButton = gui_util.SwitchBuilder.create(self, advanced_layout, "自动同意下载", lable_style=page_style)
+        # 编译器缓存区域
+        ccache_group: QGroupBox = gui_util.GroupBuilder.create(self, advanced_layout, "编译器缓存", style=page_style)
+        ccache_layout: QVBoxLayout = QVBoxLayout(ccache_group)
+        self.ccache_label: QLabel = gui_util.LabelBuilder.create(self, ccache_layout, style=page_style)
+        self.ccache_switch: SwitchButton = gui_util.SwitchBuilder.create(self, ccache_layout, "启用编译器缓存", lable_style=page_style)
+        self.ccache_dir_input: LineEdit = gui_util.InputBuilder.create(self, ccache_layout, "缓存目录", "缓存目录(默认: Nuitka 缓存目录)", lable_style=page_style)
+        self.ccache_max_size_input: LineEdit = gui_util.InputBuilder.create(self, ccache_layout, "缓存上限", "缓存大小上限(例如: 5G)", lable_style=page_style)
         # 额外参数区域
-        extra_args_group: QGroupBox = gui_util.GroupBuilder.create(self, advanced_layout, "额外参数", style=group_style)
+        extra_args_group: QGroupBox = gui_util.GroupBuilder.create(self, advanced_layout, "额外参数", style=page_style)
         extra_args_layout: QVBoxLayout = QVBoxLayout(extra_args_group)
         self.extra_args_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, extra_args_layout, "输入额外参数(例如: --lto=yes)")
-        self.add_arg_btn: PushButton = gui_util.ButtonBuilder.create(self, extra_args_layout, "添加参数", slot=lambda: self.extra_args_container.add_row(""), style=green_style.get_button_style())
+        self.add_arg_btn: PushButton = gui_util.ButtonBuilder.create(self, extra_args_layout, "添加参数", slot=lambda: self.extra_args_container.add_row(""), style=green_style)
+        # 导入分析区域
+        analyze_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "导入分析", style=page_style)
+        analyze_layout: QVBoxLayout = QVBoxLayout(analyze_group)
+        self.analyze_label: QLabel = gui_util.LabelBuilder.create(self, analyze_layout, content="分析入口文件可达的模块, 建议排除或包含的导入项", style=page_style)
+        self.proposals_table: TableWidget = TableWidget(self)
+        self.proposals_table.setColumnCount(5)
+        self.proposals_table.setHorizontalHeaderLabels(["配置项", "名称", "体积变化", "模块数", "原因"])
+        self.proposals_table.verticalHeader().hide()
+        self.proposals_table.setMinimumHeight(200)
+        analyze_layout.addWidget(self.proposals_table)
+        analyze_btn_layout: QHBoxLayout = QHBoxLayout()
+        analyze_layout.addLayout(analyze_btn_layout)
+        analyze_btn_layout.addStretch()
+        self.analyze_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, analyze_btn_layout, "分析导入", slot=self.start_analyze, style=page_style)
+        self.apply_proposals_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, analyze_btn_layout, "应用建议", slot=self.apply_proposals, style=page_style)
+        analyze_btn_layout.addStretch()
+        self.proposals: List[import_graph_util.Proposal] = []
+        # 输出区域
+        self.attach_console(style=page_style)
+
+    def bind_fields(self: Self) -> None:
+        """登记配置项对应的控件, 修改时标记待保存并增量更新命令预览"""
+
+        # 配置段 -> 配置项 -> 控件
+        self.fields: Dict[str, Dict[str, Any]] = {
+            "nuitka": {
+                "interpreter": self.interpreter_combo,
+                "entry": self.entry_input,
+                "output_name": self.output_name_input,
+                "output_dir": self.output_dir_input,
+                "build_mode": self.build_mode_combo,
+                "disable_console": self.disable_console_switch,
+                "remove_output": self.remove_output_switch,
+                "show_scons": self.show_scons_switch,
+                "assume_yes": self.assume_yes_switch,
+                "compiler": self.compiler_combo,
+                "jobs": self.jobs_combo,
+                "ccache": self.ccache_switch,
+                "ccache_dir": self.ccache_dir_input,
+                "ccache_max_size": self.ccache_max_size_input,
+                **{field: getattr(self, f"{field}_container") for field in ["plugins", "packages", "modules", "no_imports", "files", "dirs", "extra_args"]},
+            },
+            "benchmark": {"after_build": self.benchmark_after_build_switch},
+        }
+        self.config_sections = {section: (config_path, f"tool.ouroboros.{section}") for section in self.fields}
+        self.autosaver = gui_util.AutoSaver(self, self.save_ui_to_config)
+        # 项目配置中没有的配置项加载时的值, 完整保存时不写入未修改的这些项
+        self.inherited_values: Dict[Tuple[str, str], Any] = {}
+        # 尚未保存的修改, 命令预览在已保存的配置上叠加这些值
+        self.preview_overrides: Dict[str, Any] = {}
+        self.preview_timer: QTimer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+        for section, widgets in self.fields.items():
+            for key, widget in widgets.items():
+                self.autosaver.watch(section, key, widget)
+                if section == "nuitka":
+                    gui_util.connect_changed(widget, lambda key=key: self.on_field_changed(key))
+
+    def on_field_changed(self: Self, key: str) -> None:
+        """只重新读取修改的配置项, 稍后刷新命令预览"""
+
+        self.preview_overrides[key] = gui_util.read_value(self.fields["nuitka"][key])
+        self.preview_timer.start()
+
+    def refresh_preview(self: Self) -> None:
+        """刷新命令预览"""
+
+        self.command_preview.setText(nuitka_util.generate_command_string(self.get_selected_profile(), self.preview_overrides))
+        self.refresh_interpreter_label()
+
+    def refresh_interpreters(self: Self, current: str) -> None:
+        """列出发现的解释器, 配置中的解释器未被发现时也保留在选项中"""
+
+        paths: List[str] = [python_path_util.display_path(interpreter.path) for interpreter in python_path_util.interpreter_registry.get_interpreters()]
+        if current not in paths and current != python_path_util.AUTO_INTERPRETER:
+            paths.append(current)
+        self.interpreter_combo.clear()
+        self.interpreter_combo.addItems([python_path_util.AUTO_INTERPRETER] + paths)
+        self.interpreter_combo.setCurrentText(current)
+
+    def refresh_interpreter_label(self: Self) -> None:
+        """显示选中方案实际使用的解释器及其版本、ABI 与 Nuitka"""
+
+        profile_config: Dict[str, Any] = build_matrix_util.resolve_profile({**nuitka_util.load_nuitka_config(), **self.preview_overrides}, self.get_selected_profile())
+        python_path: str = python_path_util.get_python_path(profile_config)
+        if not python_path:
+            self.interpreter_label.setText("未找到解释器, 请创建 .venv 或选择已发现的解释器")
+            return
+        interpreter: Optional[python_path_util.Interpreter] = python_path_util.interpreter_registry.find(python_path)
+        self.interpreter_label.setText(f"{python_path}\n{interpreter.describe()}" if interpreter else python_path)
+
+    def load_config_to_ui(self: Self, force: bool = False) -> None:
+        """从配置文件加载数据到 UI, 配置文件自上次加载或保存后未变化时跳过"""
+
+        if not force and not self.is_config_stale():
+            return
+        with self.autosaver.suspend():
+            self._load_config_to_ui()
+        self.inherited_values = self.get_inherited_values()
+        self.preview_overrides = {}
+        self.mark_config_synced()
+        # 更新预览命令与构建历史
+        self.refresh_profile_views()
+
+    def get_inherited_values(self: Self) -> Dict[Tuple[str, str], Any]:
+        """项目配置中没有的配置项在控件中显示的值(来自 ~/ouroboros.toml 或默认值)"""
+
+        project: Dict[str, Any] = config_util.config_store.read(config_path).get("tool", {}).get("ouroboros", {})
+        return {
+            (section, key): gui_util.read_value(widget)
+            for section, widgets in self.fields.items()
+            for key, widget in widgets.items()
+            if key not in project.get(section, {})
+        }
 
-    def load_config_to_ui(self: Self) -> None:
-        """从配置文件加载数据到 UI"""
+    def _load_config_to_ui(self: Self) -> None:
+        """将配置写入各控件"""
 
-        nuitka_config: Dict[str, Any] = config_util.load_toml(config_path).get("tool", {}).get("ouroboros", {}).get("nuitka", {})
+        nuitka_config: Mapping[str, Any] = nuitka_util.load_nuitka_config()
         # 固定字段
+        self.refresh_interpreters(str(nuitka_config.get("interpreter", python_path_util.AUTO_INTERPRETER)))
         self.entry_input.setText(nuitka_config.get("entry", ""))
         self.output_name_input.setText(nuitka_config.get("output_name", ""))
         self.output_dir_input.setText(nuitka_config.get("output_dir", ""))
@@ -130,125 +347,188 @@ class NuitkaBuildInterface(Interface):
         self.remove_output_switch.setChecked(nuitka_config.get("remove_output", True))
         self.show_scons_switch.setChecked(nuitka_config.get("show_scons", False))
         self.assume_yes_switch.setChecked(nuitka_config.get("assume_yes", True))
+        self.benchmark_after_build_switch.setChecked(benchmark_util.get_benchmark_config(config_util.config_store.view())["after_build"])
         self.compiler_combo.setCurrentText(nuitka_config.get("compiler", "Auto"))
-        self.jobs_combo.setCurrentText(nuitka_config.get("jobs", self.default_job))
+        self.jobs_combo.setCurrentText(str(nuitka_config.get("jobs", self.default_job)))
+        self.ccache_switch.setChecked(nuitka_config.get("ccache", True))
+        self.ccache_dir_input.setText(nuitka_config.get("ccache_dir", ""))
+        self.ccache_max_size_input.setText(str(nuitka_config.get("ccache_max_size", "")))
         # 动态字段
         for field in ["plugins", "packages", "modules", "no_imports", "files", "dirs", "extra_args"]:
             container: gui_util.DynamicInputContainer = getattr(self, f"{field}_container")
             container.set_items(nuitka_config.get(field, []))
-        # 更新预览命令
-        self.command_preview.setText(self.generate_command_string())
+        # 构建方案
+        current_profile: str = self.profile_combo.currentText()
+        profile_names: List[str] = build_matrix_util.get_profile_names(nuitka_config)
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItems([DEFAULT_PROFILE] + profile_names + ([ALL_PROFILES] if len(profile_names) > 1 else []))
+        self.profile_combo.setCurrentText(current_profile if current_profile in profile_names + [ALL_PROFILES] else DEFAULT_PROFILE)
+        self.profile_combo.blockSignals(False)
 
-    def showEvent(self: Self, event: Any) -> None:
-        """当界面显示时触发"""
+    def refresh_profile_views(self: Self) -> None:
+        """按选中的方案刷新命令预览与构建历史"""
 
-        self.delay_variables["nuitka_version"]["command"][0] = python_path_util.get_python_path()
-        super().showEvent(event)
+        profile: Optional[str] = self.get_selected_profile()
+        self.command_preview.setText(nuitka_util.generate_command_string(profile, self.preview_overrides))
+        self.refresh_interpreter_label()
+        records: List[Dict[str, Any]] = build_history_util.load_history(profile or build_matrix_util.DEFAULT_PROFILE_NAME, build_history_util.TREND_SIZE)
+        self.breakdown_label.setText(build_history_util.format_breakdown(records[-1]) if records else "暂无构建记录")
+        self.trend_label.setText(build_history_util.format_trend(records))
+        self.refresh_benchmarks()
+        self.refresh_ccache_label()
 
-    def save_ui_to_config(self: Self) -> None:
-        """保存UI状态到配置文件"""
+    def refresh_ccache_label(self: Self) -> None:
+        """显示检测到的编译器缓存"""
 
+        nuitka_config: Mapping[str, Any] = nuitka_util.load_nuitka_config()
+        cache: Optional[Dict[str, str]] = ccache_util.detect(nuitka_config)
+        if cache:
+            self.ccache_label.setText(f"检测到 {cache['kind']} {cache['binary'] or '(Nuitka 内置)'}, 缓存目录 {cache['dir']}")
+        elif nuitka_config.get("ccache", True):
+            self.ccache_label.setText("未检测到 ccache, 请安装后加入 PATH 或设置 NUITKA_CCACHE_BINARY")
+        else:
+            self.ccache_label.setText("编译器缓存已禁用")
+
+    def refresh_benchmarks(self: Self) -> None:
+        """刷新启动测试对比表(所有方案最近的测试, 新的在前)"""
+
+        records: List[Dict[str, Any]] = benchmark_util.load_comparison()
+        self.benchmark_table.setRowCount(len(records))
+        for row, record in enumerate(records):
+            for column, text in enumerate(benchmark_util.comparison_row(record)):
+                self.benchmark_table.setItem(row, column, QTableWidgetItem(text))
+
+    def get_selected_profile(self: Self) -> Optional[str]:
+        """获取选中的单个方案, 默认或全部方案时返回 None"""
+
+        profile: str = self.profile_combo.currentText()
+        return None if profile in (DEFAULT_PROFILE, ALL_PROFILES, "") else profile
+
+    def save_ui_to_config(self: Self, dirty: Optional[Dict[str, Set[str]]] = None) -> None:
+        """保存UI状态到配置文件, dirty 为 None 时完整保存, 否则只写入被修改的项"""
+
+        full: bool = dirty is None
+        if dirty is None:
+            self.autosaver.reset()
+            # 完整保存时跳过仍与全局配置或默认值相同的项, 以免把全局配置固定到项目中
+            dirty = {
+                section: {key for key, widget in widgets.items() if self.inherited_values.get((section, key), MISSING) != gui_util.read_value(widget)}
+                for section, widgets in self.fields.items()
+            }
         config: Dict[str, Any] = config_util.load_toml(config_path)
         # 确保嵌套结构存在
-        if "tool" not in config:
-            config["tool"] = {}
-        if "ouroboros" not in config["tool"]:
-            config["tool"]["ouroboros"] = {}
-        # 获取或创建 nuitka 配置
-        nuitka_config: Dict[str, Any] = config["tool"]["ouroboros"].get("nuitka", {})
-        # 固定字段
-        nuitka_config.update(
-            {
-                "entry": self.entry_input.text().strip(),
-                "output_name": self.output_name_input.text().strip(),
-                "output_dir": self.output_dir_input.text().strip(),
-                "build_mode": self.build_mode_combo.currentText(),
-                "disable_console": self.disable_console_switch.isChecked(),
-                "remove_output": self.remove_output_switch.isChecked(),
-                "show_scons": self.show_scons_switch.isChecked(),
-                "assume_yes": self.assume_yes_switch.isChecked(),
-                "compiler": self.compiler_combo.currentText(),
-                "jobs": self.jobs_combo.currentText(),
-            }
-        )
-        # 动态字段
-        for field in ["plugins", "packages", "modules", "no_imports", "files", "dirs", "extra_args"]:
-            container: gui_util.DynamicInputContainer = getattr(self, f"{field}_container")
-            nuitka_config[field] = container.get_items()
-        # 将更新后的配置设置回嵌套结构中
-        config["tool"]["ouroboros"]["nuitka"] = nuitka_config
+        ouroboros_config: Dict[str, Any] = config.setdefault("tool", {}).setdefault("ouroboros", {})
+        for section, keys in dirty.items():
+            if not keys:
+                continue
+            section_config: Dict[str, Any] = ouroboros_config.setdefault(section, {})
+            for key in keys:
+                section_config[key] = gui_util.read_value(self.fields[section][key])
         config_util.save_toml(config, config_path)
-        gui_util.MessageDisplay.success(self, "保存配置成功")
-        # 更新预览命令
-        self.command_preview.setText(self.generate_command_string())
+        self.mark_config_synced()
+        self.refresh_ccache_label()
+        if full:
+            gui_util.MessageDisplay.success(self, "保存配置成功")
 
     def start_packaging(self: Self) -> None:
         """执行打包命令"""
 
-        # 保存到配置
-        self.save_ui_to_config()
-        # 获取命令字符串
-        command_str = self.generate_command_string()
-        # 执行命令
-        if command_str:
-            gui_util.MessageDisplay.info(self, "开始编译打包")
-            run_command(command_str)
+        # 写入尚未保存的修改
+        self.flush_config()
+        # 多个方案并行构建, 单个方案同样经过构建缓存与进程管理器
+        if self.profile_combo.currentText() == ALL_PROFILES:
+            self.start_matrix(build_matrix_util.get_profile_names(nuitka_util.load_nuitka_config()))
         else:
+            self.start_matrix([self.get_selected_profile()])
+
+    def start_matrix(self: Self, profiles: List[Optional[str]]) -> None:
+        """后台构建一个或多个方案, 结束后显示汇总"""
+
+        if not python_path_util.get_python_path():
             gui_util.MessageDisplay.error(self, "未找到解释器")
+            return
+        gui_util.MessageDisplay.info(self, f"开始编译打包: {', '.join(p or build_matrix_util.DEFAULT_PROFILE_NAME for p in profiles)}")
+        self.build_btn.setEnabled(False)
+        self.matrix_thread: MatrixThread = MatrixThread(self, profiles)
+        self.matrix_thread.finished_summary.connect(self.on_matrix_finished)
+        self.matrix_thread.start()
 
-    @staticmethod
-    def generate_command_string() -> str:
-        """生成命令字符串"""
-
-        nuitka_config: Dict[str, Any] = config_util.load_toml(config_path).get("tool", {}).get("ouroboros", {}).get("nuitka", {})
-        nuitka_args: List[str] = ["-m", "nuitka"]
-        if entry := nuitka_config.get("entry"):
-            nuitka_args.append(entry)
-        if output_name := nuitka_config.get("output_name"):
-            nuitka_args.append(f"--output-filename={output_name}")
-        if output_dir := nuitka_config.get("output_dir"):
-            nuitka_args.append(f"--output-dir={output_dir}")
-        build_mode: str = nuitka_config.get("build_mode", "独立模式")
-        mode_map: Dict[str, str] = {
-            "独立模式": "--standalone",
-            "单文件模式": "--onefile",
-            "模块模式": "--module",
-        }
-        if build_mode in mode_map:
-            nuitka_args.append(mode_map[build_mode])
-        if nuitka_config.get("disable_console"):
-            nuitka_args.append("--windows-console-mode=disable")
-        if nuitka_config.get("remove_output"):
-            nuitka_args.append("--remove-output")
-        if nuitka_config.get("show_scons"):
-            nuitka_args.append("--show-scons")
-        if nuitka_config.get("assume_yes"):
-            nuitka_args.append("--assume-yes-for-downloads")
-        compiler: str = nuitka_config.get("compiler", "Auto")
-        compiler_map: Dict[str, str] = {
-            "MSVC": "--msvc=latest",
-            "MinGW64": "--mingw64",
-            "Clang": "--clang",
-        }
-        if compiler in compiler_map:
-            nuitka_args.append(compiler_map[compiler])
-        if jobs := nuitka_config.get("jobs"):
-            nuitka_args.append(f"--jobs={jobs}")
-        for plugin in nuitka_config.get("plugins", []):
-            nuitka_args.append(f"--enable-plugin={plugin}")
-        for pkg in nuitka_config.get("packages", []):
-            nuitka_args.append(f"--include-package={pkg}")
-        for module in nuitka_config.get("modules", []):
-            nuitka_args.append(f"--include-module={module}")
-        for no_import in nuitka_config.get("no_imports", []):
-            nuitka_args.append(f"--nofollow-import-to={no_import}")
-        for file_item in nuitka_config.get("files", []):
-            nuitka_args.append(f"--include-data-files={file_item}")
-        for dir_item in nuitka_config.get("dirs", []):
-            nuitka_args.append(f"--include-data-dir={dir_item}")
-        for extra_arg in nuitka_config.get("extra_args", []):
-            nuitka_args.append(extra_arg)
-        python_path: str | None = python_path_util.get_python_path()
-        if python_path:
-            return f'"{python_path}" {" ".join(nuitka_args)}'
-        return ""
+    def start_benchmark(self: Self) -> None:
+        """后台测试选中方案(全部方案时逐个测试)的构建产物"""
+
+        if self.profile_combo.currentText() == ALL_PROFILES:
+            profiles: List[Optional[str]] = list(build_matrix_util.get_profile_names(nuitka_util.load_nuitka_config()))
+        else:
+            profiles = [self.get_selected_profile()]
+        gui_util.MessageDisplay.info(self, "开始测试启动")
+        self.benchmark_btn.setEnabled(False)
+        self.benchmark_thread: BenchmarkThread = BenchmarkThread(self, profiles)
+        self.benchmark_thread.finished_summary.connect(self.on_benchmark_finished)
+        self.benchmark_thread.start()
+
+    def on_benchmark_finished(self: Self, success: bool, summary: str) -> None:
+        """启动测试结束"""
+
+        self.benchmark_btn.setEnabled(True)
+        self.refresh_benchmarks()
+        if success:
+            gui_util.MessageDisplay.success(self, summary)
+        else:
+            gui_util.MessageDisplay.error(self, summary)
+
+    def on_matrix_finished(self: Self, success: bool, summary: str) -> None:
+        """并行构建结束"""
+
+        self.build_btn.setEnabled(True)
+        self.refresh_profile_views()
+        if success:
+            gui_util.MessageDisplay.success(self, summary)
+        else:
+            gui_util.MessageDisplay.error(self, summary)
+
+    def start_analyze(self: Self) -> None:
+        """后台分析导入图"""
+
+        if not python_path_util.get_python_path():
+            gui_util.MessageDisplay.error(self, "未找到解释器")
+            return
+        self.flush_config()
+        self.analyze_btn.setEnabled(False)
+        self.analyze_label.setText("分析中...")
+        self.analyze_thread: AnalyzeThread = AnalyzeThread(self)
+        self.analyze_thread.finished_report.connect(self.on_analyze_finished)
+        self.analyze_thread.start()
+
+    def on_analyze_finished(self: Self, report: Any) -> None:
+        """显示分析结果与建议"""
+
+        self.analyze_btn.setEnabled(True)
+        if isinstance(report, str):
+            self.analyze_label.setText(report)
+            gui_util.MessageDisplay.error(self, report)
+            return
+        text: str = import_graph_util.format_report(report)
+        self.analyze_label.setText(text.split("\n", 1)[0])
+        self.proposals = report.proposals
+        self.proposals_table.setRowCount(len(self.proposals))
+        for row, proposal in enumerate(self.proposals):
+            sign: str = "-" if proposal.field == "no_imports" else "+"
+            field: str = "禁用导入项" if proposal.field == "no_imports" else "启用包"
+            for column, value in enumerate([field, proposal.name, f"{sign}{build_history_util.format_bytes(proposal.size)}", str(proposal.modules), proposal.reason]):
+                self.proposals_table.setItem(row, column, QTableWidgetItem(value))
+
+    def apply_proposals(self: Self) -> None:
+        """将选中的建议(未选中时为全部)写入禁用导入项与启用包并保存"""
+
+        if not self.proposals:
+            gui_util.MessageDisplay.error(self, "请先分析导入")
+            return
+        rows: List[int] = sorted({index.row() for index in self.proposals_table.selectedIndexes()}) or list(range(len(self.proposals)))
+        containers: Dict[str, gui_util.DynamicInputContainer] = {"no_imports": self.no_imports_container, "packages": self.packages_container}
+        for row in rows:
+            proposal: import_graph_util.Proposal = self.proposals[row]
+            container: gui_util.DynamicInputContainer = containers[proposal.field]
+            if proposal.name not in container.get_items():
+                container.add_row(proposal.name)
+        self.flush_config()
@@ -1,31 +1,25 @@
 # interfaces/setting_interface.py
-from typing import Self, Optional
+from typing import Any, Mapping, Self, List, Optional
 
-from qfluentwidgets import PushButton
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout
+from qfluentwidgets import PushButton, TableWidget
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QTableWidgetItem
 
 from utils import gui_util
+from utils import config_util
+from utils import ccache_util
+from utils import delay_util
+from utils import process_util
 from utils import python_path_util
 from interfaces.interface import Interface
-from utils.platform_util import run_command
-from utils.style_util import default_style, yellow_style, green_style, blue_style, purple_style
+from utils.style_util import Style, default_style, red_style, yellow_style, green_style, blue_style, purple_style
 
 
-group_style: str = default_style.get_groupbox_style()
-button_style: str = default_style.get_button_style()
-lable_style: str = default_style.get_lable_style()
-
-nuitka_group_style: str = yellow_style.get_groupbox_style()
-nuitka_button_style: str = yellow_style.get_button_style()
-
-conda_group_style: str = green_style.get_groupbox_style()
-conda_button_style: str = green_style.get_button_style()
-
-uv_group_style: str = purple_style.get_groupbox_style()
-uv_button_style: str = purple_style.get_button_style()
-
-docker_group_style: str = blue_style.get_groupbox_style()
-docker_button_style: str = blue_style.get_button_style()
+# 页面配色, 各工具的设置区域使用对应页面的配色
+page_style: Style = default_style
+nuitka_style: Style = yellow_style
+conda_style: Style = green_style
+uv_style: Style = purple_style
+docker_style: Style = blue_style
 
 
 class SettingInterface(Interface):
@@ -40,46 +34,73 @@ class SettingInterface(Interface):
         """初始化 UI"""
 
         # 标题区域
-        self.title_label: QLabel = gui_util.LabelBuilder.create(self.content_widget, self.main_layout, content="全局设置", style="font-size: 24px; font-weight: bold; color: #333333; margin-bottom: 20px;")
+        self.title_label: QLabel = gui_util.LabelBuilder.create(self.content_widget, self.main_layout, content="全局设置")
         # 开发设置区域
-        dev_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "开发设置", style=group_style)
+        dev_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "开发设置", style=page_style)
         dev_layout: QVBoxLayout = QVBoxLayout(dev_group)
         # Nuitka 设置
-        nuitka_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "Nuitka", style=nuitka_group_style)
+        nuitka_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "Nuitka", style=nuitka_style)
         nuitka_layout: QVBoxLayout = QVBoxLayout(nuitka_group)
         nuitka_btn_layout: QHBoxLayout = QHBoxLayout()
         nuitka_layout.addLayout(nuitka_btn_layout)
         nuitka_btn_layout.addStretch()
-        self.clean_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, nuitka_btn_layout, "清理构建缓存", slot=self.clean_caches, style=nuitka_button_style)
+        self.clean_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, nuitka_btn_layout, "清理构建缓存", slot=self.clean_caches, style=nuitka_style)
+        self.trim_ccache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, nuitka_btn_layout, "整理编译器缓存", slot=self.trim_compiler_cache, style=nuitka_style)
         nuitka_btn_layout.addStretch()
         # Conda 设置
-        conda_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "Conda", style=conda_group_style)
+        conda_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "Conda", style=conda_style)
         conda_layout: QVBoxLayout = QVBoxLayout(conda_group)
         conda_btn_layout: QHBoxLayout = QHBoxLayout()
         conda_layout.addLayout(conda_btn_layout)
         conda_btn_layout.addStretch()
-        self.clean_conda_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, conda_btn_layout, "清理 conda 缓存", slot=self.clean_conda_cache, style=conda_button_style)
-        self.clean_pip_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, conda_btn_layout, "清理 pip 缓存", slot=self.clean_pip_cache, style=conda_button_style)
+        self.clean_conda_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, conda_btn_layout, "清理 conda 缓存", slot=self.clean_conda_cache, style=conda_style)
+        self.clean_pip_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, conda_btn_layout, "清理 pip 缓存", slot=self.clean_pip_cache, style=conda_style)
         conda_btn_layout.addStretch()
         # Docker 设置
-        docker_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "Docker", style=docker_group_style)
+        docker_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "Docker", style=docker_style)
         docker_layout: QVBoxLayout = QVBoxLayout(docker_group)
         docker_btn_layout: QHBoxLayout = QHBoxLayout()
         docker_layout.addLayout(docker_btn_layout)
         docker_btn_layout.addStretch()
-        self.clean_docker_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, docker_btn_layout, "清理构建缓存", slot=self.clean_docker_cache, style=docker_button_style)
+        self.clean_docker_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, docker_btn_layout, "清理构建缓存", slot=self.clean_docker_cache, style=docker_style)
         docker_btn_layout.addStretch()
         # UV 设置
-        uv_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "UV", style=uv_group_style)
+        uv_group: QGroupBox = gui_util.GroupBuilder.create(self, dev_layout, "UV", style=uv_style)
         uv_layout: QVBoxLayout = QVBoxLayout(uv_group)
         uv_btn_layout: QHBoxLayout = QHBoxLayout()
         uv_layout.addLayout(uv_btn_layout)
         uv_btn_layout.addStretch()
-        self.uv_prune_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "清理未使用缓存", slot=self.uv_prune_cache, style=uv_button_style)
-        self.uv_clean_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "清理全部缓存", slot=self.uv_clean_cache, style=uv_button_style)
-        self.uv_update_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "更新 uv", slot=self.uv_update, style=uv_button_style)
-        self.uv_upgrade_python_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "更新 python", slot=self.uv_upgrade_python, style=uv_button_style)
+        self.uv_prune_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "清理未使用缓存", slot=self.uv_prune_cache, style=uv_style)
+        self.uv_clean_cache_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "清理全部缓存", slot=self.uv_clean_cache, style=uv_style)
+        self.uv_update_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "更新 uv", slot=self.uv_update, style=uv_style)
+        self.uv_upgrade_python_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, uv_btn_layout, "更新 python", slot=self.uv_upgrade_python, style=uv_style)
         uv_btn_layout.addStretch()
+        # 任务区域
+        jobs_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "任务", style=page_style)
+        jobs_layout: QVBoxLayout = QVBoxLayout(jobs_group)
+        self.jobs_table: TableWidget = TableWidget(self)
+        self.jobs_table.setColumnCount(5)
+        self.jobs_table.setHorizontalHeaderLabels(["编号", "任务", "状态", "退出码", "耗时"])
+        self.jobs_table.verticalHeader().hide()
+        self.jobs_table.setMinimumHeight(200)
+        jobs_layout.addWidget(self.jobs_table)
+        self.cancel_job_btn: PushButton = gui_util.ButtonBuilder.create(self, jobs_layout, "取消任务", slot=self.cancel_selected_job, style=red_style)
+        gui_util.get_job_notifier().changed.connect(self.refresh_jobs)
+        self.refresh_jobs()
+        # 版本探测区域
+        probes_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "版本探测", style=page_style)
+        probes_layout: QVBoxLayout = QVBoxLayout(probes_group)
+        self.probes_table: TableWidget = TableWidget(self)
+        self.probes_table.setColumnCount(5)
+        self.probes_table.setHorizontalHeaderLabels(["命令", "状态", "来源", "结果", "耗时"])
+        self.probes_table.verticalHeader().hide()
+        self.probes_table.setMinimumHeight(160)
+        probes_layout.addWidget(self.probes_table)
+        self.reprobe_btn: PushButton = gui_util.ButtonBuilder.create(self, probes_layout, "重新探测", slot=self.reprobe, style=page_style)
+        delay_util.get_probe_pool().finished.connect(self.refresh_probes)
+        self.refresh_probes()
+        # 输出区域
+        self.attach_console(style=page_style)
 
     def clean_caches(self: Self) -> None:
         """清理 Nuitka 缓存"""
@@ -87,55 +108,101 @@ class SettingInterface(Interface):
         if not python_path:
             gui_util.MessageDisplay.error(self, "未找到可用解释器")
             return
-        command: str = f'"{python_path}" -m nuitka --clean-cache=all'
-        gui_util.MessageDisplay.info(self, "开始清理缓存")
-        run_command(command)
+        self.run_job("清理缓存", [[python_path, "-m", "nuitka", "--clean-cache=all"]])
+
+    def trim_compiler_cache(self: Self) -> None:
+        """将 ccache 缓存整理到 [tool.ouroboros.nuitka] 中配置的大小上限以内"""
+
+        nuitka_config: Mapping[str, Any] = config_util.config_store.section("nuitka")
+        commands: List[List[str]] = ccache_util.trim_commands(nuitka_config)
+        if not commands:
+            gui_util.MessageDisplay.error(self, "未检测到 ccache")
+            return
+        self.run_job("整理编译器缓存", commands, env=ccache_util.get_env(nuitka_config))
 
     def clean_conda_cache(self: Self) -> None:
         """清理 conda 缓存"""
 
-        command: str = "conda clean --all -y"
-        gui_util.MessageDisplay.info(self, "开始清理 conda 缓存")
-        run_command(command)
+        self.run_job("清理 conda 缓存", [["conda", "clean", "--all", "-y"]])
 
     def clean_pip_cache(self: Self) -> None:
         """清理 pip 缓存"""
 
-        command: str = "python -m pip cache purge"
-        gui_util.MessageDisplay.info(self, "开始清理 pip 缓存")
-        run_command(command)
+        self.run_job("清理 pip 缓存", [["python", "-m", "pip", "cache", "purge"]])
 
     def uv_prune_cache(self: Self) -> None:
         """清理未使用缓存"""
 
-        command: str = "uv cache prune"
-        gui_util.MessageDisplay.info(self, "开始清理未使用缓存")
-        run_command(command)
+        self.run_job("清理未使用缓存", [["uv", "cache", "prune"]])
 
     def uv_clean_cache(self: Self) -> None:
         """清理全部缓存"""
 
-        command: str = "uv cache clean"
-        gui_util.MessageDisplay.info(self, "开始清理全部缓存")
-        run_command(command)
+        self.run_job("清理全部缓存", [["uv", "cache", "clean"]])
 
     def uv_update(self: Self) -> None:
         """更新 uv"""
 
-        command: str = "uv self update"
-        gui_util.MessageDisplay.info(self, "开始更新 uv")
-        run_command(command)
+        self.run_job("更新 uv", [["uv", "self", "update"]])
 
     def uv_upgrade_python(self: Self) -> None:
         """更新 python"""
 
-        command: str = "uv python upgrade --preview-features python-upgrade"
-        gui_util.MessageDisplay.info(self, "开始更新 python")
-        run_command(command)
+        self.run_job("更新 python", [["uv", "python", "upgrade", "--preview-features", "python-upgrade"]])
 
     def clean_docker_cache(self: Self) -> None:
         """清理 Docker 构建缓存"""
 
-        command: str = "docker system df && docker builder prune --all --force && docker system df"
-        gui_util.MessageDisplay.info(self, "开始清理 Docker 构建缓存")
-        run_command(command)
+        self.run_job(
+            "清理 Docker 构建缓存",
+            [
+                ["docker", "system", "df"],
+                ["docker", "builder", "prune", "--all", "--force"],
+                ["docker", "system", "df"],
+            ],
+        )
+
+    def refresh_jobs(self: Self, job: Optional[process_util.Job] = None) -> None:
+        """刷新任务列表"""
+
+        jobs: List[process_util.Job] = process_util.process_manager.jobs
+        self.jobs_table.setRowCount(len(jobs))
+        for row, item in enumerate(reversed(jobs)):
+            code: str = "-" if item.returncode is None else str(item.returncode)
+            for column, text in enumerate([str(item.id), item.name, item.state.value, code, f"{item.duration:.1f}s"]):
+                self.jobs_table.setItem(row, column, QTableWidgetItem(text))
+
+    def refresh_probes(self: Self, probe: Optional[delay_util.Probe] = None) -> None:
+        """刷新版本探测列表, 耗时最长的在前"""
+
+        pool: delay_util.ProbePool = delay_util.get_probe_pool()
+        # 重新运行中的命令只显示进行中的探测
+        finished: List[delay_util.Probe] = [item for command, item in pool.results.items() if command not in pool.running]
+        probes: List[delay_util.Probe] = [*pool.running.values(), *sorted(finished, key=lambda item: item.duration, reverse=True)]
+        self.probes_table.setRowCount(len(probes))
+        for row, item in enumerate(probes):
+            state: str = "进行中" if item.ok is None else "成功" if item.ok else "失败"
+            duration: str = "-" if item.ok is None else f"{item.duration:.2f}s"
+            for column, text in enumerate([" ".join(item.command), state, item.source or "-", item.output, duration]):
+                self.probes_table.setItem(row, column, QTableWidgetItem(text))
+
+    def reprobe(self: Self) -> None:
+        """忽略已有结果, 重新运行全部版本探测"""
+
+        delay_util.get_probe_pool().warm_all(force=True)
+        self.refresh_probes()
+
+    def cancel_selected_job(self: Self) -> None:
+        """取消选中的任务"""
+
+        row: int = self.jobs_table.currentRow()
+        if row < 0:
+            gui_util.MessageDisplay.error(self, "请先选择任务")
+            return
+        job_id: int = int(self.jobs_table.item(row, 0).text())
+        for job in process_util.process_manager.active_jobs():
+            if job.id == job_id:
+                process_util.process_manager.cancel(job)
+                gui_util.MessageDisplay.info(self, f"已取消任务: {job.name}")
+                return
+        gui_util.MessageDisplay.error(self, "任务已结束")
@@ -1,20 +1,24 @@
 # interfaces/uv_manage_interface.py
+import time
 from pathlib import Path
-from qfluentwidgets import LineEdit, PushButton
-from typing import Any, Self, List, Dict, Optional
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout
+from PySide6.QtCore import Qt, QTimer
+from qfluentwidgets import LineEdit, PushButton, TreeWidget
+from typing import Any, Self, List, Dict, Mapping, Optional, Set, Tuple
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGroupBox, QHBoxLayout, QTreeWidgetItem
 
 from interfaces.interface import Interface
-from utils import config_util, gui_util, delay_util
-from utils.style_util import green_style, purple_style
+from utils import config_util, gui_util, delay_util, env_sync_util, inventory_util, lock_util, process_util
+from utils.build_history_util import format_bytes
+from utils.style_util import Style, green_style, purple_style
 from utils.platform_util import is_windows, is_linux, run_command
 
 
-group_style: str = purple_style.get_groupbox_style()
-button_style: str = purple_style.get_button_style()
-lable_style: str = purple_style.get_lable_style()
+# 页面配色, 由全局样式表按动态属性应用
+page_style: Style = purple_style
 
 config_path: Path = config_util.config_path
+# uv 管理的项目环境
+venv_path: Path = Path("./.venv")
 
 
 class UVManageInterface(Interface):
@@ -24,18 +28,17 @@ class UVManageInterface(Interface):
         self.setObjectName("UVManageInterface")
         # 初始化 UI
         self.init_ui()
+        # 修改后自动保存被修改的项
+        self.config_sections = {"project": (config_path, "project"), "dependency-groups": (config_path, "dependency-groups")}
+        self.autosaver = gui_util.AutoSaver(self, self.save_ui_to_config)
+        for key, widget in [("version", self.project_version_input), ("requires-python", self.python_version_input), ("dependencies", self.pip_container)]:
+            self.autosaver.watch("project", key, widget)
+        self.autosaver.watch("dependency-groups", "dev", self.dev_container)
         # 加载配置到 UI
         self.load_config_to_ui()
         # 延时变量
         self.delay_variables: Dict[str, Any] = {
-            "uv_version": {
-                "var": None,
-                "object": self.uv_version_label,
-                "command": ["uv", "--version"],
-                "prefix": "UV Version: ",
-                "err": "未找到, 请确保 uv 已安装",
-                "operate": delay_util.set_label_text,
-            },
+            "uv_version": delay_util.create_delay_var("uv_version", self.uv_version_label),
         }
 
     def init_ui(self: Self) -> None:
@@ -44,45 +47,97 @@ class UVManageInterface(Interface):
         # 标题区域
         self.title_label: QLabel = gui_util.LabelBuilder.create(self.content_widget, self.main_layout, content="UV 环境管理")
         # 信息区域
-        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=group_style)
+        info_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "信息", style=page_style)
         info_layout: QVBoxLayout = QVBoxLayout(info_group)
-        self.uv_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=lable_style)
+        self.uv_version_label: QLabel = gui_util.LabelBuilder.create(self, info_layout, style=page_style)
         # 操作区域
-        action_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "操作", style=group_style)
+        action_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "操作", style=page_style)
         action_layout: QVBoxLayout = QVBoxLayout(action_group)
         action_btn_layout: QHBoxLayout = QHBoxLayout()
         action_layout.addLayout(action_btn_layout)
         action_btn_layout.addStretch()
-        self.sync_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "同步环境", slot=self.sync_env, style=button_style)
-        self.save_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "保存配置", slot=self.save_ui_to_config, style=button_style)
-        self.activate_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "激活环境", slot=self.activate_venv, style=button_style)
-        self.export_pip_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "导出 requirements.txt", slot=self.export_requirements, style=button_style)
-        self.update_deps_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "更新依赖", slot=self.update_dependencies, style=button_style)
+        self.sync_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "同步环境", slot=self.sync_env, style=page_style)
+        self.save_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "保存配置", slot=lambda: self.save_ui_to_config(), style=page_style)
+        self.activate_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "激活环境", slot=self.activate_venv, style=page_style)
+        self.export_pip_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "导出 requirements.txt", slot=self.export_requirements, style=page_style)
+        self.update_deps_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, action_btn_layout, "更新依赖", slot=self.update_dependencies, style=page_style)
         action_btn_layout.addStretch()
         # 环境参数区域
-        env_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "环境参数", style=group_style)
+        env_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "环境参数", style=page_style)
         env_layout: QVBoxLayout = QVBoxLayout(env_group)
-        self.python_version_input: LineEdit = gui_util.InputBuilder.create(self, env_layout, "Python 版本", "输入 Python 版本(默认: 3.10)", lable_style=lable_style)
+        self.python_version_input: LineEdit = gui_util.InputBuilder.create(self, env_layout, "Python 版本", "输入 Python 版本(默认: 3.10)", lable_style=page_style)
         # 项目元数据区域
-        metadata_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "项目元数据", style=group_style)
+        metadata_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "项目元数据", style=page_style)
         metadata_layout: QVBoxLayout = QVBoxLayout(metadata_group)
-        self.project_version_input: LineEdit = gui_util.InputBuilder.create(self, metadata_layout, "项目版本", "输入项目版本(例如: 0.0.1)", lable_style=lable_style)
+        self.project_version_input: LineEdit = gui_util.InputBuilder.create(self, metadata_layout, "项目版本", "输入项目版本(例如: 0.0.1)", lable_style=page_style)
         # 依赖管理区域
-        pip_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "包管理", style=group_style)
+        pip_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "包管理", style=page_style)
         pip_layout: QVBoxLayout = QVBoxLayout(pip_group)
         self.pip_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, pip_layout, "输入包名")
-        self.pip_add_btn: PushButton = gui_util.ButtonBuilder.create(self, pip_layout, "添加", slot=lambda: self.pip_container.add_row(""), style=green_style.get_button_style())
+        self.pip_add_btn: PushButton = gui_util.ButtonBuilder.create(self, pip_layout, "添加", slot=lambda: self.pip_container.add_row(""), style=green_style)
         # dev 依赖管理区域
-        dev_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "开发依赖", style=group_style)
+        dev_group: QGroupBox = gui_util.GroupBuilder.create(self, env_layout, "开发依赖", style=page_style)
         dev_layout: QVBoxLayout = QVBoxLayout(dev_group)
         self.dev_container: gui_util.DynamicInputContainer = gui_util.DynamicInputContainer(self, dev_layout, "输入开发依赖包名")
-        self.dev_add_btn: PushButton = gui_util.ButtonBuilder.create(self, dev_layout, "添加", slot=lambda: self.dev_container.add_row(""), style=green_style.get_button_style())
+        self.dev_add_btn: PushButton = gui_util.ButtonBuilder.create(self, dev_layout, "添加", slot=lambda: self.dev_container.add_row(""), style=green_style)
+        # 已安装的包区域
+        inventory_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "已安装的包", style=page_style)
+        inventory_layout: QVBoxLayout = QVBoxLayout(inventory_group)
+        self.inventory_label: QLabel = gui_util.LabelBuilder.create(self, inventory_layout, style=page_style)
+        self.inventory_table: gui_util.SortableTableView = gui_util.TableBuilder.create(self, inventory_layout, ["名称", "版本", "安装者", "大小"], min_height=300)
+        self.refresh_inventory_btn: PushButton = gui_util.ButtonBuilder.create(self, inventory_layout, "刷新", slot=self.refresh_inventory, style=page_style)
+        # 依赖树区域
+        lock_group: QGroupBox = gui_util.GroupBuilder.create(self, self.main_layout, "依赖树(uv.lock)", style=page_style)
+        lock_layout: QVBoxLayout = QVBoxLayout(lock_group)
+        self.lock_label: QLabel = gui_util.LabelBuilder.create(self, lock_layout, style=page_style)
+        self.lock_tree: TreeWidget = TreeWidget(self)
+        self.lock_tree.setColumnCount(4)
+        self.lock_tree.setHeaderLabels(["包", "版本", "子树(包数 / 下载大小)", "说明"])
+        self.lock_tree.setMinimumHeight(300)
+        # 展开时才创建子节点
+        self.lock_tree.itemExpanded.connect(self.expand_lock_item)
+        lock_layout.addWidget(self.lock_tree)
+        self.lock_query_input: LineEdit = gui_util.InputBuilder.create(self, lock_layout, "查询包", "输入包名(例如: pyside6-essentials)", lable_style=page_style)
+        lock_btn_layout: QHBoxLayout = QHBoxLayout()
+        lock_layout.addLayout(lock_btn_layout)
+        lock_btn_layout.addStretch()
+        self.why_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, lock_btn_layout, "为何安装", slot=self.query_why, style=page_style)
+        self.removal_btn: PushButton = gui_util.PrimaryButtonBuilder.create(self, lock_btn_layout, "移除影响", slot=self.query_removal, style=page_style)
+        lock_btn_layout.addStretch()
+        self.lock_result_label: QLabel = gui_util.LabelBuilder.create(self, lock_layout, style=page_style)
+        self.lock_result_label.setWordWrap(True)
+        self.lock_index: Optional[lock_util.LockIndex] = None
+        # 输出区域
+        self.attach_console(style=page_style)
+
+    def showEvent(self: Self, event: Any) -> None:
+        """显示时刷新包清单(目录未变化时直接使用缓存)"""
+        super().showEvent(event)
+        QTimer.singleShot(0, self.refresh_inventory)
+        QTimer.singleShot(0, self.refresh_lock_tree)
+
+    def refresh_inventory(self: Self) -> None:
+        """读取 .venv 的包清单"""
+
+        start: float = time.perf_counter()
+        inventory: inventory_util.Inventory = inventory_util.package_inventory.get(venv_path.absolute())
+        self.inventory_label.setText(inventory_util.format_summary(inventory, time.perf_counter() - start))
+        self.inventory_table.set_rows(inventory_util.get_rows(inventory))
+
+    def load_config_to_ui(self: Self, force: bool = False) -> None:
+        """从配置文件加载数据到 UI, 配置文件自上次加载或保存后未变化时跳过"""
 
-    def load_config_to_ui(self: Self) -> None:
-        """从配置文件加载数据到 UI"""
+        if not force and not self.is_config_stale():
+            return
+        with self.autosaver.suspend():
+            self._load_config_to_ui()
+        self.mark_config_synced()
+
+    def _load_config_to_ui(self: Self) -> None:
+        """将配置写入各控件"""
 
         if config_path.exists():
-            config: Dict[str, Any] = config_util.load_toml(config_path)
+            config: Mapping[str, Any] = config_util.config_store.view()
             # 加载项目版本
             if "project" in config and "version" in config["project"]:
                 self.project_version_input.setText(config["project"]["version"])
@@ -98,14 +153,85 @@ class UVManageInterface(Interface):
             if "dependency-groups" in config and "dev" in config["dependency-groups"]:
                 self.dev_container.set_items(config["dependency-groups"]["dev"])
 
+    def refresh_lock_tree(self: Self) -> None:
+        """读取 uv.lock 的索引, 锁文件变化时重建依赖树的顶层"""
+
+        start: float = time.perf_counter()
+        index: Optional[lock_util.LockIndex] = lock_util.lock_index_cache.load(lock_util.lock_path)
+        duration: float = time.perf_counter() - start
+        if index is None:
+            self.lock_index = None
+            self.lock_tree.clear()
+            self.lock_label.setText("未找到 uv.lock, 请先同步环境")
+            return
+        self.lock_label.setText(f"共 {len(index.names)} 个包, 读取耗时 {duration * 1000:.1f}ms({lock_util.lock_index_cache.source})")
+        if index is self.lock_index:
+            return
+        self.lock_index = index
+        self.lock_tree.clear()
+        self.lock_tree.addTopLevelItems([self.create_lock_item(root, "") for root in index.roots])
+
+    def create_lock_item(self: Self, i: int, note: str) -> QTreeWidgetItem:
+        """依赖树的节点, 有依赖时显示展开标记, 子节点在展开时创建"""
+
+        assert self.lock_index is not None
+        count, size = self.lock_index.subtree(i)
+        item: QTreeWidgetItem = QTreeWidgetItem([self.lock_index.names[i], self.lock_index.versions[i], f"{count} / {format_bytes(size)}", note])
+        item.setData(0, Qt.ItemDataRole.UserRole, i)
+        if self.lock_index.deps[i]:
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ChildIndicatorPolicy.ShowIndicator)
+        return item
+
+    def expand_lock_item(self: Self, item: QTreeWidgetItem) -> None:
+        """首次展开时创建子节点"""
+
+        index: Optional[lock_util.LockIndex] = self.lock_index
+        if item.childCount() or index is None:
+            return
+        deps: List[Tuple[int, str]] = sorted(index.get_deps(item.data(0, Qt.ItemDataRole.UserRole)), key=lambda dep: index.names[dep[0]])
+        item.addChildren([self.create_lock_item(dep, note) for dep, note in deps])
+
+    def query_why(self: Self) -> None:
+        """显示从项目到该包的依赖链"""
+
+        name: str = self.lock_query_input.text().strip()
+        if self.lock_index is None or not self.lock_index.find(name):
+            self.lock_result_label.setText(f"uv.lock 中没有 {name}")
+            return
+        chains: List[List[int]] = self.lock_index.why(name)
+        lines: List[str] = [lock_util.format_chain(self.lock_index, chain) for chain in chains]
+        self.lock_result_label.setText("\n".join(lines) if lines else f"{name} 不被项目依赖")
+
+    def query_removal(self: Self) -> None:
+        """显示移除该包后不再需要的包及其下载大小"""
+
+        name: str = self.lock_query_input.text().strip()
+        if self.lock_index is None or not self.lock_index.find(name):
+            self.lock_result_label.setText(f"uv.lock 中没有 {name}")
+            return
+        dropped: List[int] = self.lock_index.removal(name)
+        size: int = sum(self.lock_index.sizes[i] for i in dropped)
+        names: str = ", ".join(self.lock_index.label(i) for i in dropped)
+        self.lock_result_label.setText(f"移除 {name} 将不再需要 {len(dropped)} 个包, 共 {format_bytes(size)}: {names}")
+
     def sync_env(self: Self) -> None:
-        """同步环境"""
+        """同步环境, 环境已与 pyproject.toml 和 uv.lock 一致时询问是否仍要同步"""
 
-        # 保存配置
-        self.save_ui_to_config()
+        # 写入尚未保存的修改
+        self.flush_config()
+        in_sync, reason = env_sync_util.check(venv_path.absolute(), env_sync_util.get_uv_inputs(config_path))
+        if in_sync and not gui_util.MessageDisplay.confirm(self, "环境已是最新", f"{reason}, 仍要运行 uv sync?", yes_text="强制同步"):
+            return
         # 执行同步命令
-        gui_util.MessageDisplay.info(self, "开始同步环境")
-        run_command("uv sync")
+        self.run_job("同步环境", [["uv", "sync"]], cpus=1, on_finish=self.on_sync_finished)
+
+    def on_sync_finished(self: Self, job: process_util.Job) -> None:
+        """同步成功后在 .venv 中记录本次的输入与包清单"""
+
+        if job.state == process_util.JobState.SUCCEEDED:
+            env_sync_util.record(venv_path.absolute(), env_sync_util.get_uv_inputs(config_path))
+        self.refresh_inventory()
+        self.refresh_lock_tree()
 
     def activate_venv(self: Self) -> None:
         """激活环境"""
@@ -116,66 +242,79 @@ class UVManageInterface(Interface):
             command = ".\\.venv\\Scripts\\activate"
         elif is_linux():
             command = "source ./.venv/bin/activate"
+        # 激活依赖 shell 内建命令, 仍通过 shell 执行
         run_command(command)
 
     def export_requirements(self: Self) -> None:
-        """导出依赖 requirements.txt"""
+        """导出依赖 requirements.txt, 直接读取 .venv 中的包元数据"""
 
-        # 执行命令
-        gui_util.MessageDisplay.info(self, "开始导出 requirements.txt")
-        run_command("uv pip freeze > ./requirements.txt")
+        inventory: inventory_util.Inventory = inventory_util.package_inventory.get(venv_path.absolute())
+        if not inventory.distributions:
+            gui_util.MessageDisplay.error(self, "未找到 .venv 中已安装的包, 请先同步环境")
+            return
+        config_util.atomic_write(Path("./requirements.txt"), inventory.format_requirements())
+        gui_util.MessageDisplay.success(self, f"已导出 {len(inventory.distributions)} 个包到 requirements.txt")
 
     def update_dependencies(self: Self) -> None:
         """更新依赖"""
 
-        # 保存配置
-        self.save_ui_to_config()
-        gui_util.MessageDisplay.info(self, "开始更新依赖")
-        run_command("uv sync --upgrade")
+        # 写入尚未保存的修改
+        self.flush_config()
+        # 升级需要查询索引中的新版本, 总是运行
+        self.run_job("更新依赖", [["uv", "sync", "--upgrade"]], cpus=1, on_finish=self.on_sync_finished)
 
-    def save_ui_to_config(self: Self) -> None:
-        """将当前UI状态保存到配置文件"""
+    def save_ui_to_config(self: Self, dirty: Optional[Dict[str, Set[str]]] = None) -> None:
+        """将当前UI状态保存到配置文件, dirty 为 None 时完整保存, 否则只写入被修改的项"""
 
+        full: bool = dirty is None or not config_path.exists()
         if not config_path.exists():
             self.init_project()
+        keys: Set[str] = {"version", "requires-python", "dependencies", "dev"} if full else set().union(*(dirty or {}).values())
+        if full:
+            self.autosaver.reset()
         # 加载现有配置
         config: Dict[str, Any] = config_util.load_toml(config_path)
         # 确保 project 部分存在
         if "project" not in config:
             config["project"] = {}
         # 更新项目版本
-        config["project"]["version"] = self.get_project_version()
+        if "version" in keys:
+            config["project"]["version"] = self.get_project_version()
         # 更新 Python 版本
-        python_version_input = self.python_version_input.text().strip()
-        if python_version_input and ("," in python_version_input or any(op in python_version_input for op in ["<", ">", "=", "~"])):
-            # 如果用户输入了范围约束(包含逗号或操作符), 则保持原样
-            config["project"]["requires-python"] = python_version_input
-        else:
-            # 否则使用默认的 >= 约束
-            python_version = self.get_python_version()
-            config["project"]["requires-python"] = f">={python_version}"
+        if "requires-python" in keys:
+            python_version_input = self.python_version_input.text().strip()
+            if python_version_input and ("," in python_version_input or any(op in python_version_input for op in ["<", ">", "=", "~"])):
+                # 如果用户输入了范围约束(包含逗号或操作符), 则保持原样
+                config["project"]["requires-python"] = python_version_input
+            else:
+                # 否则使用默认的 >= 约束
+                python_version = self.get_python_version()
+                config["project"]["requires-python"] = f">={python_version}"
         # 更新普通依赖
-        dependencies: List[str] = self.pip_container.get_items()
-        if dependencies:
-            config["project"]["dependencies"] = dependencies
-        elif "dependencies" in config["project"]:
-            del config["project"]["dependencies"]
+        if "dependencies" in keys:
+            dependencies: List[str] = self.pip_container.get_items()
+            if dependencies:
+                config["project"]["dependencies"] = dependencies
+            elif "dependencies" in config["project"]:
+                del config["project"]["dependencies"]
         # 更新开发依赖
-        dev_dependencies: List[str] = self.dev_container.get_items()
-        if dev_dependencies:
-            # 确保 dependency-groups 部分存在
-            if "dependency-groups" not in config:
-                config["dependency-groups"] = {}
-            config["dependency-groups"]["dev"] = dev_dependencies
-        elif "dependency-groups" in config and "dev" in config["dependency-groups"]:
-            del config["dependency-groups"]["dev"]
-            # 如果 dependency-groups 为空, 删除整个部分
-            if not config["dependency-groups"]:
-                del config["dependency-groups"]
-        # 写入文件
+        if "dev" in keys:
+            dev_dependencies: List[str] = self.dev_container.get_items()
+            if dev_dependencies:
+                # 确保 dependency-groups 部分存在
+                if "dependency-groups" not in config:
+                    config["dependency-groups"] = {}
+                config["dependency-groups"]["dev"] = dev_dependencies
+            elif "dependency-groups" in config and "dev" in config["dependency-groups"]:
+                del config["dependency-groups"]["dev"]
+                # 如果 dependency-groups 为空, 删除整个部分
+                if not config["dependency-groups"]:
+                    del config["dependency-groups"]
+        # 写入文件, 内容即 UI 当前状态, 无需重新加载
         config_util.save_toml(config, config_path)
-        self.load_config_to_ui()
-        gui_util.MessageDisplay.success(self, "保存配置成功")
+        self.mark_config_synced()
+        if full:
+            gui_util.MessageDisplay.success(self, "保存配置成功")
 
     def init_project(self: Self) -> None:
         """初始化 uv 配置文件"""
@@ -1,88 +1,121 @@
 # main.py
+import os
 import sys
+import time
+
+# 启动计时起点(导入 Qt 之前)
+STARTUP_BEGIN: float = time.perf_counter()
+
 import argparse
-from typing import Self
-from pathlib import Path
-from PySide6.QtWidgets import QApplication
-from qfluentwidgets import FluentWindow, NavigationItemPosition, FluentIcon
-
-# 导入自定义页面
-from interfaces.home_interface import HomeInterface
-from interfaces.nuitka_build_interface import NuitkaBuildInterface
-from interfaces.conda_manage_interface import CondaManageInterface
-from interfaces.docker_manage_interface import DockerManageInterface
-from interfaces.uv_manage_interface import UVManageInterface
-from interfaces.setting_interface import SettingInterface
-from interfaces.help_interface import HelpInterface
-
-from resources import icon
-from utils import icon_util
-
-
-class MainWindow(FluentWindow):
-    def __init__(self: Self) -> None:
-        super().__init__()
-        # 创建窗口
-        self.setWindowTitle(f"Ouroboros-{Path.cwd().name}")
-        self.resize(1280, 720)
-        # 创建子界面实例
-        self.homeInterface: HomeInterface = HomeInterface(self)
-        self.nuitka_build_interface: NuitkaBuildInterface = NuitkaBuildInterface(self)
-        self.conda_manage_interface: CondaManageInterface = CondaManageInterface(self)
-        self.docker_manage_interface: DockerManageInterface = DockerManageInterface(self)
-        self.uv_manage_interface = UVManageInterface(self)
-        self.settingInterface: SettingInterface = SettingInterface(self)
-        self.helpInterface: HelpInterface = HelpInterface(self)
-        # 添加导航项
-        self.add_navigation_items()
-        # 连接首页按钮信号
-        self.homeInterface.nuitka_button.clicked.connect(lambda: self.switchTo(self.nuitka_build_interface))
-        self.homeInterface.conda_button.clicked.connect(lambda: self.switchTo(self.conda_manage_interface))
-        self.homeInterface.docker_button.clicked.connect(lambda: self.switchTo(self.docker_manage_interface))
-        self.homeInterface.uv_button.clicked.connect(lambda: self.switchTo(self.uv_manage_interface))
-
-    def add_navigation_items(self: Self) -> None:
-        # 添加主导航项
-        self.addSubInterface(
-            self.homeInterface,
-            FluentIcon.HOME,
-            "首页",
-        )
-        self.addSubInterface(
-            self.nuitka_build_interface,
-            icon_util.FluentIcon.NUITKA,
-            "Nuitka 编译打包",
-        )
-        self.addSubInterface(
-            self.conda_manage_interface,
-            icon_util.FluentIcon.CONDA,
-            "Conda 环境管理",
-        )
-        self.addSubInterface(
-            self.docker_manage_interface,
-            icon_util.FluentIcon.DOCKER,
-            "Docker 环境管理",
-        )
-        self.addSubInterface(
-            self.uv_manage_interface,
-            icon_util.FluentIcon.UV,
-            "UV 环境管理",
-        )
-        self.addSubInterface(
-            self.settingInterface,
-            FluentIcon.SETTING,
-            "设置",
-            position=NavigationItemPosition.BOTTOM,
-        )
-        # 添加底部导航
-        self.addSubInterface(
-            self.helpInterface,
-            FluentIcon.HELP,
-            "帮助与支持",
-            position=NavigationItemPosition.BOTTOM,
-        )
-        # 默认选中首页
-        self.switchTo(self.homeInterface)
+from typing import Any, Dict, List, Mapping, Optional
+
+# Qt 与页面只在 GUI 模式下导入, 命令行模式(打包、分析、测试)不依赖 Qt, 见 scripts/check_cli_imports.py
+# 设置该环境变量时 GUI 启动完成后立即退出, 用于测试启动耗时
+EXIT_AFTER_STARTUP_ENV: str = "OUROBOROS_EXIT_AFTER_STARTUP"
+
+
+def run_gui(startup_time: bool = False, profile_startup: bool = False) -> None:
+    """打开 GUI 界面, profile_startup 时记录启动各阶段耗时并写入报告后退出"""
+
+    from utils import startup_profile_util
+
+    profiler: Optional[startup_profile_util.StartupProfiler] = startup_profile_util.start(STARTUP_BEGIN) if profile_startup else None
+    with startup_profile_util.measure("导入 Qt 与主窗口", "导入"):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+        from interfaces.main_window import FirstPaintProbe, MainWindow, StartupProfileProbe, hook_stylesheets
+
+    with startup_profile_util.measure("创建 QApplication", "初始化"):
+        app: QApplication = QApplication(sys.argv)
+    if profiler:
+        hook_stylesheets(profiler)
+    with startup_profile_util.measure("创建主窗口", "初始化"):
+        window: MainWindow = MainWindow()
+    if profiler:
+        StartupProfileProbe(window, profiler)
+    elif startup_time:
+        FirstPaintProbe(window, STARTUP_BEGIN, exit_after=True)
+    with startup_profile_util.measure("显示主窗口", "初始化"):
+        window.show()
+    # 启动测试: 首次进入事件循环后立即退出
+    if os.environ.get(EXIT_AFTER_STARTUP_ENV):
+        QTimer.singleShot(0, app.quit)
+    sys.exit(app.exec())
+
+
+def build(use_cache: bool = True, profiles: Optional[List[str]] = None, benchmark: bool = False) -> None:
+    """命令行打包, 多个方案并行构建, 指纹未变化时直接复用缓存的产物"""
+
+    from utils import config_util, build_cache_util, build_matrix_util, build_history_util, python_path_util, benchmark_util, nuitka_util
+    from utils.process_util import process_manager, format_job
+
+    python_path: str = python_path_util.get_python_path()
+    if not python_path:
+        print("未找到解释器!")
+        return
+    config: Mapping[str, Any] = config_util.config_store.view()
+    nuitka_config: Mapping[str, Any] = nuitka_util.load_nuitka_config()
+    cache: build_cache_util.BuildCache | None = build_cache_util.BuildCache.from_config(config) if use_cache else None
+    unknown: List[str] = [p for p in profiles or [] if p not in build_matrix_util.get_profile_names(nuitka_config)]
+    if unknown:
+        print(f"未定义的构建方案: {', '.join(unknown)}")
+        sys.exit(2)
+    # 输出任务状态变化与子进程输出
+    process_manager.configure(config)
+    process_manager.add_listener(lambda job: print(format_job(job)))
+    process_manager.add_output_listener(lambda job, line: print(f"[{job.name}] {line}" if profiles and len(profiles) > 1 else line, flush=True))
+    try:
+        results: List[build_matrix_util.BuildResult] = build_matrix_util.run_matrix(list(profiles or [None]), nuitka_config, nuitka_util.generate_nuitka_args, python_path, cache)
+    except KeyboardInterrupt:
+        process_manager.cancel_all()
+        sys.exit(130)
+    print(build_matrix_util.format_summary(results))
+    for result in results:
+        if result.record:
+            print(build_history_util.format_breakdown(result.record))
+    if failed := [r for r in results if r.returncode != 0]:
+        sys.exit(failed[0].returncode)
+    if benchmark or benchmark_util.get_benchmark_config(config)["after_build"]:
+        run_benchmark(list(profiles or [None]))
+
+
+def run_benchmark(profiles: List[Optional[str]]) -> None:
+    """命令行测试构建产物的启动耗时与体积, 并与最近的测试对比"""
+
+    from utils import config_util, benchmark_util, nuitka_util
+    from utils.build_matrix_util import DEFAULT_PROFILE_NAME
+
+    benchmark_config: Dict[str, Any] = benchmark_util.get_benchmark_config(config_util.config_store.view())
+    records, errors = benchmark_util.benchmark_profiles(profiles, nuitka_util.load_nuitka_config(), benchmark_config)
+    for error in errors:
+        print(error)
+    print(benchmark_util.format_comparison(benchmark_util.load_comparison([p or DEFAULT_PROFILE_NAME for p in profiles])))
+    if errors or any(r["returncode"] != 0 for r in records):
+        sys.exit(1)
+
+
+def analyze_imports(apply: bool = False) -> None:
+    """命令行分析导入图, 输出 no_imports / packages 建议, 可选地写入配置"""
+
+    from utils import config_util, import_graph_util, python_path_util
+
+    python_path: str = python_path_util.get_python_path()
+    if not python_path:
+        print("未找到解释器!")
+        return
+    try:
+        report: import_graph_util.ImportReport = import_graph_util.analyze(config_util.config_store.section("nuitka"), python_path)
+    except FileNotFoundError as e:
+        print(e)
+        sys.exit(2)
+    print(import_graph_util.format_report(report))
+    if apply and report.proposals:
+        # 只写入项目配置, 不把全局默认值写回 pyproject.toml
+        config: Dict[str, Any] = config_util.load_toml(config_util.config_path)
+        nuitka_config: Dict[str, Any] = config.setdefault("tool", {}).setdefault("ouroboros", {}).setdefault("nuitka", {})
+        applied: List[import_graph_util.Proposal] = import_graph_util.apply_proposals(nuitka_config, report.proposals)
+        config_util.save_toml(config, config_util.config_path)
+        print(f"已写入 {len(applied)} 条建议到 [tool.ouroboros.nuitka]")
 
 
 def main() -> None:
@@ -92,21 +125,22 @@ def main() -> None:
     group.add_argument("-h", "--help", action="store_true", help="显示帮助信息")
     group.add_argument("-g", "--gui", action="store_true", help="打开 GUI 界面")
     group.add_argument("-b", "--build", action="store_true", help="调用 Nuitka 打包")
+    group.add_argument("-a", "--analyze", action="store_true", help="分析导入图并给出禁用导入项建议")
+    parser.add_argument("--no-cache", action="store_true", help="打包时忽略构建缓存")
+    parser.add_argument("-p", "--profile", default="", help="打包时使用的构建方案, 多个方案用逗号分隔并行构建")
+    parser.add_argument("--apply", action="store_true", help="分析导入时将建议写入配置")
+    parser.add_argument("--benchmark", action="store_true", help="测试构建产物的启动耗时与体积, 与 -b 同用时在打包后测试")
+    parser.add_argument("--startup-time", action="store_true", help="与 -g 同用, 输出窗口首次绘制的耗时后退出")
+    parser.add_argument("--profile-startup", action="store_true", help="与 -g 同用, 记录启动各阶段耗时, 写入 .ouroboros/startup_profile.json 后退出")
     args: argparse.Namespace = parser.parse_args()
     if args.gui:
-        app: QApplication = QApplication(sys.argv)
-        window: MainWindow = MainWindow()
-        window.show()
-        sys.exit(app.exec())
+        run_gui(startup_time=args.startup_time, profile_startup=args.profile_startup)
     elif args.build:
-        from utils.platform_util import run_command
-        from interfaces.nuitka_build_interface import NuitkaBuildInterface
-
-        command_str: str = NuitkaBuildInterface.generate_command_string()
-        if command_str:
-            run_command(command_str)
-        else:
-            print("未找到解释器!")
+        build(use_cache=not args.no_cache, profiles=[p.strip() for p in args.profile.split(",") if p.strip()], benchmark=args.benchmark)
+    elif args.analyze:
+        analyze_imports(apply=args.apply)
+    elif args.benchmark:
+        run_benchmark([p.strip() for p in args.profile.split(",") if p.strip()] or [None])
     else:
         parser.print_help()
 
@@ -0,0 +1,101 @@
+# scripts/bench_config.py
+"""配置读取基准测试: 对比每次调用都重新解析(旧)与 ConfigStore 缓存(新)的解析次数与耗时
+
+用法: python scripts/bench_config.py [pyproject.toml] [-n 轮数]
+在临时目录中的副本上模拟 Nuitka 页面的 "加载界面 -> 保存 -> 预览命令" 流程, 不修改原文件"""
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import config_util  # noqa: E402
+from utils.config_util import ConfigStore  # noqa: E402
+
+
+def nuitka_section(config: Any) -> Any:
+    """取 [tool.ouroboros.nuitka]"""
+
+    return config.get("tool", {}).get("ouroboros", {}).get("nuitka", {})
+
+
+def run_legacy(path: Path, rounds: int) -> Tuple[int, List[float]]:
+    """旧流程: 每次读取都重新解析"""
+
+    parses: List[int] = [0]
+
+    def load() -> Dict[str, Any]:
+        parses[0] += 1
+        return config_util.parse_file(path)[0]
+
+    def cycle() -> None:
+        # 加载界面: nuitka 配置与启动测试配置各读一次
+        nuitka_section(load())
+        load().get("tool", {})
+        # 保存: 读取、修改、写入, 然后生成预览命令再读一次
+        config: Dict[str, Any] = load()
+        config_util.save_toml(config, path)
+        nuitka_section(load())
+
+    timings: List[float] = measure(cycle, rounds)
+    return parses[0], timings
+
+
+def run_store(path: Path, rounds: int) -> Tuple[int, List[float]]:
+    """新流程: 通过 ConfigStore 读取只读视图, 保存后直接更新缓存"""
+
+    store: ConfigStore = ConfigStore(path, path.parent / "ouroboros.toml")
+
+    def cycle() -> None:
+        store.section("nuitka")
+        store.view().get("tool", {})
+        config: Dict[str, Any] = store.load(path)
+        config_util.save_toml(config, path)
+        # save_toml 更新的是全局缓存, 这里同样更新被测的缓存
+        store.update(path, config)
+        store.section("nuitka")
+
+    timings: List[float] = measure(cycle, rounds)
+    return store.parse_count, timings
+
+
+def measure(cycle: Callable[[], None], rounds: int) -> List[float]:
+    """执行若干轮, 返回每轮耗时(毫秒)"""
+
+    timings: List[float] = []
+    for _ in range(rounds):
+        start: float = time.perf_counter()
+        cycle()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="配置读取基准测试")
+    parser.add_argument("path", nargs="?", default=str(config_util.config_path), help="被测的 pyproject.toml")
+    parser.add_argument("-n", "--rounds", type=int, default=50, help="模拟的保存轮数")
+    args: argparse.Namespace = parser.parse_args()
+    source: Path = Path(args.path)
+    if not source.is_file():
+        print(f"找不到配置文件: {source}")
+        sys.exit(2)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path: Path = Path(temp_dir) / "pyproject.toml"
+        rows: List[Tuple[str, int, List[float]]] = []
+        for name, runner in [("旧: 每次解析", run_legacy), ("新: ConfigStore", run_store)]:
+            shutil.copyfile(source, path)
+            parses, timings = runner(path, args.rounds)
+            rows.append((name, parses, timings))
+        print(f"{source} ({source.stat().st_size} 字节), {args.rounds} 轮 加载界面 -> 保存 -> 预览命令")
+        print(f"{'流程':<16}{'解析次数':>8}{'每轮中位数':>12}{'每轮平均':>12}")
+        for name, parses, timings in rows:
+            print(f"{name:<16}{parses:>8}{statistics.median(timings):>10.2f}ms{statistics.mean(timings):>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
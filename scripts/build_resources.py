@@ -0,0 +1,92 @@
+# scripts/build_resources.py
+"""资源构建: resources/icons 中的文件变化时重新生成 resources/icon.rcc 与 resources/icon.py
+
+用法: python scripts/build_resources.py [--force] [--report] [-n 轮数]
+输入(icon.qrc 及其列出的文件)的指纹与上次生成时一致则跳过;
+--report 在子进程中分别测量导入 icon.py 与加载 icon.rcc 的耗时与 Python 堆占用, 以及导航栏图标重绘的耗时"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import resource_util  # noqa: E402
+
+# 在子进程中执行: 注册资源并重复绘制导航栏图标, 输出 JSON
+PROBE: str = """
+import sys, json, time, tracemalloc
+sys.path.insert(0, {root!r})
+from PySide6.QtCore import QRectF, QResource
+from PySide6.QtGui import QGuiApplication, QPainter, QPixmap
+from PySide6.QtSvg import QSvgRenderer
+app = QGuiApplication([])
+tracemalloc.start()
+start = time.perf_counter()
+if {mode!r} == "rcc":
+    QResource.registerResource({rcc!r})
+else:
+    from resources import icon
+register = time.perf_counter() - start
+heap = tracemalloc.get_traced_memory()[0]
+tracemalloc.stop()
+from utils import icon_util
+target = QPixmap(40, 40)
+painter = QPainter(target)
+start = time.perf_counter()
+for _ in range({paints}):
+    for item in icon_util.FluentIcon:
+        if {mode!r} == "rcc":
+            item.render(painter, QRectF(11.5, 10, 16, 16))
+        else:
+            QSvgRenderer(f":/icons/{{item.value}}.svg").render(painter, QRectF(11.5, 10, 16, 16))
+paint = time.perf_counter() - start
+painter.end()
+print(json.dumps({{"register": register, "heap": heap, "paint": paint}}))
+"""
+# 每轮测量中每个图标的重绘次数
+PAINTS: int = 50
+
+
+def measure(mode: str, rounds: int) -> Dict[str, float]:
+    """在子进程中测量 rounds 轮, 取中位数"""
+
+    root: Path = resource_util.resources_dir.parent
+    code: str = PROBE.format(root=str(root), mode=mode, rcc=str(resource_util.rcc_path), paints=PAINTS)
+    env: Dict[str, str] = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    samples: List[Dict[str, float]] = []
+    for _ in range(rounds):
+        result: subprocess.CompletedProcess = subprocess.run([sys.executable, "-c", code], cwd=root, env=env, capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+
+
+def report(rounds: int) -> None:
+    results: Dict[str, Dict[str, Any]] = {"icon.py": measure("module", rounds), "icon.rcc": measure("rcc", rounds)}
+    sizes: Dict[str, int] = {"icon.py": resource_util.module_path.stat().st_size, "icon.rcc": resource_util.rcc_path.stat().st_size}
+    print(f"{'':<10}{'文件大小':>10}{'注册耗时':>10}{'Python 堆':>12}{'重绘 ' + str(PAINTS) + ' 次':>12}")
+    for name, result in results.items():
+        print(f"{name:<10}{sizes[name] / 1024:>9.1f}K{result['register'] * 1000:>9.2f}ms{result['heap'] / 1024:>11.1f}K{result['paint'] * 1000:>10.1f}ms")
+    print("icon.py 每次重绘都解析 SVG, icon.rcc 的测量使用 icon_util 的位图缓存")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="增量生成图标资源")
+    parser.add_argument("--force", action="store_true", help="忽略指纹, 强制重新生成")
+    parser.add_argument("--report", action="store_true", help="对比导入 icon.py 与加载 icon.rcc 的耗时与内存")
+    parser.add_argument("-n", "--rounds", type=int, default=5, help="测量轮数")
+    args: argparse.Namespace = parser.parse_args()
+    if resource_util.build_resources(force=args.force):
+        print(f"已重新生成 {resource_util.rcc_path.name} 与 {resource_util.module_path.name}")
+    else:
+        print("资源未变化, 跳过生成")
+    if args.report:
+        report(args.rounds)
+
+
+if __name__ == "__main__":
+    main()
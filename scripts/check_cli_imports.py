@@ -0,0 +1,67 @@
+# scripts/check_cli_imports.py
+"""命令行导入检查: 命令行模式(打包、分析、测试)不能导入 Qt
+
+用法: python scripts/check_cli_imports.py
+在禁用 PySide6 / qfluentwidgets 的子进程中导入 main.py 及其命令行函数内导入的模块,
+任何一处间接导入 Qt 都会失败并输出导入链, 退出码为 1"""
+import ast
+import sys
+import subprocess
+from pathlib import Path
+from typing import List, Set
+
+root: Path = Path(__file__).resolve().parent.parent
+
+# 禁止在命令行模式下导入的包
+FORBIDDEN: List[str] = ["PySide6", "shiboken6", "qfluentwidgets"]
+# 只在 GUI 模式下执行的函数, 不检查其中的导入
+GUI_FUNCTIONS: Set[str] = {"run_gui"}
+
+# 在子进程中执行: sys.modules 中置为 None 的包导入时会抛出 ImportError, 回溯即导入链
+PROBE: str = """
+import sys, time
+sys.path.insert(0, {root!r})
+for name in {forbidden!r}:
+    sys.modules[name] = None
+start = time.perf_counter()
+import main
+for module in {modules!r}:
+    __import__(module)
+print(f"导入 main 与 {{len({modules!r})}} 个命令行模块耗时 {{(time.perf_counter() - start) * 1000:.0f}}ms")
+"""
+
+
+def collect_cli_modules(main_path: Path) -> List[str]:
+    """收集 main.py 中命令行函数(函数内延迟导入)用到的模块"""
+
+    modules: Set[str] = set()
+    tree: ast.Module = ast.parse(main_path.read_text(encoding="utf-8"))
+    for function in tree.body:
+        if not isinstance(function, ast.FunctionDef) or function.name in GUI_FUNCTIONS:
+            continue
+        for node in ast.walk(function):
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                # from utils import a, b: 逐个检查子模块
+                if (root / node.module.replace(".", "/")).is_dir():
+                    modules.update(f"{node.module}.{alias.name}" for alias in node.names)
+                else:
+                    modules.add(node.module)
+    return sorted(modules)
+
+
+def main() -> None:
+    modules: List[str] = collect_cli_modules(root / "main.py")
+    code: str = PROBE.format(root=str(root), forbidden=FORBIDDEN, modules=modules)
+    result: subprocess.CompletedProcess = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(f"命令行模式导入了 {' / '.join(FORBIDDEN)}:")
+        print(result.stderr)
+        sys.exit(1)
+    print(result.stdout.strip())
+    print("通过: 命令行模式未导入 Qt")
+
+
+if __name__ == "__main__":
+    main()
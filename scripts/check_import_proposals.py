@@ -0,0 +1,35 @@
+# scripts/check_import_proposals.py
+"""导入分析回归检查: 对本项目的 main.py 运行导入分析, 不能建议排除程序运行必需的包
+
+用法: python scripts/check_import_proposals.py
+GUI 的导入位于 run_gui 函数内, 若被当作可选导入, 分析会建议 --nofollow-import-to=interfaces 等,
+应用后打包的程序无法启动; 出现这类建议时输出建议并以退出码 1 结束"""
+import sys
+from pathlib import Path
+from typing import List
+
+root: Path = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(root))
+
+from utils import import_graph_util  # noqa: E402
+
+# 程序运行必需, 不能出现在排除建议中的包
+REQUIRED: List[str] = ["interfaces", "utils", "PySide6"]
+
+
+def main() -> None:
+    report: import_graph_util.ImportReport = import_graph_util.analyze({"entry": "main.py"}, sys.executable, root)
+    wrong: List[import_graph_util.Proposal] = [
+        proposal for proposal in report.proposals if proposal.field == "no_imports" and any(import_graph_util.is_blocked(name, [proposal.name]) for name in REQUIRED)
+    ]
+    if wrong:
+        print("导入分析建议排除了必需的包:")
+        for proposal in wrong:
+            print(f"  --nofollow-import-to={proposal.name} ({proposal.reason})")
+        sys.exit(1)
+    print(f"可达模块 {report.modules} 个, 建议 {len(report.proposals)} 条")
+    print(f"通过: 未建议排除 {' / '.join(REQUIRED)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,2 @@
 cd "../"
-start cmd /k uv run pyside6-rcc "./resources/icon.qrc" -o "./resources/icon.py"
+start cmd /k uv run python "./scripts/build_resources.py"
@@ -0,0 +1,214 @@
+# utils/benchmark_util.py
+import os
+import time
+import threading
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import build_history_util
+from utils.build_matrix_util import DEFAULT_PROFILE_NAME, resolve_profile
+from utils.platform_util import is_linux, is_windows
+from utils.process_util import kill_process_tree, popen_group_kwargs
+
+
+# 默认测试配置: 运行次数, 让程序启动后立即退出的参数与环境变量, 单次超时(秒)
+DEFAULT_BENCHMARK_CONFIG: Dict[str, Any] = {
+    "runs": 5,
+    "args": [],
+    "env": {},
+    "timeout": 60,
+    "after_build": False,
+}
+# 内存采样间隔(秒)
+SAMPLE_INTERVAL: float = 0.01
+# 对比表中显示的最近测试数
+COMPARE_SIZE: int = 10
+
+
+def get_benchmark_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """读取 [tool.ouroboros.benchmark] 并补全默认值"""
+
+    benchmark_config: Dict[str, Any] = dict(DEFAULT_BENCHMARK_CONFIG)
+    benchmark_config.update(config.get("tool", {}).get("ouroboros", {}).get("benchmark", {}))
+    return benchmark_config
+
+
+def find_executable(nuitka_config: Dict[str, Any]) -> Optional[Path]:
+    """按 Nuitka 的命名规则查找构建出的可执行文件, 模块模式或未构建时返回 None"""
+
+    output_dir: Path = Path.cwd() / (nuitka_config.get("output_dir") or ".")
+    stem: str = Path(nuitka_config.get("entry", "")).stem
+    build_mode: str = nuitka_config.get("build_mode", "独立模式")
+    if not stem or build_mode == "模块模式":
+        return None
+    names: List[str] = [nuitka_config["output_name"]] if nuitka_config.get("output_name") else []
+    names.extend([stem, f"{stem}.bin"])
+    if is_windows():
+        names = [name if name.endswith(".exe") else f"{name}.exe" for name in names]
+    directory: Path = output_dir / f"{stem}.dist" if build_mode == "独立模式" else output_dir
+    for name in names:
+        if (directory / name).is_file():
+            return directory / name
+    return None
+
+
+def measure_footprint(executable: Path, nuitka_config: Dict[str, Any]) -> Tuple[int, int]:
+    """统计产物的磁盘占用与文件数(独立模式为整个 .dist 目录)"""
+
+    if nuitka_config.get("build_mode", "独立模式") != "独立模式":
+        return executable.stat().st_size, 1
+    size: int = 0
+    files: int = 0
+    for dirpath, _, filenames in os.walk(executable.parent):
+        for filename in filenames:
+            path: str = os.path.join(dirpath, filename)
+            if not os.path.islink(path):
+                size += os.path.getsize(path)
+                files += 1
+    return size, files
+
+
+def evict_page_cache(root: Path) -> bool:
+    """将产物文件移出系统页缓存以模拟冷启动(仅 Linux, 无需 root)"""
+
+    if not is_linux():
+        return False
+    paths: List[Path] = [root] if root.is_file() else [p for p in root.rglob("*") if p.is_file() and not p.is_symlink()]
+    for path in paths:
+        try:
+            fd: int = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def run_once(argv: List[str], env: Dict[str, str], timeout: float) -> Tuple[float, int, int]:
+    """运行一次并返回 (耗时, 进程树峰值内存, 退出码), 超时返回退出码 -1"""
+
+    # 不使用 wait4 的 ru_maxrss: Linux 下子进程会继承 fork 时父进程(本程序)的内存峰值
+    peak_rss: List[int] = [0]
+    done: threading.Event = threading.Event()
+    start: float = time.perf_counter()
+    process: subprocess.Popen = subprocess.Popen(argv, env=env, cwd=Path(argv[0]).parent, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, **popen_group_kwargs())  # pyright: ignore[reportArgumentType]
+
+    def sample() -> None:
+        while True:
+            usage: Optional[Tuple[int, float]] = build_history_util.read_tree_usage(process.pid)
+            if usage:
+                peak_rss[0] = max(peak_rss[0], usage[0])
+            if done.wait(SAMPLE_INTERVAL):
+                return
+
+    sampler: threading.Thread = threading.Thread(target=sample, name="benchmark-sampler", daemon=True)
+    sampler.start()
+    # 带超时的 wait() 以最长 50ms 的间隔轮询, 会拉高测得的耗时, 这里阻塞等待并由定时器处理超时
+    timed_out: threading.Event = threading.Event()
+    timer: threading.Timer = threading.Timer(timeout, lambda: (timed_out.set(), kill_process_tree(process)))
+    timer.start()
+    returncode: int = process.wait()
+    elapsed: float = time.perf_counter() - start
+    timer.cancel()
+    done.set()
+    sampler.join()
+    return elapsed, peak_rss[0], -1 if timed_out.is_set() else returncode
+
+
+def run_benchmark(profile: str, nuitka_config: Dict[str, Any], benchmark_config: Dict[str, Any]) -> Dict[str, Any]:
+    """多次启动产物, 第一次为冷启动, 其余为热启动, 结果追加到构建历史"""
+
+    executable: Optional[Path] = find_executable(nuitka_config)
+    if executable is None:
+        raise FileNotFoundError(f"方案 {profile} 没有可执行的构建产物")
+    argv: List[str] = [str(executable), *benchmark_config["args"]]
+    env: Dict[str, str] = dict(os.environ, **{k: str(v) for k, v in benchmark_config["env"].items()})
+    runs: int = max(int(benchmark_config["runs"]), 2)
+    size, files = measure_footprint(executable, nuitka_config)
+    evicted: bool = evict_page_cache(executable.parent if nuitka_config.get("build_mode", "独立模式") == "独立模式" else executable)
+    times: List[float] = []
+    peaks: List[int] = []
+    returncode: int = 0
+    for _ in range(runs):
+        elapsed, peak_rss, code = run_once(argv, env, float(benchmark_config["timeout"]))
+        times.append(elapsed)
+        peaks.append(peak_rss)
+        if code != 0:
+            returncode = code
+            break
+    builds: List[Dict[str, Any]] = build_history_util.load_history(profile, 1)
+    record: Dict[str, Any] = {
+        "kind": "benchmark",
+        "profile": profile,
+        "revision": build_history_util.get_git_revision(),
+        "timestamp": time.time(),
+        # 对应的构建记录
+        "build_timestamp": builds[-1]["timestamp"] if builds else None,
+        "executable": str(executable),
+        "args": benchmark_config["args"],
+        "runs": len(times),
+        "cold": round(times[0], 4),
+        "cold_evicted": evicted,
+        "warm": round(statistics.median(times[1:]), 4) if len(times) > 1 else None,
+        "warm_min": round(min(times[1:]), 4) if len(times) > 1 else None,
+        "peak_rss": max(peaks),
+        "size": size,
+        "files": files,
+        "returncode": returncode,
+    }
+    build_history_util.append_record(record)
+    return record
+
+
+def format_comparison(records: List[Dict[str, Any]]) -> str:
+    """将若干次测试格式化为对比表"""
+
+    if not records:
+        return "暂无启动测试记录"
+    rows: List[List[str]] = [["方案", "提交", "冷启动", "热启动", "峰值内存", "体积", "文件数", "退出码"]]
+    for record in records:
+        rows.append(comparison_row(record))
+    widths: List[int] = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(row, widths)) for row in rows)
+
+
+def comparison_row(record: Dict[str, Any]) -> List[str]:
+    """对比表中的一行"""
+
+    warm: str = f"{record['warm'] * 1000:.0f}ms" if record.get("warm") is not None else "-"
+    return [
+        record["profile"],
+        record.get("revision") or "-",
+        f"{record['cold'] * 1000:.0f}ms",
+        warm,
+        build_history_util.format_bytes(record["peak_rss"]),
+        build_history_util.format_bytes(record["size"]),
+        str(record["files"]),
+        str(record["returncode"]),
+    ]
+
+
+def benchmark_profiles(profiles: List[Optional[str]], nuitka_config: Dict[str, Any], benchmark_config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """依次测试多个方案(不并行, 避免互相干扰), 返回 (测试记录, 错误信息)"""
+
+    records: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    for profile in profiles:
+        try:
+            records.append(run_benchmark(profile or DEFAULT_PROFILE_NAME, resolve_profile(nuitka_config, profile), benchmark_config))
+        except (FileNotFoundError, KeyError, OSError) as e:
+            errors.append(str(e))
+    return records, errors
+
+
+def load_comparison(profiles: Optional[List[str]] = None, limit: int = COMPARE_SIZE) -> List[Dict[str, Any]]:
+    """最近的测试记录(新的在前), 可限定方案"""
+
+    records: List[Dict[str, Any]] = build_history_util.load_history(kind="benchmark")
+    if profiles:
+        records = [r for r in records if r["profile"] in profiles]
+    return list(reversed(records[-limit:]))
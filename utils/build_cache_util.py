@@ -0,0 +1,360 @@
+# utils/build_cache_util.py
+import ast
+import json
+import time
+import shutil
+import hashlib
+import platform
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Self, Set
+
+from utils.config_util import atomic_write
+
+# 缓存格式版本, 修改指纹算法时递增以废弃旧缓存
+CACHE_VERSION: int = 1
+# 构建产物中记录缓存键的标记文件名
+STAMP_NAME: str = ".ouroboros-build.json"
+# 默认缓存配置
+DEFAULT_CACHE_CONFIG: Dict[str, Any] = {
+    "enabled": True,
+    "dir": ".ouroboros/build_cache",
+    "max_size_mb": 2048,
+}
+
+
+def get_cache_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """读取 [tool.ouroboros.build_cache] 并补全默认值"""
+
+    cache_config: Dict[str, Any] = dict(DEFAULT_CACHE_CONFIG)
+    cache_config.update(config.get("tool", {}).get("ouroboros", {}).get("build_cache", {}))
+    return cache_config
+
+
+def hash_file(path: Path, hasher: Any) -> None:
+    """将文件内容写入摘要"""
+
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            hasher.update(chunk)
+
+
+def iter_imports(tree: ast.AST) -> Iterable[tuple[str, int, List[str]]]:
+    """遍历语法树中的导入语句, 返回 (模块名, 相对层级, 导入名列表)"""
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield alias.name, 0, []
+        elif isinstance(node, ast.ImportFrom):
+            yield node.module or "", node.level, [alias.name for alias in node.names]
+
+
+def resolve_module(root: Path, module: str) -> List[Path]:
+    """将模块名解析为项目内的源文件(含父包的 __init__.py)"""
+
+    if not module:
+        return []
+    found: List[Path] = []
+    parts: List[str] = module.split(".")
+    for i in range(1, len(parts) + 1):
+        base: Path = root.joinpath(*parts[:i])
+        if (base / "__init__.py").is_file():
+            found.append(base / "__init__.py")
+        elif i == len(parts) and base.with_suffix(".py").is_file():
+            found.append(base.with_suffix(".py"))
+    return found
+
+
+def collect_sources(entry: Path, root: Path) -> List[Path]:
+    """从入口文件出发收集项目内所有可达的源文件"""
+
+    seen: Set[Path] = set()
+    stack: List[Path] = [entry.resolve()]
+    root = root.resolve()
+    while stack:
+        path: Path = stack.pop()
+        if path in seen or not path.is_file():
+            continue
+        seen.add(path)
+        try:
+            tree: ast.AST = ast.parse(path.read_bytes(), filename=str(path))
+        except (SyntaxError, ValueError):
+            continue
+        # 当前模块所在的包名(相对导入的基准)
+        try:
+            package_parts: List[str] = list(path.parent.relative_to(root).parts)
+        except ValueError:
+            package_parts = []
+        for module, level, names in iter_imports(tree):
+            if level:
+                base_parts: List[str] = package_parts[: len(package_parts) - level + 1] if level <= len(package_parts) + 1 else []
+                module = ".".join(base_parts + ([module] if module else []))
+            candidates: List[Path] = resolve_module(root, module)
+            # from x import y 中的 y 可能是子模块
+            for name in names:
+                candidates.extend(resolve_module(root, f"{module}.{name}" if module else name))
+            stack.extend(c.resolve() for c in candidates if c.resolve() not in seen)
+    return sorted(seen)
+
+
+def split_data_spec(spec: str) -> Path:
+    """取出 "源=目标" 格式中的源路径"""
+
+    return Path(spec.split("=", 1)[0].strip())
+
+
+def find_site_packages(python_path: Path) -> List[Path]:
+    """根据解释器路径推断 site-packages 目录"""
+
+    prefix: Path = python_path.parent.parent if python_path.parent.name in ("bin", "Scripts") else python_path.parent
+    candidates: List[Path] = [prefix / "Lib" / "site-packages"]
+    candidates.extend(prefix.glob("lib/python*/site-packages"))
+    return [c for c in candidates if c.is_dir()]
+
+
+def interpreter_fingerprint(python_path: str) -> Dict[str, Any]:
+    """不启动子进程地获取解释器指纹(版本与已安装包)"""
+
+    path: Path = Path(python_path)
+    info: Dict[str, Any] = {"path": str(path.resolve()) if path.exists() else python_path, "system": platform.system()}
+    if path.exists():
+        stat = path.resolve().stat()
+        info["binary"] = [stat.st_size, stat.st_mtime_ns]
+    prefix: Path = path.parent.parent if path.parent.name in ("bin", "Scripts") else path.parent
+    if (prefix / "pyvenv.cfg").is_file():
+        info["pyvenv"] = (prefix / "pyvenv.cfg").read_text(encoding="utf-8", errors="replace")
+    # dist-info 目录名包含包名与版本(含 Nuitka 本身)
+    distributions: List[str] = []
+    for site_packages in find_site_packages(path):
+        distributions.extend(p.name for p in site_packages.iterdir() if p.suffix == ".dist-info")
+    info["distributions"] = sorted(distributions)
+    return info
+
+
+class BuildCache:
+    """基于内容寻址的 Nuitka 构建缓存"""
+
+    def __init__(self: Self, cache_dir: Path, max_size_mb: float) -> None:
+        self.cache_dir: Path = cache_dir
+        self.max_size: int = int(max_size_mb * 1024 * 1024)
+        self.index_path: Path = cache_dir / "index.json"
+        # 并行构建的多个方案同时存入缓存, 串行化索引的读取-修改-写入
+        self.lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> Optional["BuildCache"]:
+        """根据项目配置创建缓存, 未启用时返回 None"""
+
+        cache_config: Dict[str, Any] = get_cache_config(config)
+        if not cache_config.get("enabled"):
+            return None
+        cache_dir: Path = Path(cache_config["dir"]).expanduser()
+        if not cache_dir.is_absolute():
+            cache_dir = Path.cwd() / cache_dir
+        return cls(cache_dir, float(cache_config["max_size_mb"]))
+
+    @staticmethod
+    def compute_key(nuitka_config: Dict[str, Any], nuitka_args: List[str], python_path: str) -> str:
+        """计算构建指纹: 可达源码、数据文件、命令参数与解释器"""
+
+        hasher = hashlib.sha256()
+        # 并行任务数与编译器缓存不影响产物, 不参与指纹
+        args: List[str] = [arg for arg in nuitka_args if not arg.startswith("--jobs=") and arg != "--disable-ccache"]
+        hasher.update(json.dumps({"version": CACHE_VERSION, "args": args, "interpreter": interpreter_fingerprint(python_path)}, sort_keys=True).encode())
+        root: Path = Path.cwd()
+        entry: Path = root / nuitka_config.get("entry", "")
+        files: List[Path] = collect_sources(entry, root) if entry.is_file() else []
+        # 包含的数据文件与目录
+        for spec in nuitka_config.get("files", []):
+            files.append(root / split_data_spec(spec))
+        for spec in nuitka_config.get("dirs", []):
+            source_dir: Path = root / split_data_spec(spec)
+            if source_dir.is_dir():
+                files.extend(sorted(p for p in source_dir.rglob("*") if p.is_file()))
+        for path in files:
+            try:
+                name: str = path.resolve().relative_to(root.resolve()).as_posix()
+            except ValueError:
+                name = str(path)
+            hasher.update(name.encode() + b"\0")
+            if path.is_file():
+                hash_file(path, hasher)
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    @staticmethod
+    def find_artifacts(nuitka_config: Dict[str, Any]) -> List[Path]:
+        """查找输出目录中属于本次构建的产物(不含 .build 中间目录)"""
+
+        output_dir: Path = Path.cwd() / (nuitka_config.get("output_dir") or ".")
+        if not output_dir.is_dir():
+            return []
+        names: Set[str] = {Path(nuitka_config.get("entry", "")).stem}
+        if output_name := nuitka_config.get("output_name"):
+            names.add(output_name)
+        artifacts: List[Path] = []
+        for path in output_dir.iterdir():
+            if path.name.endswith((".build", ".onefile-build")) or path.name == STAMP_NAME:
+                continue
+            if any(path.name == name or path.name.startswith(f"{name}.") for name in names if name):
+                # 源码入口文件本身不是产物
+                if path.suffix == ".py":
+                    continue
+                artifacts.append(path)
+        return sorted(artifacts)
+
+    def is_up_to_date(self: Self, key: str, nuitka_config: Dict[str, Any]) -> bool:
+        """输出目录中的产物是否已由该指纹构建"""
+
+        stamp: Path = Path.cwd() / (nuitka_config.get("output_dir") or ".") / STAMP_NAME
+        if not stamp.is_file():
+            return False
+        try:
+            data: Dict[str, Any] = json.loads(stamp.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        names: List[str] = [p.name for p in self.find_artifacts(nuitka_config)]
+        return data.get("key") == key and bool(names) and set(data.get("artifacts", [])) <= set(names)
+
+    def restore(self: Self, key: str, nuitka_config: Dict[str, Any]) -> bool:
+        """从缓存恢复产物到输出目录, 未命中返回 False"""
+
+        entry_dir: Path = self.cache_dir / key
+        manifest_path: Path = entry_dir / "manifest.json"
+        if not manifest_path.is_file():
+            return False
+        try:
+            manifest: Dict[str, Any] = json.loads(manifest_path.read_text(encoding="utf-8"))
+            names: List[str] = list(manifest["artifacts"])
+            size: int = int(manifest["size"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # 条目损坏(如写入时中断), 丢弃后按未命中处理
+            self._discard(key)
+            return False
+        if not all((entry_dir / "artifacts" / name).exists() for name in names):
+            self._discard(key)
+            return False
+        output_dir: Path = Path.cwd() / (nuitka_config.get("output_dir") or ".")
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            for name in names:
+                source: Path = entry_dir / "artifacts" / name
+                target: Path = output_dir / name
+                self._remove(target)
+                if source.is_dir():
+                    shutil.copytree(source, target, symlinks=True)
+                else:
+                    shutil.copy2(source, target)
+        except OSError:
+            self._discard(key)
+            return False
+        self._write_stamp(output_dir, key, names)
+        self._touch(key, size)
+        return True
+
+    def store(self: Self, key: str, nuitka_config: Dict[str, Any]) -> bool:
+        """将构建产物存入缓存, 并按 LRU 淘汰超出预算的条目"""
+
+        artifacts: List[Path] = self.find_artifacts(nuitka_config)
+        if not artifacts:
+            return False
+        entry_dir: Path = self.cache_dir / key
+        temp_dir: Path = self.cache_dir / f"{key}.tmp"
+        names: List[str] = [p.name for p in artifacts]
+        # 缓存只是加速手段: 磁盘已满、权限不足或文件被占用时放弃存入, 不影响已成功的构建
+        try:
+            self._remove(temp_dir)
+            (temp_dir / "artifacts").mkdir(parents=True)
+            for path in artifacts:
+                if path.is_dir():
+                    shutil.copytree(path, temp_dir / "artifacts" / path.name, symlinks=True)
+                else:
+                    shutil.copy2(path, temp_dir / "artifacts" / path.name)
+            size: int = self._dir_size(temp_dir)
+            (temp_dir / "manifest.json").write_text(json.dumps({"key": key, "artifacts": names, "size": size, "created": time.time()}), encoding="utf-8")
+            self._remove(entry_dir)
+            temp_dir.rename(entry_dir)
+            self._write_stamp(artifacts[0].parent, key, names)
+            self._touch(key, size)
+            self.evict()
+        except OSError:
+            try:
+                self._remove(temp_dir)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def evict(self: Self) -> List[str]:
+        """按最近使用时间淘汰缓存直到总大小不超过预算"""
+
+        with self.lock:
+            index: Dict[str, Dict[str, Any]] = self._load_index()
+            total: int = sum(item["size"] for item in index.values())
+            evicted: List[str] = []
+            for key, item in sorted(index.items(), key=lambda kv: kv[1]["last_used"]):
+                if total <= self.max_size:
+                    break
+                self._remove(self.cache_dir / key)
+                total -= item["size"]
+                evicted.append(key)
+                del index[key]
+            if evicted:
+                self._save_index(index)
+        return evicted
+
+    def _discard(self: Self, key: str) -> None:
+        """删除损坏的条目及其索引记录"""
+
+        self._remove(self.cache_dir / key)
+        with self.lock:
+            index: Dict[str, Dict[str, Any]] = self._load_index()
+            if index.pop(key, None) is not None:
+                self._save_index(index)
+
+    def _touch(self: Self, key: str, size: int) -> None:
+        """更新条目的最近使用时间"""
+
+        with self.lock:
+            index: Dict[str, Dict[str, Any]] = self._load_index()
+            index[key] = {"size": size, "last_used": time.time()}
+            self._save_index(index)
+
+    def _load_index(self: Self) -> Dict[str, Dict[str, Any]]:
+        """读取缓存索引, 丢弃已不存在的条目(调用方持有 self.lock)"""
+
+        if not self.index_path.is_file():
+            return {}
+        try:
+            index: Dict[str, Dict[str, Any]] = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return {k: v for k, v in index.items() if (self.cache_dir / k).is_dir()}
+
+    def _save_index(self: Self, index: Dict[str, Dict[str, Any]]) -> None:
+        """原子写入缓存索引(调用方持有 self.lock), 读取方不会读到写了一半的文件"""
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.index_path, json.dumps(index, indent=2))
+
+    @staticmethod
+    def _write_stamp(output_dir: Path, key: str, artifacts: List[str]) -> None:
+        """在输出目录中记录产物对应的指纹"""
+
+        (output_dir / STAMP_NAME).write_text(json.dumps({"key": key, "artifacts": artifacts}), encoding="utf-8")
+
+    @staticmethod
+    def _dir_size(path: Path) -> int:
+        """统计目录总大小"""
+
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file() and not p.is_symlink())
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        """删除文件或目录"""
+
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        elif path.exists() or path.is_symlink():
+            path.unlink()
@@ -0,0 +1,259 @@
+# utils/build_history_util.py
+import os
+import re
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Self, Tuple
+
+from utils.platform_util import is_linux
+from utils.ccache_util import format_cache
+
+try:
+    import psutil  # pyright: ignore[reportMissingModuleSource]
+except ImportError:
+    psutil = None
+
+
+# 构建历史文件(每行一条 JSON 记录)
+history_path: Path = Path.cwd() / ".ouroboros" / "build_history.jsonl"
+# 采样间隔(秒)
+SAMPLE_INTERVAL: float = 0.5
+# 趋势图显示的最近构建数
+TREND_SIZE: int = 20
+
+# Nuitka 输出行 -> 阶段, 按出现顺序推进
+PHASE_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ("模块优化", re.compile(r"Starting Python compilation")),
+    ("C 代码生成", re.compile(r"Completed Python level compilation|Generating source code for C backend")),
+    ("C 编译", re.compile(r"Running C compilation via Scons")),
+    ("链接", re.compile(r"Backend linking program")),
+    ("依赖复制", re.compile(r"Nuitka-(Standalone|Plugins)?:? ?.*(Copying|Including) .*(DLL|dependenc|extension module)", re.IGNORECASE)),
+    ("单文件压缩", re.compile(r"Creating single file from dist folder|Nuitka-Onefile")),
+    ("完成", re.compile(r"Successfully created")),
+]
+# 第一个阶段之前的启动时间
+STARTUP_PHASE: str = "启动"
+# 编译器因内存不足被终止的输出特征
+OOM_PATTERN: re.Pattern = re.compile(r"Killed signal terminated program|out of memory|cannot allocate memory|MemoryError|fatal error C1060", re.IGNORECASE)
+
+
+class PhaseTracker:
+    """根据 Nuitka 输出划分构建阶段, 并统计每阶段的耗时、峰值内存与 CPU 时间"""
+
+    def __init__(self: Self) -> None:
+        self.phases: List[Dict[str, Any]] = []
+        self.last_cpu: Optional[float] = None
+        self.oom: bool = False
+        self.lock: threading.Lock = threading.Lock()
+        self._enter(STARTUP_PHASE)
+
+    def _enter(self: Self, name: str) -> None:
+        now: float = time.perf_counter()
+        if self.phases:
+            self.phases[-1]["end"] = now
+            self.phases[-1]["cpu_end"] = self.last_cpu
+        self.phases.append({"name": name, "start": now, "end": None, "peak_rss": 0, "cpu_start": self.last_cpu, "cpu_end": None})
+
+    def feed(self: Self, line: str) -> None:
+        """读取一行输出, 匹配到后续阶段时切换"""
+
+        if OOM_PATTERN.search(line):
+            self.oom = True
+        names: List[str] = [name for name, _ in PHASE_PATTERNS]
+        current: str = self.phases[-1]["name"]
+        start: int = names.index(current) + 1 if current in names else 0
+        for name, pattern in PHASE_PATTERNS[start:]:
+            if pattern.search(line):
+                with self.lock:
+                    self._enter(name)
+                return
+
+    def sample(self: Self, rss: int, cpu_time: float) -> None:
+        """记录一次资源采样"""
+
+        with self.lock:
+            phase: Dict[str, Any] = self.phases[-1]
+            phase["peak_rss"] = max(phase["peak_rss"], rss)
+            # 进程刚启动时尚无累计值, 以首次采样为起点
+            if phase["cpu_start"] is None:
+                phase["cpu_start"] = 0.0 if len(self.phases) == 1 else cpu_time
+            self.last_cpu = cpu_time
+
+    def finish(self: Self) -> List[Dict[str, Any]]:
+        """结束统计, 返回各阶段汇总"""
+
+        now: float = time.perf_counter()
+        result: List[Dict[str, Any]] = []
+        for phase in self.phases:
+            end: float = phase["end"] or now
+            cpu_end: Optional[float] = phase["cpu_end"] if phase["end"] else self.last_cpu
+            cpu_time: Optional[float] = cpu_end - phase["cpu_start"] if cpu_end is not None and phase["cpu_start"] is not None else None
+            result.append(
+                {
+                    "name": phase["name"],
+                    "duration": round(end - phase["start"], 3),
+                    "peak_rss": phase["peak_rss"],
+                    "cpu_time": round(cpu_time, 3) if cpu_time is not None else None,
+                }
+            )
+        # "完成"只是结束标记, 不计入阶段
+        return [p for p in result if p["name"] != "完成"]
+
+
+def read_tree_usage(session_id: int) -> Optional[Tuple[int, float]]:
+    """统计会话内全部进程的 RSS 总和(字节)与累计 CPU 时间(秒)"""
+
+    if is_linux():
+        page_size: int = os.sysconf("SC_PAGE_SIZE")
+        ticks: int = os.sysconf("SC_CLK_TCK")
+        rss: int = 0
+        cpu: float = 0.0
+        for entry in os.scandir("/proc"):
+            if not entry.name.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry.name}/stat", "rb") as f:
+                    stat: List[bytes] = f.read().rsplit(b")", 1)[1].split()
+            except OSError:
+                continue
+            # 字段从 state 开始: sid=第 4 个, utime..cstime=第 12~15 个, rss=第 22 个
+            if int(stat[3]) != session_id:
+                continue
+            cpu += sum(int(v) for v in stat[11:15]) / ticks
+            rss += int(stat[21]) * page_size
+        return rss, cpu
+    if psutil is not None:
+        try:
+            root = psutil.Process(session_id)
+            processes = [root, *root.children(recursive=True)]
+        except psutil.Error:
+            return None
+        rss, cpu = 0, 0.0
+        for process in processes:
+            try:
+                rss += process.memory_info().rss
+                times = process.cpu_times()
+                cpu += times.user + times.system + getattr(times, "children_user", 0.0) + getattr(times, "children_system", 0.0)
+            except psutil.Error:
+                continue
+        return rss, cpu
+    return None
+
+
+class ResourceSampler:
+    """在后台线程中定期采样任务进程树的内存与 CPU"""
+
+    def __init__(self: Self, job: Any, tracker: PhaseTracker) -> None:
+        self.job: Any = job
+        self.tracker: PhaseTracker = tracker
+        self.stop_event: threading.Event = threading.Event()
+        self.last_cpu: Optional[float] = None
+        self.thread: threading.Thread = threading.Thread(target=self._run, name=f"sampler-{job.id}", daemon=True)
+
+    def start(self: Self) -> None:
+        self.thread.start()
+
+    def stop(self: Self) -> None:
+        self.stop_event.set()
+        self.thread.join()
+
+    def _run(self: Self) -> None:
+        while not self.stop_event.wait(SAMPLE_INTERVAL):
+            process = self.job.process
+            if process is None or process.poll() is not None:
+                continue
+            usage: Optional[Tuple[int, float]] = read_tree_usage(process.pid)
+            if usage is None:
+                return
+            # 子进程被回收的瞬间累计值可能回落, 保持单调
+            self.last_cpu = max(usage[1], self.last_cpu or 0.0)
+            self.tracker.sample(usage[0], self.last_cpu)
+
+
+def get_git_revision(root: Optional[Path] = None) -> str:
+    """不启动 git 地读取当前提交号"""
+
+    git_dir: Path = (root or Path.cwd()) / ".git"
+    try:
+        head: str = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if not head.startswith("ref: "):
+            return head[:12]
+        ref: str = head[5:]
+        if (git_dir / ref).is_file():
+            return (git_dir / ref).read_text(encoding="utf-8").strip()[:12]
+        packed: Path = git_dir / "packed-refs"
+        if packed.is_file():
+            for line in packed.read_text(encoding="utf-8").splitlines():
+                if line.endswith(f" {ref}"):
+                    return line.split()[0][:12]
+    except OSError:
+        pass
+    return ""
+
+
+def append_record(record: Dict[str, Any]) -> None:
+    """追加一条构建记录"""
+
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(history_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def load_history(profile: Optional[str] = None, limit: Optional[int] = None, kind: str = "build") -> List[Dict[str, Any]]:
+    """读取构建记录(按时间顺序), 可按方案过滤"""
+
+    if not history_path.is_file():
+        return []
+    records: List[Dict[str, Any]] = []
+    with open(history_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record: Dict[str, Any] = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("kind", "build") != kind:
+                continue
+            if profile is None or record.get("profile") == profile:
+                records.append(record)
+    return records[-limit:] if limit else records
+
+
+def format_bytes(size: Optional[float]) -> str:
+    """格式化字节数"""
+
+    if not size:
+        return "-"
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TB"
+
+
+def format_breakdown(record: Dict[str, Any]) -> str:
+    """格式化单次构建的阶段明细"""
+
+    lines: List[str] = [f"方案 {record['profile']} @ {record.get('revision') or '-'}: 退出码 {record['returncode']}, 总耗时 {record['wall_time']:.1f}s"]
+    if record.get("jobs"):
+        lines.append(f"  并行任务数 {record['jobs']}" + (f"(自动: {record['jobs_reason']})" if record.get("jobs_auto") else ""))
+    if record.get("compiler_cache"):
+        lines.append(f"  {format_cache(record['compiler_cache'])}")
+    total: float = record["wall_time"] or 1.0
+    for phase in record["phases"]:
+        cpu: str = f"{phase['cpu_time']:.1f}s" if phase.get("cpu_time") is not None else "-"
+        lines.append(f"  {phase['name']}: {phase['duration']:.1f}s ({phase['duration'] / total:.0%}), 峰值内存 {format_bytes(phase['peak_rss'])}, CPU {cpu}")
+    return "\n".join(lines)
+
+
+def format_trend(records: List[Dict[str, Any]]) -> str:
+    """用字符柱状图显示最近若干次构建的总耗时趋势"""
+
+    times: List[float] = [r["wall_time"] for r in records if r.get("returncode") == 0]
+    if not times:
+        return "暂无成功的构建记录"
+    bars: str = "▁▂▃▄▅▆▇█"
+    low, high = min(times), max(times)
+    spark: str = "".join(bars[int((t - low) / (high - low) * (len(bars) - 1)) if high > low else 0] for t in times)
+    return f"最近 {len(times)} 次: {spark}  最短 {low:.1f}s / 最长 {high:.1f}s / 最近 {times[-1]:.1f}s"
@@ -0,0 +1,176 @@
+# utils/build_matrix_util.py
+import time
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Self
+
+from utils import build_history_util, ccache_util, jobs_util, python_path_util
+from utils.build_cache_util import BuildCache
+from utils.process_util import Job, JobState, process_manager
+
+# 未命名方案(基础配置)的显示名
+DEFAULT_PROFILE_NAME: str = "默认"
+
+
+def get_profile_names(nuitka_config: Dict[str, Any]) -> List[str]:
+    """获取 [tool.ouroboros.nuitka.profiles] 中定义的方案名"""
+
+    return list(nuitka_config.get("profiles", {}).keys())
+
+
+def resolve_profile(nuitka_config: Dict[str, Any], profile: Optional[str] = None) -> Dict[str, Any]:
+    """合并基础配置与方案覆盖项, 未指定输出目录的方案输出到独立子目录"""
+
+    resolved: Dict[str, Any] = {k: v for k, v in nuitka_config.items() if k != "profiles"}
+    if not profile:
+        return resolved
+    profiles: Dict[str, Any] = nuitka_config.get("profiles", {})
+    if profile not in profiles:
+        raise KeyError(f"未定义的构建方案: {profile}")
+    overrides: Dict[str, Any] = profiles[profile]
+    resolved.update(overrides)
+    # 并行构建时各方案的 .build 目录不能互相覆盖
+    if "output_dir" not in overrides:
+        resolved["output_dir"] = str(Path(nuitka_config.get("output_dir") or ".") / profile)
+    return resolved
+
+
+def parse_jobs(nuitka_config: Dict[str, Any]) -> int:
+    """读取配置中的并行任务数, 缺省为 CPU 核心数 - 1"""
+
+    default: int = max(multiprocessing.cpu_count() - 1, 1)
+    try:
+        return max(int(nuitka_config.get("jobs") or default), 1)
+    except ValueError:
+        return default
+
+
+def resolve_auto_jobs(nuitka_config: Dict[str, Any], profile: str, share: int = 1, cpus: Optional[int] = None) -> str:
+    """将 jobs = "Auto" 替换为自动选择的并行数, 返回选择原因(非自动时为空)"""
+
+    if str(nuitka_config.get("jobs", "")) != jobs_util.AUTO_JOBS:
+        return ""
+    memory: Optional[int] = jobs_util.get_available_memory()
+    jobs, reason = jobs_util.choose_jobs(profile, cpus, memory // share if memory else None)
+    nuitka_config["jobs"] = str(jobs)
+    return reason
+
+
+def split_jobs(count: int, total: Optional[int] = None) -> List[int]:
+    """将 CPU 核心数尽量平均地分配给 count 个并行构建"""
+
+    total = total or multiprocessing.cpu_count()
+    if count <= 0:
+        return []
+    base, remainder = divmod(max(total, count), count)
+    return [base + (1 if i < remainder else 0) for i in range(count)]
+
+
+class BuildResult:
+    """单个方案的构建结果"""
+
+    def __init__(self: Self, profile: str, status: str, returncode: int, wall_time: float, record: Optional[Dict[str, Any]] = None) -> None:
+        self.profile: str = profile
+        self.status: str = status
+        self.returncode: int = returncode
+        self.wall_time: float = wall_time
+        # 实际运行 Nuitka 时的构建记录(阶段耗时等)
+        self.record: Optional[Dict[str, Any]] = record
+
+
+def build_profile(
+    profile: str,
+    nuitka_config: Dict[str, Any],
+    nuitka_args: List[str],
+    python_path: str,
+    cache: Optional[BuildCache] = None,
+    group: str = "",
+    jobs_reason: str = "",
+) -> BuildResult:
+    """构建单个方案, 命中缓存时跳过 Nuitka, 否则记录各阶段耗时到构建历史"""
+
+    start: float = time.perf_counter()
+    key: str = ""
+    if cache:
+        key = cache.compute_key(nuitka_config, nuitka_args, python_path)
+        if cache.is_up_to_date(key, nuitka_config):
+            return BuildResult(profile, "已是最新", 0, time.perf_counter() - start)
+        if cache.restore(key, nuitka_config):
+            return BuildResult(profile, "缓存恢复", 0, time.perf_counter() - start)
+    tracker: build_history_util.PhaseTracker = build_history_util.PhaseTracker()
+    # 编译器缓存: 构建前后各取一次统计, 并让 ccache 把本次的命中情况写入单独的日志
+    stats_log: Path = build_history_util.history_path.parent / f"{profile}-{ccache_util.STATS_LOG_NAME}"
+    stats_log.parent.mkdir(parents=True, exist_ok=True)
+    stats_log.unlink(missing_ok=True)
+    stats_before: Optional[Dict[str, int]] = ccache_util.read_stats(nuitka_config)
+    env: Dict[str, str] = ccache_util.get_env(nuitka_config, stats_log)
+    job: Job = process_manager.submit(f"Nuitka 打包[{profile}]", [[python_path, *nuitka_args]], cpus=parse_jobs(nuitka_config), group=group, on_output=tracker.feed, env=env)
+    sampler: build_history_util.ResourceSampler = build_history_util.ResourceSampler(job, tracker)
+    sampler.start()
+    job.wait()
+    sampler.stop()
+    compiler_cache: Optional[Dict[str, Any]] = ccache_util.summarize(nuitka_config, stats_before, ccache_util.read_stats(nuitka_config), stats_log)
+    stats_log.unlink(missing_ok=True)
+    returncode: int = job.returncode if job.returncode is not None else -1
+    if job.state == JobState.SUCCEEDED and cache:
+        cache.store(key, nuitka_config)
+    phases: List[Dict[str, Any]] = tracker.finish()
+    record: Dict[str, Any] = {
+        "kind": "build",
+        "profile": profile,
+        "revision": build_history_util.get_git_revision(),
+        "timestamp": time.time(),
+        "wall_time": round(job.duration, 3),
+        "returncode": returncode,
+        "jobs": parse_jobs(nuitka_config),
+        "jobs_auto": bool(jobs_reason),
+        "jobs_reason": jobs_reason,
+        "oom": tracker.oom,
+        "peak_rss": max((p["peak_rss"] for p in phases), default=0),
+        "phases": phases,
+        "compiler_cache": compiler_cache,
+    }
+    if compiler_cache:
+        compiler_cache["time_saved"] = ccache_util.estimate_time_saved(record, build_history_util.load_history(profile, jobs_util.HISTORY_SIZE))
+    if job.state != JobState.CANCELLED:
+        build_history_util.append_record(record)
+    return BuildResult(profile, job.state.value, returncode, time.perf_counter() - start, record)
+
+
+def run_matrix(
+    profiles: List[Optional[str]],
+    nuitka_config: Dict[str, Any],
+    make_args: Callable[[Dict[str, Any]], List[str]],
+    python_path: str,
+    cache: Optional[BuildCache] = None,
+    total_jobs: Optional[int] = None,
+    group: str = "",
+) -> List[BuildResult]:
+    """并行构建多个方案(None 表示基础配置), 多个方案时平分 CPU 核心预算, 方案可用 interpreter 指定解释器"""
+
+    jobs: List[int] = split_jobs(len(profiles), total_jobs)
+    with ThreadPoolExecutor(max_workers=max(len(profiles), 1)) as executor:
+        futures = []
+        for profile, profile_jobs in zip(profiles, jobs):
+            profile_config: Dict[str, Any] = resolve_profile(nuitka_config, profile)
+            name: str = profile or DEFAULT_PROFILE_NAME
+            # 自动模式在分得的核心与内存份额内选择, 否则直接使用分得的核心数
+            jobs_reason: str = resolve_auto_jobs(profile_config, name, len(profiles), profile_jobs if len(profiles) > 1 else None)
+            if len(profiles) > 1 and not jobs_reason:
+                profile_config["jobs"] = str(profile_jobs)
+            profile_python: str = python_path_util.get_python_path(profile_config) or python_path
+            futures.append(executor.submit(build_profile, name, profile_config, make_args(profile_config), profile_python, cache, group, jobs_reason))
+        return [future.result() for future in futures]
+
+
+def format_summary(results: List[BuildResult]) -> str:
+    """生成各方案的构建汇总表"""
+
+    width: int = max([len("方案")] + [len(r.profile) for r in results])
+    lines: List[str] = [f"{'方案':<{width}}  状态      退出码  耗时"]
+    for result in results:
+        lines.append(f"{result.profile:<{width}}  {result.status:<8}  {result.returncode:<6}  {result.wall_time:.1f}s")
+        if result.record and result.record.get("compiler_cache"):
+            lines.append(f"{'':<{width}}  {ccache_util.format_cache(result.record['compiler_cache'])}")
+    return "\n".join(lines)
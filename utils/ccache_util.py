@@ -0,0 +1,186 @@
+# utils/ccache_util.py
+import os
+import json
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from utils.platform_util import is_windows, user_cache_dir
+
+
+# 统计日志中计为命中/未命中的计数器
+CCACHE_HIT_COUNTERS: List[str] = ["direct_cache_hit", "preprocessed_cache_hit"]
+CCACHE_MISS_COUNTERS: List[str] = ["cache_miss"]
+# 编译缓存统计日志名(每次构建单独一个, 并行构建互不干扰)
+STATS_LOG_NAME: str = "ccache-stats.log"
+# 查询统计的超时(秒)
+STATS_TIMEOUT: float = 10.0
+
+
+def nuitka_cache_dir(name: str) -> Path:
+    """Nuitka 默认使用的缓存目录(可用 NUITKA_CACHE_DIR_<NAME> 覆盖)"""
+
+    if override := os.environ.get(f"NUITKA_CACHE_DIR_{name.upper()}"):
+        return Path(override)
+    if is_windows():
+        return user_cache_dir() / "Nuitka" / "Nuitka" / "Cache" / name
+    return user_cache_dir() / "Nuitka" / name
+
+
+def detect(nuitka_config: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """检测 Nuitka 会使用的编译器缓存, 未启用或不可用时返回 None"""
+
+    if not nuitka_config.get("ccache", True):
+        return None
+    # MSVC 使用 Nuitka 内置的 clcache
+    if is_windows() and nuitka_config.get("compiler", "Auto") in ("Auto", "MSVC"):
+        return {"kind": "clcache", "binary": "", "dir": str(get_cache_dir(nuitka_config, "clcache"))}
+    binary: str = os.environ.get("NUITKA_CCACHE_BINARY") or shutil.which("ccache") or ""
+    if not binary:
+        return None
+    return {"kind": "ccache", "binary": binary, "dir": str(get_cache_dir(nuitka_config, "ccache"))}
+
+
+def get_cache_dir(nuitka_config: Dict[str, Any], kind: str) -> Path:
+    """配置的缓存目录(相对项目根目录), 未配置时为 Nuitka 的默认目录"""
+
+    if configured := nuitka_config.get("ccache_dir"):
+        path: Path = Path(configured).expanduser()
+        return path if path.is_absolute() else Path.cwd() / path
+    return nuitka_cache_dir(kind)
+
+
+def get_env(nuitka_config: Dict[str, Any], stats_log: Optional[Path] = None) -> Dict[str, str]:
+    """构建时需要设置的环境变量: 缓存目录、大小上限与统计日志"""
+
+    cache: Optional[Dict[str, str]] = detect(nuitka_config)
+    if not cache:
+        return {}
+    if cache["kind"] == "clcache":
+        return {"CLCACHE_DIR": cache["dir"]}
+    env: Dict[str, str] = {"CCACHE_DIR": cache["dir"], "NUITKA_CCACHE_BINARY": cache["binary"]}
+    if max_size := nuitka_config.get("ccache_max_size"):
+        env["CCACHE_MAXSIZE"] = str(max_size)
+    if stats_log:
+        env["CCACHE_STATSLOG"] = str(stats_log)
+    return env
+
+
+def read_stats(nuitka_config: Dict[str, Any]) -> Optional[Dict[str, int]]:
+    """读取缓存目录的累计统计, 返回 {"hits", "misses", "size"}"""
+
+    cache: Optional[Dict[str, str]] = detect(nuitka_config)
+    if not cache:
+        return None
+    if cache["kind"] == "clcache":
+        try:
+            stats: Dict[str, int] = json.loads((Path(cache["dir"]) / "stats.txt").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {"hits": 0, "misses": 0, "size": 0}
+        return {
+            "hits": stats.get("CacheHits", 0),
+            "misses": sum(v for k, v in stats.items() if k.endswith("Misses")),
+            "size": stats.get("CacheSize", 0),
+        }
+    try:
+        result: subprocess.CompletedProcess = subprocess.run(
+            [cache["binary"], "--print-stats"],
+            env=dict(os.environ, CCACHE_DIR=cache["dir"]),
+            capture_output=True,
+            text=True,
+            timeout=STATS_TIMEOUT,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    # 每行为 "计数器\t数值"
+    counters: Dict[str, int] = {}
+    for line in result.stdout.splitlines():
+        key, _, value = line.partition("\t")
+        if value.strip().isdigit():
+            counters[key] = int(value)
+    return {
+        "hits": sum(counters.get(k, 0) for k in CCACHE_HIT_COUNTERS),
+        "misses": sum(counters.get(k, 0) for k in CCACHE_MISS_COUNTERS),
+        "size": counters.get("cache_size_kibibyte", 0) * 1024,
+    }
+
+
+def read_stats_log(stats_log: Path) -> Optional[Dict[str, int]]:
+    """统计本次构建的统计日志(每次编译一行计数器名), 不受并行构建影响"""
+
+    if not stats_log.is_file():
+        return None
+    hits: int = 0
+    misses: int = 0
+    with open(stats_log, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            counter: str = line.strip()
+            if counter in CCACHE_HIT_COUNTERS:
+                hits += 1
+            elif counter in CCACHE_MISS_COUNTERS:
+                misses += 1
+    return {"hits": hits, "misses": misses}
+
+
+def summarize(nuitka_config: Dict[str, Any], before: Optional[Dict[str, int]], after: Optional[Dict[str, int]], stats_log: Optional[Path]) -> Optional[Dict[str, Any]]:
+    """汇总一次构建的命中情况, 优先使用统计日志, 否则使用构建前后统计的差值"""
+
+    cache: Optional[Dict[str, str]] = detect(nuitka_config)
+    if not cache:
+        return None
+    counts: Optional[Dict[str, int]] = read_stats_log(stats_log) if stats_log else None
+    source: str = "log"
+    if counts is None:
+        if before is None or after is None:
+            return None
+        counts = {"hits": after["hits"] - before["hits"], "misses": after["misses"] - before["misses"]}
+        source = "snapshot"
+    return {
+        "kind": cache["kind"],
+        "dir": cache["dir"],
+        "hits": max(counts["hits"], 0),
+        "misses": max(counts["misses"], 0),
+        "source": source,
+        "size_before": before["size"] if before else None,
+        "size_after": after["size"] if after else None,
+    }
+
+
+def estimate_time_saved(record: Dict[str, Any], history: List[Dict[str, Any]]) -> Optional[float]:
+    """按每次未命中编译的平均耗时估算命中节省的时间(秒)
+
+    平均耗时取本次 C 编译阶段的耗时除以未命中数, 本次全部命中时取最近一次有未命中的构建"""
+
+    for candidate in [record, *reversed(history)]:
+        cache: Optional[Dict[str, Any]] = candidate.get("compiler_cache")
+        phase: Optional[Dict[str, Any]] = next((p for p in candidate.get("phases", []) if p["name"] == "C 编译"), None)
+        if cache and phase and cache["misses"] > 0:
+            return round(record["compiler_cache"]["hits"] * phase["duration"] / cache["misses"], 1)
+    return None
+
+
+def trim_commands(nuitka_config: Dict[str, Any]) -> List[List[str]]:
+    """将 ccache 缓存整理到配置的大小上限以内的命令"""
+
+    cache: Optional[Dict[str, str]] = detect(nuitka_config)
+    if not cache or cache["kind"] != "ccache":
+        return []
+    commands: List[List[str]] = []
+    if max_size := nuitka_config.get("ccache_max_size"):
+        commands.append([cache["binary"], "--max-size", str(max_size)])
+    commands.append([cache["binary"], "--cleanup"])
+    commands.append([cache["binary"], "--show-stats"])
+    return commands
+
+
+def format_cache(summary: Dict[str, Any]) -> str:
+    """单行描述编译缓存命中情况"""
+
+    total: int = summary["hits"] + summary["misses"]
+    rate: str = f"{summary['hits'] / total:.0%}" if total else "-"
+    saved: str = f", 约节省 {summary['time_saved']:.0f}s" if summary.get("time_saved") else ""
+    cold: str = ", 冷缓存" if total and summary["hits"] == 0 else ""
+    return f"编译缓存 {summary['kind']}: 命中 {summary['hits']} / 未命中 {summary['misses']} (命中率 {rate}){saved}{cold}"
@@ -1,52 +1,266 @@
 # utils/config_util.py
+import os
+import copy
+import stat
 import yaml
 import tomlkit
+import tempfile
+import threading
 from pathlib import Path
-from typing import Any, Dict
-from tomlkit.items import Array, Table
-from tomlkit import TOMLDocument, parse, document, dumps
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Self, Tuple
+from tomlkit.items import AoT, Array, InlineTable, Table
+from tomlkit import TOMLDocument, parse, document
 
 
 # 项目配置文件路径(从当前工作目录读取)
 config_path: Path = Path.cwd() / "pyproject.toml"
 # 全局配置文件路径
 global_config_path: Path = Path.home() / "ouroboros.toml"
+# 空的只读视图
+EMPTY_VIEW: Mapping[str, Any] = MappingProxyType({})
+# 新建配置文件的权限
+NEW_FILE_MODE: int = 0o644
+# 串行化写入, 避免两个保存同时修改同一份缓存的文档
+write_lock: threading.Lock = threading.Lock()
+
+
+def parse_file(file_path: Path) -> Tuple[Dict[str, Any], Optional[TOMLDocument]]:
+    """按扩展名解析 TOML / YAML 文件, 返回 (数据, TOML 文档), 解析失败时返回空字典"""
+    try:
+        # 保留原有换行符, 写回时不改变未修改的行
+        with open(file_path, "r", encoding="utf-8", newline="") as f:
+            if file_path.suffix in (".yml", ".yaml"):
+                return yaml.safe_load(f) or {}, None
+            doc: TOMLDocument = parse(f.read())
+            return doc.unwrap(), doc
+    except Exception:
+        return {}, None
+
+
+def merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    """深度合并, override 中的值优先, 数组整体替换"""
+    result: Dict[str, Any] = dict(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(result.get(key), dict):
+            result[key] = merge(result[key], value)
+        else:
+            result[key] = value
+    return result
+
+
+def freeze(value: Any) -> Any:
+    """递归转换为只读视图: 字典 -> MappingProxyType, 数组 -> tuple"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class ConfigStore:
+    """配置文件缓存: 每个文件只解析一次, 按 mtime/大小/inode 判断是否失效
+
+    项目配置的只读视图以 ~/ouroboros.toml 为默认值, 全局文件的表与 [tool.ouroboros] 相同(如 [nuitka]、[console])"""
+
+    def __init__(self: Self, project_path: Path, global_path: Path) -> None:
+        self.project_path: Path = project_path
+        self.global_path: Path = global_path
+        # 路径 -> (文件状态, 解析结果, TOML 文档)
+        self.entries: Dict[str, Tuple[Optional[Tuple[int, int, int]], Dict[str, Any], Optional[TOMLDocument]]] = {}
+        # 路径 -> (来源解析结果, 只读视图)
+        self.views: Dict[str, Tuple[Tuple[Dict[str, Any], ...], Mapping[str, Any]]] = {}
+        # 实际解析次数(用于基准测试)
+        self.parse_count: int = 0
+        self.lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def stat_key(file_path: Path) -> Optional[Tuple[int, int, int]]:
+        """文件状态指纹, 文件不存在时为 None"""
+        try:
+            stat: os.stat_result = file_path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def read(self: Self, file_path: Path) -> Dict[str, Any]:
+        """返回缓存的解析结果, 为共享对象, 调用方不得修改"""
+        path: str = os.path.abspath(file_path)
+        key: Optional[Tuple[int, int, int]] = self.stat_key(file_path)
+        with self.lock:
+            entry = self.entries.get(path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        data: Dict[str, Any] = {}
+        doc: Optional[TOMLDocument] = None
+        if key is not None:
+            data, doc = parse_file(file_path)
+            with self.lock:
+                self.parse_count += 1
+        with self.lock:
+            self.entries[path] = (key, data, doc)
+        return data
+
+    def document(self: Self, file_path: Path) -> Optional[TOMLDocument]:
+        """缓存的 TOML 文档(保留注释与格式), 仅供保存时就地修改"""
+        self.read(file_path)
+        with self.lock:
+            return self.entries[os.path.abspath(file_path)][2]
+
+    def load(self: Self, file_path: Path) -> Dict[str, Any]:
+        """返回可修改的副本, 用于修改后保存"""
+        return copy.deepcopy(self.read(file_path))
+
+    def update(self: Self, file_path: Path, data: Dict[str, Any], doc: Optional[TOMLDocument] = None) -> None:
+        """写入文件后直接更新缓存, 避免重新解析刚写入的内容"""
+        snapshot: Dict[str, Any] = copy.deepcopy(data)
+        with self.lock:
+            self.entries[os.path.abspath(file_path)] = (self.stat_key(file_path), snapshot, doc)
+
+    def invalidate(self: Self, file_path: Optional[Path] = None) -> None:
+        """丢弃指定文件(默认全部)的缓存"""
+        with self.lock:
+            if file_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(os.path.abspath(file_path), None)
+
+    def view(self: Self, file_path: Optional[Path] = None) -> Mapping[str, Any]:
+        """只读视图, 未指定文件时为合并全局默认值后的项目配置"""
+        if file_path is None or os.path.abspath(file_path) == os.path.abspath(self.project_path):
+            file_path = self.project_path
+            sources: Tuple[Dict[str, Any], ...] = (self.read(self.project_path), self.read(self.global_path))
+        else:
+            sources = (self.read(file_path),)
+        path: str = os.path.abspath(file_path)
+        # 来源对象未变化(未重新解析)时复用已生成的视图
+        cached = self.views.get(path)
+        if cached is not None and all(a is b for a, b in zip(cached[0], sources)):
+            return cached[1]
+        data: Dict[str, Any] = sources[0]
+        if len(sources) > 1 and sources[1]:
+            data = merge({"tool": {"ouroboros": sources[1]}}, data)
+        result: Mapping[str, Any] = freeze(data)
+        self.views[path] = (sources, result)
+        return result
+
+    def section(self: Self, name: str) -> Mapping[str, Any]:
+        """[tool.ouroboros.<name>] 的只读视图"""
+        return self.view().get("tool", EMPTY_VIEW).get("ouroboros", EMPTY_VIEW).get(name, EMPTY_VIEW)
+
+
+# 全局配置缓存
+config_store: ConfigStore = ConfigStore(config_path, global_config_path)
 
 
 def load_yaml(file_path: Path) -> Dict[str, Any]:
-    """加载 YAML 文件"""
-    if file_path.exists():
-        with open(file_path, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
-    return {}
+    """加载 YAML 文件(可修改的副本)"""
+    return config_store.load(file_path)
 
 
 def save_yaml(config: Dict, file_path: Path) -> None:
-    """保存 YAML 文件"""
-    with open(file_path, "w", encoding="utf-8") as f:
-        yaml.dump(config, f, allow_unicode=True)
+    """保存 YAML 文件, 保持键的原有顺序, 内容未变化时不写入"""
+    with write_lock:
+        if file_path.exists() and config == config_store.read(file_path):
+            return
+        atomic_write(file_path, yaml.dump(config, allow_unicode=True, sort_keys=False))
+        config_store.update(file_path, config)
 
 
 def load_toml(file_path: Path) -> Dict[str, Any]:
-    """加载 TOML 文件"""
-    if file_path.exists():
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content: str = f.read()
-                return parse(content).unwrap()
-        except Exception:
-            return {}
-    return {}
+    """加载 TOML 文件(可修改的副本, 不含全局默认值)"""
+    return config_store.load(file_path)
 
 
 def save_toml(config: Dict, file_path: Path) -> None:
-    """保存 TOML 文件"""
-    doc: TOMLDocument = document()
-    # 递归处理配置字典
-    for key, value in config.items():
-        doc[key] = process_value_recursive(value)
-    with open(file_path, "w", encoding="utf-8") as f:
-        f.write(dumps(doc))
+    """保存 TOML 文件: 在原文档上只修改变化的键以保留注释与格式, 内容未变化时不写入"""
+    with write_lock:
+        if file_path.exists() and config == config_store.read(file_path):
+            return
+        doc: TOMLDocument = config_store.document(file_path) or document()
+        try:
+            sync_table(doc, config)
+            atomic_write(file_path, doc.as_string())
+        except BaseException:
+            # 缓存的文档可能已被修改一半, 下次重新解析
+            config_store.invalidate(file_path)
+            raise
+        config_store.update(file_path, doc.unwrap(), doc)
+
+
+def sync_table(table: Any, data: Dict[str, Any]) -> None:
+    """就地同步表格: 删除多余的键, 只替换值有变化的键, 新键追加在末尾"""
+    for key in [k for k in table if k not in data]:
+        del table[key]
+    for key, value in data.items():
+        current: Any = table.get(key)
+        if isinstance(value, dict) and isinstance(current, dict):
+            sync_table(current, value)
+            continue
+        if isinstance(current, AoT) and isinstance(value, list) and all(isinstance(item, dict) for item in value):
+            sync_array_of_tables(current, value)
+            continue
+        if current is not None and (current.unwrap() if hasattr(current, "unwrap") else current) == value:
+            continue
+        if isinstance(table, InlineTable):
+            table[key] = tomlkit.item(value)
+        elif isinstance(value, dict):
+            table[key] = process_table(value)
+        elif isinstance(value, list) and value and isinstance(value[0], dict) and not isinstance(current, Array):
+            # 数组的表格（如 [[tool.uv.index]]）
+            table[key] = process_array_of_tables(value)
+        else:
+            new_value: Any = process_value_recursive(value)
+            # 保持原数组的单行/多行样式
+            if isinstance(current, Array) and isinstance(new_value, Array) and "\n" not in current.as_string():
+                new_value.multiline(False)
+            table[key] = new_value
+
+
+def sync_array_of_tables(array: AoT, items: list) -> None:
+    """就地同步表格数组: 逐个同步已有的表格, 只在长度变化时追加或删除末尾的表格"""
+    for table, item in zip(array, items):
+        sync_table(table, item)
+    for item in items[len(array):]:
+        table: Table = process_table(item)
+        # 与前一个表格一样以空行结尾, 不与下一个表格相连
+        if len(array) and array[-1].as_string().endswith("\n\n"):
+            table.add(tomlkit.nl())
+        array.append(table)
+    while len(array) > len(items):
+        del array[len(array) - 1]
+
+
+def atomic_write(file_path: Path, content: str) -> bool:
+    """原子写入: 先写入同目录的临时文件并 fsync, 再重命名覆盖, 中途崩溃不会留下截断的文件
+
+    与现有内容逐字节相同时不写入, 返回是否写入"""
+    data: bytes = content.encode("utf-8")
+    try:
+        if file_path.read_bytes() == data:
+            return False
+        mode: int = stat.S_IMODE(file_path.stat().st_mode)
+    except OSError:
+        mode = NEW_FILE_MODE
+    fd, temp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    # 同步目录项, 确保重命名本身落盘(Windows 不支持打开目录)
+    if os.name == "posix":
+        dir_fd: int = os.open(file_path.parent, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return True
 
 
 def process_value_recursive(value: Any) -> Any:
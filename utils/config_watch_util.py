@@ -0,0 +1,155 @@
+# utils/config_watch_util.py
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Self, Set, Tuple
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+from utils.config_util import ConfigStore, config_store, config_path, global_config_path
+
+
+# 环境配置文件
+environment_yaml_path: Path = Path.cwd() / "environment.yml"
+# 事件合并间隔(毫秒): 编辑器保存与 git 检出通常连续触发多个事件
+DEBOUNCE_DELAY: int = 100
+# 轮询间隔(毫秒), 仅在系统文件监视不可用时使用
+POLL_INTERVAL: int = 2000
+# 设置该环境变量时强制使用轮询(例如网络文件系统上 inotify 收不到其他机器的修改)
+POLL_ENV: str = "OUROBOROS_WATCH_POLL"
+# 比较时的缺失值
+MISSING: object = object()
+
+
+def diff_keys(old: Any, new: Any, prefix: str = "") -> Set[str]:
+    """比较两份配置, 返回变化的键(点分路径), 两边都是表格时逐层展开"""
+
+    if not (isinstance(old, Mapping) and isinstance(new, Mapping)):
+        return {prefix} if old != new else set()
+    keys: Set[str] = set()
+    for key in set(old) | set(new):
+        old_value: Any = old.get(key, MISSING)
+        new_value: Any = new.get(key, MISSING)
+        if old_value != new_value:
+            keys |= diff_keys(old_value, new_value, f"{prefix}.{key}" if prefix else key)
+    return keys
+
+
+def affects(key: str, prefix: str) -> bool:
+    """变化的键是否位于 prefix 之下(或包含 prefix), 空前缀匹配整个文件"""
+
+    return not prefix or key == prefix or key.startswith(f"{prefix}.") or prefix.startswith(f"{key}.")
+
+
+class ConfigWatcher(QObject):
+    """监视项目配置文件, 被修改后只解析一次并按键比较新旧内容
+
+    使用系统文件监视(Linux 下为 inotify), 不可用时退回按 stat 轮询; 全局配置的变化按合并后的项目配置比较"""
+
+    # 信号: 文件路径(绝对路径), 变化的键
+    changed: Signal = Signal(object, object)
+    # 信号: 后台首次解析完成
+    ready: Signal = Signal()
+
+    def __init__(self: Self, paths: List[Path], store: ConfigStore = config_store) -> None:
+        super().__init__()
+        self.store: ConfigStore = store
+        self.paths: List[Path] = [path.absolute() for path in paths]
+        self.project_path: Path = store.project_path.absolute()
+        self.global_path: Path = store.global_path.absolute()
+        self.stamps: Dict[Path, Optional[Tuple[int, int, int]]] = {}
+        # 上次通知时的内容, 全局配置并入项目配置
+        self.snapshots: Dict[Path, Mapping[str, Any]] = {}
+        # 首次解析放到后台线程, 页面创建时直接命中缓存; 由 start 启动, 以免 ready 在连接之前发出
+        self.primed: threading.Event = threading.Event()
+        self.prime_thread: Optional[threading.Thread] = None
+        self.debounce_timer: QTimer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(DEBOUNCE_DELAY)
+        self.debounce_timer.timeout.connect(self.check)
+        self.poll_timer: QTimer = QTimer(self)
+        self.poll_timer.setInterval(POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.check)
+        self.watcher: Optional[QFileSystemWatcher] = None
+        if os.environ.get(POLL_ENV):
+            self.poll_timer.start()
+        else:
+            self.watcher = QFileSystemWatcher(self)
+            self.watcher.fileChanged.connect(lambda _: self.debounce_timer.start())
+            self.watcher.directoryChanged.connect(lambda _: self.debounce_timer.start())
+            self.rewatch()
+
+    def start(self: Self) -> None:
+        """开始后台首次解析, 应在连接 ready 信号之后调用, 重复调用无效"""
+
+        if self.prime_thread is None:
+            self.prime_thread = threading.Thread(target=self.prime, name="config-preload", daemon=True)
+            self.prime_thread.start()
+
+    def prime(self: Self) -> None:
+        """记录各文件的初始状态与内容(后台线程), ready 经队列连接在 GUI 线程中处理"""
+
+        for path in self.paths:
+            self.stamps[path] = ConfigStore.stat_key(path)
+            self.snapshots[self.target(path)] = self.snapshot(path)
+        self.primed.set()
+        self.ready.emit()
+
+    def target(self: Self, path: Path) -> Path:
+        """变化归属的文件: 全局配置的变化体现在项目配置中"""
+
+        return self.project_path if path == self.global_path else path
+
+    def snapshot(self: Self, path: Path) -> Mapping[str, Any]:
+        """文件当前内容的只读视图"""
+
+        target: Path = self.target(path)
+        return self.store.view() if target == self.project_path else self.store.view(target)
+
+    def rewatch(self: Self) -> None:
+        """重新添加监视: 原子替换(重命名)会使原有的文件监视失效, 文件不存在时监视所在目录以发现创建"""
+
+        if self.watcher is None:
+            return
+        watched: Set[str] = set(self.watcher.files()) | set(self.watcher.directories())
+        wanted: Set[str] = set()
+        for path in self.paths:
+            wanted.add(str(path) if path.exists() else str(path.parent))
+        if missing := sorted(wanted - watched):
+            failed: List[str] = self.watcher.addPaths(missing)
+            # 系统监视数量达到上限等情况下退回轮询
+            if failed and not self.poll_timer.isActive():
+                self.poll_timer.start()
+        if extra := sorted(watched - wanted):
+            self.watcher.removePaths(extra)
+
+    def check(self: Self) -> None:
+        """检查各文件的 mtime/大小/inode, 有变化时解析并通知变化的键"""
+
+        if not self.primed.is_set():
+            self.start()
+            self.debounce_timer.start()
+            return
+        self.rewatch()
+        for path in self.paths:
+            stamp: Optional[Tuple[int, int, int]] = ConfigStore.stat_key(path)
+            if stamp == self.stamps[path]:
+                continue
+            self.stamps[path] = stamp
+            target: Path = self.target(path)
+            old: Mapping[str, Any] = self.snapshots[target]
+            new: Mapping[str, Any] = self.snapshot(path)
+            self.snapshots[target] = new
+            if keys := diff_keys(old, new):
+                self.changed.emit(target, keys)
+
+
+_config_watcher: Optional[ConfigWatcher] = None
+
+
+def get_config_watcher() -> ConfigWatcher:
+    """获取全局配置文件监视器(需在 GUI 线程中首次调用), 连接信号后调用 start 开始首次解析"""
+
+    global _config_watcher
+    if _config_watcher is None:
+        _config_watcher = ConfigWatcher([config_path, global_config_path, environment_yaml_path])
+    return _config_watcher
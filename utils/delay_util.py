@@ -1,52 +1,220 @@
 # utils/delay_util.py
-import subprocess
-from typing import Any, Dict, Optional
-from PySide6.QtCore import QThread, Signal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional, Self, Tuple
+from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QWidget, QLabel
 
-class DelayThread(QThread):
-    # 信号: 标签, 结果文本
-    operate: Signal = Signal(object, str)
-    
-    def __init__(self, interface: Optional[QWidget], details: Dict[str, Any]) -> None:
-        super().__init__(interface)
-        self.interface: Optional[QWidget] = interface
-        self.details: Dict[str, Any] = details
-    
-    def run(self) -> None:
+from utils import python_path_util, tool_util
+
+
+# 默认探测配置: 同时运行的探测数, 单次超时(秒), 配置加载后是否在后台预热全部探测, 缓存结果超过该时间(秒)后在后台重新确认
+DEFAULT_PROBE_CONFIG: Dict[str, Any] = {
+    "max_workers": 4,
+    "timeout": 10,
+    "warm_on_startup": True,
+    "revalidate_after": 86400,
+}
+# 耗时超过该值(秒)的探测在标签中显示耗时
+SLOW_PROBE: float = 2.0
+# 各工具的版本探测: 命令({python} 为当前解释器), 标签前缀, 失败提示
+PROBES: Dict[str, Dict[str, Any]] = {
+    "nuitka_version": {
+        "command": ["{python}", "-m", "nuitka", "--version"],
+        "prefix": "Nuitka Version: ",
+        "err": "未找到, 请确保 Nuitka 已安装",
+    },
+    "conda_version": {
+        "command": ["conda", "--version"],
+        "prefix": "Conda Version: ",
+        "err": "未找到, 请确保 Conda 已安装",
+    },
+    "docker_version": {
+        "command": ["docker", "--version"],
+        "prefix": "Docker Version: ",
+        "err": "未找到, 请确保 Docker 已安装",
+    },
+    "uv_version": {
+        "command": ["uv", "--version"],
+        "prefix": "UV Version: ",
+        "err": "未找到, 请确保 uv 已安装",
+    },
+}
+
+
+def get_probe_config(config: Mapping[str, Any]) -> Dict[str, Any]:
+    """读取 [tool.ouroboros.probes] 并补全默认值"""
+
+    probe_config: Dict[str, Any] = dict(DEFAULT_PROBE_CONFIG)
+    probe_config.update(config.get("tool", {}).get("ouroboros", {}).get("probes", {}))
+    return probe_config
+
+
+def get_command(name: str) -> Tuple[str, ...]:
+    """探测的命令, 解释器在调用时解析"""
+
+    python_path: str = python_path_util.get_python_path()
+    return tuple(python_path if part == "{python}" else part for part in PROBES[name]["command"])
+
+
+class Probe:
+    """一次探测: 同一命令进行中时只运行一次, 结束后回调所有等待者"""
+
+    def __init__(self: Self, command: Tuple[str, ...], timeout: float, force: bool = False) -> None:
+        self.command: Tuple[str, ...] = command
+        self.timeout: float = timeout
+        # 重新确认时不使用磁盘缓存
+        self.force: bool = force
+        # None 表示进行中
+        self.ok: Optional[bool] = None
+        # 成功时为标准输出, 失败时为错误信息
+        self.output: str = ""
+        self.duration: float = 0.0
+        self.timed_out: bool = False
+        # 缓存 / 元数据 / 命令
+        self.source: str = ""
+        self.callbacks: List[Callable[["Probe"], None]] = []
+
+    def run(self: Self) -> None:
+        """在工作线程中执行: 文件未变化时使用缓存, 否则读取元数据或运行命令"""
+
+        start: float = time.perf_counter()
+        result: tool_util.ToolVersion = tool_util.tool_registry.lookup(self.command, self.timeout, self.force)
+        self.ok = result.ok
+        self.output = result.output
+        self.source = result.source
+        self.timed_out = result.timed_out
+        self.duration = time.perf_counter() - start
+
+
+class ProbePool(QObject):
+    """所有版本探测共用的有界线程池, 记录每个命令最近一次的结果、来源与耗时"""
+
+    # 信号: 结束的探测(在 GUI 线程中处理)
+    finished: Signal = Signal(object)
+
+    def __init__(self: Self, max_workers: int = DEFAULT_PROBE_CONFIG["max_workers"], timeout: float = DEFAULT_PROBE_CONFIG["timeout"]) -> None:
+        super().__init__()
+        self.max_workers: int = max_workers
+        self.timeout: float = timeout
+        self.revalidate_after: float = DEFAULT_PROBE_CONFIG["revalidate_after"]
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers, thread_name_prefix="probe")
+        # 进行中与已结束的探测: 命令 -> 探测, 只在 GUI 线程中读写
+        self.running: Dict[Tuple[str, ...], Probe] = {}
+        self.results: Dict[Tuple[str, ...], Probe] = {}
+        self.finished.connect(self.dispatch)
+
+    def configure(self: Self, config: Mapping[str, Any]) -> None:
+        """按 [tool.ouroboros.probes] 调整并发数、超时与重新确认间隔, 进行中的探测不受影响"""
+
+        probe_config: Dict[str, Any] = get_probe_config(config)
+        self.timeout = float(probe_config["timeout"])
+        self.revalidate_after = float(probe_config["revalidate_after"])
+        if int(probe_config["max_workers"]) != self.max_workers:
+            self.max_workers = int(probe_config["max_workers"])
+            self.executor.shutdown(wait=False)
+            self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="probe")
+
+    def submit(self: Self, command: Tuple[str, ...], callback: Optional[Callable[[Probe], None]] = None) -> Probe:
+        """提交探测: 已成功的直接回调(过期时在后台重新确认, 结束后再次回调), 相同命令进行中时只追加回调"""
+
+        cached: Optional[Probe] = self.results.get(command)
+        if cached and cached.ok:
+            if callback:
+                callback(cached)
+            if not tool_util.tool_registry.is_fresh(command, self.revalidate_after):
+                self.start(command, force=True, callback=callback)
+            return cached
+        return self.start(command, callback=callback)
+
+    def start(self: Self, command: Tuple[str, ...], force: bool = False, callback: Optional[Callable[[Probe], None]] = None) -> Probe:
+        """运行探测, 相同命令进行中时只追加回调"""
+
+        probe: Optional[Probe] = self.running.get(command)
+        if probe is None:
+            probe = Probe(command, self.timeout, force)
+            self.running[command] = probe
+            self.executor.submit(self.execute, probe)
+        if callback:
+            probe.callbacks.append(callback)
+        return probe
+
+    def execute(self: Self, probe: Probe) -> None:
+        """在工作线程中运行探测, 出错时记录为失败; 无论结果如何都通知 GUI 线程, 由 dispatch 移出进行中的探测"""
+
+        start: float = time.perf_counter()
         try:
-            process: subprocess.Popen = subprocess.Popen(
-                self.details["command"],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                creationflags=subprocess.CREATE_NO_WINDOW,
-                text=True,
-            )
-            stdout, stderr = process.communicate()
-            if process.returncode == 0:
-                text: str = f"{self.details["prefix"]}{stdout.strip()}"
-                self.details["var"] = text
-                self.operate.emit(self.details["object"], text)
-            else:
-                text: str = stderr.strip() or "Unknown error"
-                self.operate.emit(self.details["object"], f"{self.details["prefix"]}{self.details["err"]}: {text}")
-        except (subprocess.SubprocessError, FileNotFoundError) as e:
-            self.operate.emit(self.details["object"], f"{self.details["prefix"]}{self.details["err"]}: {str(e)}")
+            probe.run()
+        except Exception as e:
+            probe.ok = False
+            probe.output = f"探测出错: {type(e).__name__}: {e}"
+            probe.duration = time.perf_counter() - start
+        finally:
+            self.finished.emit(probe)
+
+    def dispatch(self: Self, probe: Probe) -> None:
+        """探测结束: 记录结果并回调等待者; 使用了过期缓存时在后台重新确认, 结束后再次回调"""
+
+        self.running.pop(probe.command, None)
+        self.results[probe.command] = probe
+        callbacks, probe.callbacks = probe.callbacks, []
+        for callback in callbacks:
+            callback(probe)
+        if probe.ok and probe.source == "缓存" and not tool_util.tool_registry.is_fresh(probe.command, self.revalidate_after):
+            revalidation: Probe = self.start(probe.command, force=True)
+            revalidation.callbacks.extend(callbacks)
+
+    def warm_all(self: Self, force: bool = False) -> None:
+        """在后台运行全部探测, 页面显示时直接使用结果; force 时忽略已有结果与磁盘缓存"""
+
+        if force:
+            self.results.clear()
+            tool_util.tool_registry.invalidate()
+        for name in PROBES:
+            self.submit(get_command(name))
+
+
+_probe_pool: Optional[ProbePool] = None
+
+
+def get_probe_pool() -> ProbePool:
+    """获取全局探测线程池(需在 GUI 线程中首次调用)"""
+
+    global _probe_pool
+    if _probe_pool is None:
+        _probe_pool = ProbePool()
+    return _probe_pool
+
+
+def format_probe(name: str, probe: Probe) -> str:
+    """标签文本, 慢的探测附带耗时"""
+
+    spec: Dict[str, Any] = PROBES[name]
+    if probe.ok or probe.timed_out:
+        text: str = f"{spec['prefix']}{probe.output}"
+    else:
+        text = f"{spec['prefix']}{spec['err']}: {probe.output}"
+    if probe.duration >= SLOW_PROBE:
+        text += f" (耗时 {probe.duration:.1f}s)"
+    return text
+
+
+def create_delay_var(name: str, obj: Any, operate: Optional[Callable[[Any, str], None]] = None) -> Dict[str, Any]:
+    """创建延时变量: 探测名称, 显示结果的对象与显示方式"""
+
+    return {"probe": name, "object": obj, "operate": operate or set_label_text}
+
 
 def set_delay_var(interface: QWidget, details: Dict[str, Any]) -> None:
     """设置延时标签"""
-    # 如果已有缓存值, 直接使用
-    if details["var"]:
-        details["operate"](details["object"], details["var"])
-        return
-    else:
-        details["operate"](details["object"], f"{details["prefix"]}正在获取...")
-    # 创建并启动后台线程
-    thread: DelayThread = DelayThread(interface, details)
-    # 连接信号
-    thread.operate.connect(details["operate"])
-    # 启动线程
-    thread.start()
+
+    name: str = details["probe"]
+    probe: Probe = get_probe_pool().submit(get_command(name), lambda probe: details["operate"](details["object"], format_probe(name, probe)))
+    # 结果未就绪时先显示上次缓存的版本, 后台确认后再更新
+    if probe.ok is None:
+        cached: Optional[str] = tool_util.tool_registry.peek(probe.command)
+        details["operate"](details["object"], f"{PROBES[name]['prefix']}{cached or '正在获取...'}")
+
 
 def set_label_text(lable: QLabel, text: str) -> None:
     """默认的设置标签方式"""
@@ -0,0 +1,104 @@
+# utils/env_sync_util.py
+import json
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import config_util
+from utils.build_cache_util import hash_file
+from utils.config_util import atomic_write
+from utils.inventory_util import package_inventory
+from utils.python_path_util import read_version
+
+
+# 环境中记录上次同步状态的文件
+STAMP_NAME: str = ".ouroboros-sync.json"
+# 记录格式版本, 修改格式时递增以废弃旧记录
+STAMP_VERSION: int = 1
+# pyproject.toml 中影响 uv sync 结果的配置段, [tool.ouroboros] 等其余内容的修改不触发同步
+UV_PROJECT_KEYS: List[str] = ["project", "dependency-groups", "build-system"]
+# 其他影响 uv sync 结果的文件
+UV_INPUT_FILES: List[str] = ["uv.lock", ".python-version"]
+
+
+def hash_path(path: Path) -> Optional[str]:
+    """文件内容的摘要, 不存在时为 None"""
+
+    if not path.is_file():
+        return None
+    hasher: Any = hashlib.sha256()
+    hash_file(path, hasher)
+    return hasher.hexdigest()
+
+
+def get_uv_inputs(config_path: Path = config_util.config_path) -> Dict[str, Optional[str]]:
+    """uv sync 的输入: pyproject.toml 中的依赖相关配置段、[tool.uv] 与 uv.lock 等文件"""
+
+    config: Dict[str, Any] = config_util.config_store.read(config_path)
+    relevant: Dict[str, Any] = {key: config.get(key) for key in UV_PROJECT_KEYS}
+    relevant["tool.uv"] = config.get("tool", {}).get("uv")
+    inputs: Dict[str, Optional[str]] = {"pyproject.toml": hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode()).hexdigest()}
+    for name in UV_INPUT_FILES:
+        inputs[name] = hash_path(config_path.parent / name)
+    return inputs
+
+
+def get_conda_inputs(environment_yaml_path: Path) -> Dict[str, Optional[str]]:
+    """conda env create 的输入: environment.yml"""
+
+    return {environment_yaml_path.name: hash_path(environment_yaml_path)}
+
+
+def get_snapshot(prefix: Path) -> Dict[str, str]:
+    """环境中已安装的包: 规范化包名 -> 版本"""
+
+    return {package.key: package.version for package in package_inventory.get(prefix).packages}
+
+
+def read_stamp(prefix: Path) -> Optional[Dict[str, Any]]:
+    """读取环境中的同步记录, 不存在、损坏或版本不符时为 None"""
+
+    try:
+        stamp: Dict[str, Any] = json.loads((prefix / STAMP_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return stamp if stamp.get("version") == STAMP_VERSION else None
+
+
+def check(prefix: Path, inputs: Dict[str, Optional[str]]) -> Tuple[bool, str]:
+    """不启动子进程地判断环境是否已与输入一致, 返回 (是否一致, 原因)
+
+    依次比较: 环境是否存在, 输入文件的摘要, 解释器版本, 已安装的包与上次同步后的清单"""
+
+    if not prefix.is_dir():
+        return False, f"环境 {prefix.name} 不存在"
+    stamp: Optional[Dict[str, Any]] = read_stamp(prefix)
+    if stamp is None:
+        return False, "未记录上次同步的状态"
+    changed: List[str] = [name for name, digest in inputs.items() if stamp["inputs"].get(name) != digest]
+    if changed:
+        return False, f"{', '.join(changed)} 已变化"
+    python: str = read_version(prefix)[0]
+    if stamp["python"] != python:
+        return False, f"解释器版本已变化({stamp['python']} -> {python})"
+    recorded: Dict[str, str] = stamp["packages"]
+    current: Dict[str, str] = get_snapshot(prefix)
+    if recorded != current:
+        added: int = len(current.keys() - recorded.keys())
+        removed: int = len(recorded.keys() - current.keys())
+        updated: int = sum(1 for key in current.keys() & recorded.keys() if current[key] != recorded[key])
+        return False, f"已安装的包与上次同步后不同(新增 {added}, 移除 {removed}, 版本变化 {updated})"
+    return True, f"环境已与 {', '.join(name for name, digest in inputs.items() if digest)} 一致, 共 {len(current)} 个包"
+
+
+def record(prefix: Path, inputs: Dict[str, Optional[str]]) -> None:
+    """同步成功后在环境中记录输入摘要、解释器版本与已安装的包"""
+
+    if not prefix.is_dir():
+        return
+    stamp: Dict[str, Any] = {"version": STAMP_VERSION, "inputs": inputs, "python": read_version(prefix)[0], "packages": get_snapshot(prefix)}
+    try:
+        atomic_write(prefix / STAMP_NAME, json.dumps(stamp, ensure_ascii=False, indent=2, sort_keys=True))
+    except OSError:
+        # 环境目录不可写时下次照常同步
+        pass
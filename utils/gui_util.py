@@ -1,12 +1,17 @@
 # utils/gui_util.py
-from PySide6.QtCore import Qt
-from typing import Any, Self, List, Optional, Callable
+import threading
+from collections import deque
+from contextlib import contextmanager
+from PySide6.QtCore import Qt, QAbstractListModel, QAbstractTableModel, QEvent, QModelIndex, QObject, QSortFilterProxyModel, QTimer, Signal
+from PySide6.QtGui import QColor, QKeyEvent, QKeySequence, QPalette
+from typing import Any, Deque, Dict, Iterator, Self, Set, List, Optional, Callable, Tuple
 from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
+    QStyleOptionViewItem,
     QHBoxLayout,
     QVBoxLayout,
     QWidget,
-    QLayout,
-    QLayoutItem,
     QWidget,
     QVBoxLayout,
     QLabel,
@@ -16,6 +21,7 @@ from PySide6.QtWidgets import (
 from qfluentwidgets import (
     InfoBar,
     InfoBarPosition,
+    MessageBox,
     LineEdit,
     PushButton,
     PrimaryPushButton,
@@ -23,9 +29,44 @@ from qfluentwidgets import (
     PushButton,
     SwitchButton,
     ModelComboBox,
+    PlainTextEdit,
+    ListView,
+    ListItemDelegate,
+    TableView,
 )
 
-from utils.style_util import red_style, TITLE_STYLE
+from utils import process_util
+from utils.style_util import Style, red_style, compile_stylesheet, THEME_PROPERTY, ROLE_PROPERTY, TITLE_ROLE
+
+# 自动保存的防抖间隔(毫秒)
+AUTOSAVE_DELAY: int = 800
+# 表格模型中排序键的数据角色
+SORT_ROLE: int = Qt.ItemDataRole.UserRole + 1
+
+
+def install_stylesheet() -> None:
+    """在应用级别设置编译好的全局样式表, 内容不变时不重复设置(每次设置都会重新应用全部控件的样式)"""
+    app: Optional[QApplication] = QApplication.instance()  # pyright: ignore[reportAssignmentType]
+    stylesheet: str = compile_stylesheet()
+    if app is not None and app.styleSheet() != stylesheet:
+        app.setStyleSheet(stylesheet)
+
+
+def apply_style(widget: QWidget, style: str | Style = "", role: str = "") -> None:
+    """设置控件样式: Style 只设置动态属性, 由全局样式表选择配色; 字符串作为该控件自己的样式表
+
+    控件自己的样式表优先于全局样式表, qfluentwidgets 的按钮自带样式表, 因此按钮配色仍需单独设置(字符串已缓存)"""
+    if isinstance(style, Style):
+        widget.setProperty(THEME_PROPERTY, style.name)
+        if isinstance(widget, PushButton):
+            widget.setStyleSheet(style.get_button_style())
+    elif style:
+        widget.setStyleSheet(style)
+    if role:
+        widget.setProperty(ROLE_PROPERTY, role)
+    # 控件创建时已按原属性匹配过样式, 只重新应用这一个控件(不影响子控件)
+    if isinstance(style, Style) or role:
+        widget.style().polish(widget)
 
 
 class GroupBuilder:
@@ -36,10 +77,10 @@ class GroupBuilder:
         parent: QWidget,
         layout: QVBoxLayout | QHBoxLayout,
         title: str,
-        style: str = "",
+        style: str | Style = "",
     ) -> QGroupBox:
         group = QGroupBox(title, parent)
-        group.setStyleSheet(style)
+        apply_style(group, style)
         layout.addWidget(group)
         return group
 
@@ -52,10 +93,11 @@ class LabelBuilder:
         parent: QWidget,
         layout: QVBoxLayout | QHBoxLayout,
         content: str = "",
-        style: str = TITLE_STYLE,
+        style: str | Style = "",
     ) -> QLabel:
+        """创建标签, 未指定样式时为标题"""
         label: QLabel = QLabel(content, parent)
-        label.setStyleSheet(style)
+        apply_style(label, style, "" if style else TITLE_ROLE)
         layout.addWidget(label)
         return label
 
@@ -70,12 +112,12 @@ class ButtonBuilder:
         text: str,
         slot: Callable,
         width: int = 100,
-        style: str = "",
+        style: str | Style = "",
     ) -> PushButton:
         """创建按钮"""
         btn_layout: QHBoxLayout = QHBoxLayout()
         btn = PushButton(text, parent)
-        btn.setStyleSheet(style)
+        apply_style(btn, style)
         btn.setFixedWidth(width)
         btn.clicked.connect(slot)
         btn_layout.addWidget(btn)
@@ -93,11 +135,11 @@ class PrimaryButtonBuilder:
         text: str,
         slot: Callable,
         height: int = 40,
-        style: str = "",
+        style: str | Style = "",
     ) -> PrimaryPushButton:
         """创建按钮"""
         btn: PrimaryPushButton = PrimaryPushButton(text, parent)
-        btn.setStyleSheet(style)
+        apply_style(btn, style)
         btn.setMinimumHeight(height)
         btn.clicked.connect(slot)
         layout.addWidget(btn)
@@ -114,12 +156,12 @@ class InputBuilder:
         label_text: str,
         placeholder: str,
         style: str = "",
-        lable_style: str = "",
+        lable_style: str | Style = "",
     ) -> LineEdit:
         """创建输入框"""
         len_layout: QVBoxLayout = QVBoxLayout()
         label: QLabel = QLabel(label_text, parent)
-        label.setStyleSheet(lable_style)
+        apply_style(label, lable_style)
         input_widget: LineEdit = LineEdit(parent)
         input_widget.setPlaceholderText(placeholder)
         len_layout.addWidget(label)
@@ -138,12 +180,12 @@ class SwitchBuilder:
         label_text: str,
         checked: bool = True,
         style: str = "",
-        lable_style: str = "",
+        lable_style: str | Style = "",
     ) -> SwitchButton:
         """创建开关行"""
         len_layout: QHBoxLayout = QHBoxLayout()
         label: QLabel = QLabel(label_text, parent)
-        label.setStyleSheet(lable_style)
+        apply_style(label, lable_style)
         switch = SwitchButton(parent)
         switch.setChecked(checked)
         len_layout.addWidget(label)
@@ -163,12 +205,12 @@ class ComboBoxBuilder:
         items: list[str],
         current_text: Optional[str] = None,
         style: str = "",
-        lable_style: str = "",
+        lable_style: str | Style = "",
     ) -> ModelComboBox:
         """创建下拉框行"""
         len_layout: QHBoxLayout = QHBoxLayout()
         label: QLabel = QLabel(label_text, parent)
-        label.setStyleSheet(lable_style)
+        apply_style(label, lable_style)
         combo: ModelComboBox = ModelComboBox(parent)
         combo.addItems(items)
         if current_text:
@@ -179,7 +221,238 @@ class ComboBoxBuilder:
         return combo
 
 
+class ItemListModel(QAbstractListModel):
+    """字符串列表模型, 批量设置时只对变化的区间发出增删改信号"""
+
+    def __init__(self: Self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.items: List[str] = []
+
+    def rowCount(self: Self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self: Self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole, Qt.ItemDataRole.ToolTipRole):
+            return None
+        return self.items[index.row()]
+
+    def setData(self: Self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or self.items[index.row()] == value:
+            return False
+        self.items[index.row()] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self: Self, index: QModelIndex) -> Qt.ItemFlag:
+        return super().flags(index) | Qt.ItemFlag.ItemIsEditable
+
+    def insert_items(self: Self, row: int, items: List[str]) -> None:
+        """在 row 处插入多行"""
+        if not items:
+            return
+        self.beginInsertRows(QModelIndex(), row, row + len(items) - 1)
+        self.items[row:row] = items
+        self.endInsertRows()
+
+    def remove_items(self: Self, row: int, count: int) -> None:
+        """从 row 起移除 count 行"""
+        if count <= 0:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self.items[row : row + count]
+        self.endRemoveRows()
+
+    def set_items(self: Self, items: List[str]) -> None:
+        """替换全部内容: 保留相同的首尾, 中间区间逐行修改, 多出或缺少的行一次性增删"""
+        old: List[str] = self.items
+        head: int = 0
+        while head < min(len(old), len(items)) and old[head] == items[head]:
+            head += 1
+        tail: int = 0
+        while tail < min(len(old), len(items)) - head and old[-tail - 1] == items[-tail - 1]:
+            tail += 1
+        old_middle: int = len(old) - head - tail
+        new_middle: List[str] = items[head : len(items) - tail]
+        common: int = min(old_middle, len(new_middle))
+        if common:
+            self.items[head : head + common] = new_middle[:common]
+            self.dataChanged.emit(self.index(head), self.index(head + common - 1))
+        self.remove_items(head + common, old_middle - common)
+        self.insert_items(head + common, new_middle[common:])
+
+
+class ItemDelegate(ListItemDelegate):
+    """空行显示占位文本, 编辑器中粘贴多行时拆分为多行"""
+
+    def __init__(self: Self, view: "ItemListView", placeholder: str) -> None:
+        super().__init__(view)
+        self.view: ItemListView = view
+        self.placeholder: str = placeholder
+
+    def initStyleOption(self: Self, option: QStyleOptionViewItem, index: QModelIndex) -> None:
+        super().initStyleOption(option, index)
+        if not index.data(Qt.ItemDataRole.EditRole):
+            option.text = self.placeholder
+            option.palette.setColor(QPalette.ColorRole.Text, QColor(150, 150, 150))
+
+    def createEditor(self: Self, parent: QWidget, option: QStyleOptionViewItem, index: QModelIndex) -> QWidget:
+        editor: QWidget = super().createEditor(parent, option, index)
+        if isinstance(editor, LineEdit):
+            editor.setText(index.data(Qt.ItemDataRole.EditRole))
+            editor.setPlaceholderText(self.placeholder)
+            editor.installEventFilter(self)
+        return editor
+
+    def eventFilter(self: Self, watched: QObject, event: QEvent) -> bool:
+        if isinstance(watched, LineEdit) and isinstance(event, QKeyEvent) and event.type() == QEvent.Type.KeyPress and event.matches(QKeySequence.StandardKey.Paste):
+            lines: List[str] = paste_lines()
+            if len(lines) > 1:
+                index: QModelIndex = self.view.currentIndex()
+                watched.setText(lines[0])
+                self.commitData.emit(watched)
+                self.closeEditor.emit(watched)
+                self.view.insert_lines(index.row() + 1, lines[1:])
+                return True
+        return super().eventFilter(watched, event)
+
+
+def paste_lines() -> List[str]:
+    """剪贴板中的非空行"""
+    return [line.strip() for line in QApplication.clipboard().text().splitlines() if line.strip()]
+
+
+class ItemListView(ListView):
+    """只为正在编辑的行创建输入框的列表: Delete 移除选中行, Ctrl+V 粘贴多行"""
+
+    # 最多显示的行数, 超出时滚动
+    MAX_VISIBLE_ROWS: int = 12
+
+    def __init__(self: Self, parent: QWidget, model: ItemListModel, placeholder: str) -> None:
+        super().__init__(parent)
+        self.item_model: ItemListModel = model
+        self.setModel(model)
+        self.setItemDelegate(ItemDelegate(self, placeholder))
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.DoubleClicked | QAbstractItemView.EditTrigger.EditKeyPressed | QAbstractItemView.EditTrigger.AnyKeyPressed)
+        # 行高一致, 滚动时无需逐行计算尺寸
+        self.setUniformItemSizes(True)
+        model.rowsInserted.connect(self.update_height)
+        model.rowsRemoved.connect(self.update_height)
+        model.modelReset.connect(self.update_height)
+        self.update_height()
+
+    def update_height(self: Self) -> None:
+        """高度随行数变化, 超过 MAX_VISIBLE_ROWS 行后固定并滚动"""
+        rows: int = min(max(self.item_model.rowCount(), 1), self.MAX_VISIBLE_ROWS)
+        row_height: int = self.sizeHintForRow(0) if self.item_model.rowCount() else self.fontMetrics().height() + 14
+        self.setFixedHeight(rows * row_height + 2 * self.frameWidth() + 4)
+
+    def selected_rows(self: Self) -> List[int]:
+        return sorted({index.row() for index in self.selectedIndexes()})
+
+    def remove_selected(self: Self) -> None:
+        """移除选中的行, 连续的行一次移除"""
+        rows: List[int] = self.selected_rows()
+        # 从后往前按连续区间移除, 前面的行号不受影响
+        while rows:
+            end: int = rows.pop()
+            start: int = end
+            while rows and rows[-1] == start - 1:
+                start = rows.pop()
+            self.item_model.remove_items(start, end - start + 1)
+
+    def insert_lines(self: Self, row: int, lines: List[str]) -> None:
+        """在 row 处插入多行并选中它们"""
+        self.item_model.insert_items(row, lines)
+        self.scrollTo(self.item_model.index(row + len(lines) - 1))
+        self.setCurrentIndex(self.item_model.index(row + len(lines) - 1))
+
+    def keyPressEvent(self: Self, event: QKeyEvent) -> None:
+        if self.state() != QAbstractItemView.State.EditingState:
+            if event.key() == Qt.Key.Key_Delete:
+                self.remove_selected()
+                return
+            if event.matches(QKeySequence.StandardKey.Paste):
+                if lines := paste_lines():
+                    self.insert_lines(self.currentIndex().row() + 1 if self.currentIndex().isValid() else self.item_model.rowCount(), lines)
+                return
+        super().keyPressEvent(event)
+
+
+class TableModel(QAbstractTableModel):
+    """只读表格模型: 每个单元格为 (显示文本, 排序键), 替换内容时整体重置"""
+
+    def __init__(self: Self, headers: List[str], parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.headers: List[str] = headers
+        self.rows: List[List[Tuple[str, Any]]] = []
+
+    def rowCount(self: Self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self: Self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self: Self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self: Self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        text, key = self.rows[index.row()][index.column()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return text
+        if role == SORT_ROLE:
+            return key
+        return None
+
+    def set_rows(self: Self, rows: List[List[Tuple[str, Any]]]) -> None:
+        """替换全部行"""
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+
+class SortableTableView(TableView):
+    """可排序的只读表格: 视图只绘制可见行, 点击表头按排序键(如字节数)而非显示文本排序"""
+
+    def __init__(self: Self, parent: QWidget, headers: List[str]) -> None:
+        super().__init__(parent)
+        self.table_model: TableModel = TableModel(headers, parent)
+        self.proxy_model: QSortFilterProxyModel = QSortFilterProxyModel(parent)
+        self.proxy_model.setSourceModel(self.table_model)
+        self.proxy_model.setSortRole(SORT_ROLE)
+        self.setModel(self.proxy_model)
+        self.setSortingEnabled(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.verticalHeader().hide()
+
+    def set_rows(self: Self, rows: List[List[Tuple[str, Any]]]) -> None:
+        """替换全部行, 保持当前的排序列与方向"""
+        self.table_model.set_rows(rows)
+
+
+class TableBuilder:
+    """可排序表格构建器"""
+
+    @staticmethod
+    def create(
+        parent: QWidget,
+        layout: QVBoxLayout | QHBoxLayout,
+        headers: List[str],
+        min_height: int = 200,
+    ) -> SortableTableView:
+        table: SortableTableView = SortableTableView(parent, headers)
+        table.setMinimumHeight(min_height)
+        layout.addWidget(table)
+        return table
+
+
 class DynamicInputContainer:
+    """可增删的字符串列表: 模型保存内容, 视图只绘制可见行, 双击或键入时才为该行创建输入框"""
+
     def __init__(
         self: Self,
         parent: QWidget,
@@ -189,69 +462,163 @@ class DynamicInputContainer:
         self.parent: QWidget = parent
         self.placeholder: str = placeholder
         self.container_layout: QVBoxLayout = QVBoxLayout()
-        self.rows: List[QHBoxLayout] = []
+        self.model: ItemListModel = ItemListModel(parent)
+        self.view: ItemListView = ItemListView(parent, self.model, placeholder)
+        self.view.setToolTip("双击编辑, Delete 移除选中行, Ctrl+V 粘贴多行")
+        self.container_layout.addWidget(self.view)
+        self.remove_btn: PushButton = PushButton("移除选中", parent)
+        apply_style(self.remove_btn, red_style)
+        self.remove_btn.clicked.connect(self.view.remove_selected)
+        self.container_layout.addWidget(self.remove_btn)
+        # 内容变化回调, 批量设置期间暂停
+        self.listeners: List[Callable[[], None]] = []
+        self.updating: bool = False
+        for signal in [self.model.dataChanged, self.model.rowsInserted, self.model.rowsRemoved, self.model.modelReset]:
+            signal.connect(lambda *_: self._notify())
         layout.addLayout(self.container_layout)
 
+    def add_listener(self: Self, listener: Callable[[], None]) -> None:
+        """注册内容变化回调(增删行与编辑文本)"""
+        self.listeners.append(listener)
+
+    def _notify(self: Self) -> None:
+        if self.updating:
+            return
+        for listener in self.listeners:
+            listener()
+
     def add_row(self: Self, text: str = "") -> None:
-        """添加一行输入框"""
-        row_layout: QHBoxLayout = self._create_row_layout(text)
-        self.container_layout.addLayout(row_layout)
-        self.rows.append(row_layout)
-
-    def _create_row_layout(self: Self, text: str) -> QHBoxLayout:
-        """创建单行布局"""
-        row_layout: QHBoxLayout = QHBoxLayout()
-        input_widget: LineEdit = LineEdit(self.parent)
-        input_widget.setPlaceholderText(self.placeholder)
-        input_widget.setText(text)
-        remove_btn: PushButton = PushButton("移除", self.parent)
-        remove_btn.setStyleSheet(red_style.get_button_style())
-        remove_btn.clicked.connect(lambda: self.remove_row(row_layout))
-        row_layout.addWidget(input_widget)
-        row_layout.addWidget(remove_btn)
-        return row_layout
-
-    def remove_row(self: Self, row_layout: QHBoxLayout) -> None:
+        """添加一行, 空行直接进入编辑"""
+        row: int = self.model.rowCount()
+        self.model.insert_items(row, [text])
+        index: QModelIndex = self.model.index(row)
+        self.view.scrollTo(index)
+        self.view.setCurrentIndex(index)
+        if not text:
+            self.view.edit(index)
+
+    def remove_row(self: Self, row: int) -> None:
         """移除指定行"""
-        self.container_layout.removeItem(row_layout)
-        self._clear_layout(row_layout)
-        self.rows.remove(row_layout)
+        self.model.remove_items(row, 1)
 
     def clear_all(self: Self) -> None:
         """清空所有行"""
-        while self.rows:
-            row: QHBoxLayout = self.rows.pop()
-            self.container_layout.removeItem(row)
-            self._clear_layout(row)
-
-    def _clear_layout(self: Self, layout: QLayout) -> None:
-        """递归清除布局中的所有部件"""
-        while layout.count():
-            item: QLayoutItem = layout.takeAt(0)
-            if widget := item.widget():
-                if widget:
-                    widget.deleteLater()
-                else:
-                    sub_layout: QLayout = item.layout()
-                    if sub_layout:
-                        self._clear_layout(sub_layout)
+        self.model.remove_items(0, self.model.rowCount())
 
     def set_items(self: Self, items: list[str]) -> None:
-        """设置容器内容"""
-        self.clear_all()
-        for item in items:
-            self.add_row(item)
+        """设置容器内容: 只更新与当前内容不同的行, 内容不变时不触发回调"""
+        items = list(items)
+        if items == self.model.items:
+            return
+        self.updating = True
+        try:
+            self.model.set_items(items)
+        finally:
+            self.updating = False
+        self._notify()
+
+    def _texts(self: Self) -> List[str]:
+        """所有行的原始文本(含空行)"""
+        return list(self.model.items)
 
     def get_items(self: Self) -> list[str]:
-        """获取所有行的文本内容"""
-        items: List[str] = []
-        for row in self.rows:
-            input_widget = row.itemAt(0).widget()
-            if isinstance(input_widget, LineEdit):
-                text = input_widget.text().strip()
-                if text:
-                    items.append(text)
-        return items
+        """获取所有非空行的文本内容"""
+        return [text for text in (item.strip() for item in self.model.items) if text]
+
+
+def connect_changed(widget: Any, callback: Callable[[], None]) -> None:
+    """连接控件的内容变化信号"""
+    if isinstance(widget, DynamicInputContainer):
+        widget.add_listener(callback)
+    elif isinstance(widget, SwitchButton):
+        widget.checkedChanged.connect(lambda _: callback())
+    elif isinstance(widget, ModelComboBox):
+        widget.currentTextChanged.connect(lambda _: callback())
+    else:
+        widget.textChanged.connect(lambda *_: callback())
+
+
+def read_value(widget: Any) -> Any:
+    """读取控件当前的配置值"""
+    if isinstance(widget, DynamicInputContainer):
+        return widget.get_items()
+    if isinstance(widget, SwitchButton):
+        return widget.isChecked()
+    if isinstance(widget, ModelComboBox):
+        return widget.currentText()
+    return widget.text().strip()
+
+
+def write_value(widget: Any, value: Any) -> None:
+    """将配置值写入控件"""
+    if isinstance(widget, DynamicInputContainer):
+        widget.set_items(value)
+    elif isinstance(widget, SwitchButton):
+        widget.setChecked(value)
+    elif isinstance(widget, ModelComboBox):
+        widget.setCurrentText(value)
+    else:
+        widget.setText(value)
+
+
+class AutoSaver(QObject):
+    """记录被修改的配置项, 停止修改一段时间后只保存这些项
+
+    save 回调接收 {配置段: {配置项}}"""
+
+    def __init__(self: Self, parent: QWidget, save: Callable[[Dict[str, Set[str]]], None], delay: int = AUTOSAVE_DELAY) -> None:
+        super().__init__(parent)
+        self.save: Callable[[Dict[str, Set[str]]], None] = save
+        self.dirty: Dict[str, Set[str]] = {}
+        # (配置段, 配置项) -> 控件
+        self.widgets: Dict[Tuple[str, str], List[Any]] = {}
+        self.loading: bool = False
+        self.timer: QTimer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.flush)
+
+    def watch(self: Self, section: str, key: str, widget: Any) -> None:
+        """控件修改时将 section.key 标记为待保存"""
+        self.widgets.setdefault((section, key), []).append(widget)
+        connect_changed(widget, lambda: self.mark(section, key))
+
+    def mark(self: Self, section: str, key: str) -> None:
+        """标记修改并重新开始计时, 加载配置期间忽略"""
+        if self.loading:
+            return
+        self.dirty.setdefault(section, set()).add(key)
+        self.timer.start()
+
+    @contextmanager
+    def suspend(self: Self) -> Iterator[None]:
+        """程序写入控件(加载配置)期间不标记修改"""
+        self.loading = True
+        try:
+            yield
+        finally:
+            self.loading = False
+
+    def discard(self: Self, section: str, key: str) -> None:
+        """丢弃单项待保存的修改"""
+        keys: Set[str] = self.dirty.get(section, set())
+        keys.discard(key)
+        if not keys:
+            self.dirty.pop(section, None)
+
+    def reset(self: Self) -> None:
+        """丢弃待保存的修改(已完整保存时)"""
+        self.timer.stop()
+        self.dirty = {}
+
+    def flush(self: Self) -> bool:
+        """立即保存待保存的修改, 没有修改时返回 False"""
+        self.timer.stop()
+        if not self.dirty:
+            return False
+        dirty, self.dirty = self.dirty, {}
+        self.save(dirty)
+        return True
 
 
 class MessageDisplay:
@@ -283,6 +650,14 @@ class MessageDisplay:
             parent=parent,
         )
 
+    @staticmethod
+    def confirm(parent: Any, title: str, message: str, yes_text: str = "确定", cancel_text: str = "取消") -> bool:
+        """模态确认框, 返回是否选择了确定"""
+        box: MessageBox = MessageBox(title, message, parent.window())
+        box.yesButton.setText(yes_text)
+        box.cancelButton.setText(cancel_text)
+        return bool(box.exec())
+
     @staticmethod
     def success(parent: Any, message: str) -> None:
         """显示成功提示"""
@@ -295,3 +670,96 @@ class MessageDisplay:
             duration=3000,
             parent=parent,
         )
+
+
+class JobNotifier(QObject):
+    """将进程管理器在工作线程中的状态回调转发到 GUI 线程"""
+
+    # 信号: 任务
+    changed: Signal = Signal(object)
+
+    def __init__(self: Self) -> None:
+        super().__init__()
+        process_util.process_manager.add_listener(self.changed.emit)
+
+
+_job_notifier: Optional[JobNotifier] = None
+
+
+def get_job_notifier() -> JobNotifier:
+    """获取全局任务通知器(需在 GUI 线程中首次调用)"""
+
+    global _job_notifier
+    if _job_notifier is None:
+        _job_notifier = JobNotifier()
+    return _job_notifier
+
+
+class ConsolePanel:
+    """任务输出控制台: 后台线程写入待显示队列, 定时器按上限频率批量刷新"""
+
+    # 刷新间隔(毫秒), 即最多每秒刷新 10 次
+    REFRESH_INTERVAL: int = 100
+
+    def __init__(
+        self: Self,
+        parent: QWidget,
+        layout: QVBoxLayout | QHBoxLayout,
+        group: str,
+        max_lines: Optional[int] = None,
+    ) -> None:
+        self.group: str = group
+        self.max_lines: int = max_lines or process_util.process_manager.max_lines
+        # 待显示的行, 超过容量时丢弃最旧的行, 避免界面追不上输出
+        self.pending: Deque[str] = deque(maxlen=self.max_lines)
+        self.lock: threading.Lock = threading.Lock()
+        self.status_label: QLabel = QLabel("暂无任务", parent)
+        self.text_edit: PlainTextEdit = PlainTextEdit(parent)
+        self.text_edit.setReadOnly(True)
+        self.text_edit.setMaximumBlockCount(self.max_lines)
+        self.text_edit.setMinimumHeight(240)
+        self.text_edit.setLineWrapMode(PlainTextEdit.LineWrapMode.NoWrap)
+        btn_layout: QHBoxLayout = QHBoxLayout()
+        btn_layout.addWidget(self.status_label)
+        btn_layout.addStretch()
+        self.clear_btn: PushButton = PushButton("清空", parent)
+        self.clear_btn.clicked.connect(self.clear)
+        btn_layout.addWidget(self.clear_btn)
+        layout.addLayout(btn_layout)
+        layout.addWidget(self.text_edit)
+        self.timer: QTimer = QTimer(parent)
+        self.timer.setInterval(self.REFRESH_INTERVAL)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start()
+        process_util.process_manager.add_output_listener(self.on_output)
+        get_job_notifier().changed.connect(self.on_job_changed)
+
+    def on_output(self: Self, job: process_util.Job, line: str) -> None:
+        """读取线程回调: 只入队, 不触碰界面"""
+
+        if job.group == self.group:
+            with self.lock:
+                self.pending.append(line)
+
+    def on_job_changed(self: Self, job: process_util.Job) -> None:
+        """任务状态变化时更新状态栏"""
+
+        if job.group == self.group:
+            self.status_label.setText(process_util.format_job(job))
+
+    def flush(self: Self) -> None:
+        """将积压的输出一次性追加到文本框"""
+
+        if not self.pending:
+            return
+        with self.lock:
+            lines: List[str] = list(self.pending)
+            self.pending.clear()
+        self.text_edit.appendPlainText("\n".join(lines))
+
+    def clear(self: Self) -> None:
+        """清空控制台"""
+
+        with self.lock:
+            self.pending.clear()
+        self.text_edit.clear()
@@ -1,7 +1,46 @@
+# utils/icon_util.py
 from enum import Enum
-from typing import LiteralString
+from typing import Dict, LiteralString, Tuple
+from PySide6.QtCore import QRectF, QResource, QSize, Qt
+from PySide6.QtGui import QPainter, QPixmap
+from PySide6.QtSvg import QSvgRenderer
 from qfluentwidgets import Theme, FluentIconBase
 
+from utils import resource_util, startup_profile_util
+
+
+_registered: bool = False
+# 渲染好的图标: (图标名, 宽, 高, 设备像素比) -> 位图, 导航栏只用到 16x16
+_pixmaps: Dict[Tuple[str, int, int, float], QPixmap] = {}
+
+
+def register_resources() -> None:
+    """首次使用图标时注册资源: 优先加载压缩的 resources/icon.rcc, 不存在时导入生成的 resources/icon.py"""
+
+    global _registered
+    if _registered:
+        return
+    _registered = True
+    with startup_profile_util.measure("注册资源", "资源"):
+        if not QResource.registerResource(str(resource_util.rcc_path)):
+            from resources import icon  # noqa: F401
+
+
+def get_pixmap(icon: "FluentIcon", size: QSize, ratio: float) -> QPixmap:
+    """取图标在指定尺寸下的位图, 每个尺寸只解析渲染一次 SVG"""
+
+    key: Tuple[str, int, int, float] = (icon.value, size.width(), size.height(), ratio)
+    pixmap: QPixmap | None = _pixmaps.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(size * ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter: QPainter = QPainter(pixmap)
+        QSvgRenderer(icon.path()).render(painter)
+        painter.end()
+        pixmap.setDevicePixelRatio(ratio)
+        _pixmaps[key] = pixmap
+    return pixmap
+
 
 class FluentIcon(FluentIconBase, Enum):
     CONDA = "Conda"
@@ -10,4 +49,13 @@ class FluentIcon(FluentIconBase, Enum):
     UV = "UV"
 
     def path(self, theme=Theme.AUTO) -> LiteralString:
+        register_resources()
         return f":/icons/{self.value}.svg"
+
+    def render(self, painter, rect, theme=Theme.AUTO, indexes=None, **attributes) -> None:
+        # 修改了填充色等属性时需要改写 SVG, 交给基类逐次渲染
+        if attributes:
+            return super().render(painter, rect, theme, indexes, **attributes)
+        target: QRectF = QRectF(rect)
+        pixmap: QPixmap = get_pixmap(self, target.size().toSize(), painter.device().devicePixelRatioF())
+        painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
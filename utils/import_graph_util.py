@@ -0,0 +1,503 @@
+# utils/import_graph_util.py
+import os
+import ast
+import json
+import time
+import fnmatch
+import hashlib
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Self, Set, Tuple
+
+from utils.platform_util import is_windows
+from utils.build_history_util import format_bytes
+from utils.build_cache_util import find_site_packages
+
+
+# 缓存格式版本, 修改解析结果格式时递增以废弃旧缓存
+CACHE_VERSION: int = 2
+# 解析结果缓存文件(按文件内容摘要索引)
+cache_path: Path = Path.cwd() / ".ouroboros" / "import_cache.json"
+# 经验值: Nuitka 编译后的体积约为 Python 源码的数倍
+COMPILED_SIZE_FACTOR: float = 4.0
+# 扩展模块后缀
+EXTENSION_SUFFIXES: Tuple[str, ...] = (".so", ".pyd")
+# 视为测试代码的包名
+TEST_PACKAGE_NAMES: Tuple[str, ...] = ("tests", "test", "testing")
+# 待解析文件少于该数量时不启动进程池
+POOL_THRESHOLD: int = 64
+# 最多评估的排除候选数(按自身体积取最大的若干个)
+MAX_CANDIDATES: int = 40
+# 预计节省小于该值的建议不显示
+MIN_SAVING: int = 512 * 1024
+# 报告中显示的最大包数
+TOP_PACKAGES: int = 15
+# 入口文件的模块名
+MAIN_MODULE: str = "__main__"
+
+
+class ImportVisitor(ast.NodeVisitor):
+    """收集导入语句, 区分可选导入(捕获 ImportError 的 try 中)并跳过 TYPE_CHECKING 分支
+
+    函数内的延迟导入在调用时必然执行, 仍视为必需导入"""
+
+    def __init__(self: Self) -> None:
+        # [模块名, 相对层级, 导入名列表, 是否可选]
+        self.imports: List[List[Any]] = []
+        # importlib.import_module(f"pkg.{name}") 这类无法静态确定的导入的包前缀
+        self.dynamic: List[str] = []
+        self.optional_depth: int = 0
+
+    def visit_Try(self: Self, node: ast.Try) -> None:
+        guarded: bool = any(self.catches_import_error(handler.type) for handler in node.handlers)
+        if guarded:
+            self.optional_depth += 1
+        for statement in node.body:
+            self.visit(statement)
+        if guarded:
+            self.optional_depth -= 1
+        for statement in [*node.handlers, *node.orelse, *node.finalbody]:
+            self.visit(statement)
+
+    visit_TryStar = visit_Try
+
+    @staticmethod
+    def catches_import_error(handler_type: Optional[ast.expr]) -> bool:
+        """except 子句是否会捕获 ImportError"""
+
+        if handler_type is None:
+            return True
+        names: List[ast.expr] = list(handler_type.elts) if isinstance(handler_type, ast.Tuple) else [handler_type]
+        for name in names:
+            identifier: str = name.id if isinstance(name, ast.Name) else name.attr if isinstance(name, ast.Attribute) else ""
+            if identifier in ("ImportError", "ModuleNotFoundError", "Exception", "BaseException"):
+                return True
+        return False
+
+    def visit_If(self: Self, node: ast.If) -> None:
+        # 仅类型检查时导入的模块运行时不会加载
+        test: ast.expr = node.test
+        if (isinstance(test, ast.Name) and test.id == "TYPE_CHECKING") or (isinstance(test, ast.Attribute) and test.attr == "TYPE_CHECKING"):
+            for statement in node.orelse:
+                self.visit(statement)
+            return
+        self.generic_visit(node)
+
+    def visit_Import(self: Self, node: ast.Import) -> None:
+        for alias in node.names:
+            self.imports.append([alias.name, 0, [], self.optional_depth > 0])
+
+    def visit_ImportFrom(self: Self, node: ast.ImportFrom) -> None:
+        self.imports.append([node.module or "", node.level, [alias.name for alias in node.names], self.optional_depth > 0])
+
+    def visit_Call(self: Self, node: ast.Call) -> None:
+        func: ast.expr = node.func
+        name: str = func.attr if isinstance(func, ast.Attribute) else func.id if isinstance(func, ast.Name) else ""
+        if name in ("import_module", "__import__") and node.args:
+            argument: ast.expr = node.args[0]
+            if isinstance(argument, ast.Constant) and isinstance(argument.value, str):
+                self.imports.append([argument.value, 0, [], self.optional_depth > 0])
+            elif prefix := self.constant_prefix(argument):
+                self.dynamic.append(prefix)
+        self.generic_visit(node)
+
+    @staticmethod
+    def constant_prefix(node: ast.expr) -> str:
+        """取出 f"pkg.{x}" 或 "pkg." + x 中确定的包名部分"""
+
+        text: str = ""
+        if isinstance(node, ast.JoinedStr) and node.values and isinstance(node.values[0], ast.Constant):
+            text = str(node.values[0].value)
+        elif isinstance(node, ast.BinOp) and isinstance(node.op, ast.Add) and isinstance(node.left, ast.Constant) and isinstance(node.left.value, str):
+            text = node.left.value
+        return text.rsplit(".", 1)[0] if "." in text else ""
+
+
+def parse_source(path: str) -> Dict[str, List[Any]]:
+    """解析单个源文件的导入(在进程池中执行)"""
+
+    visitor: ImportVisitor = ImportVisitor()
+    try:
+        with open(path, "rb") as f:
+            visitor.visit(ast.parse(f.read(), filename=path))
+    except (SyntaxError, ValueError, OSError, RecursionError):
+        pass
+    return {"imports": visitor.imports, "dynamic": visitor.dynamic}
+
+
+def digest_file(path: Path) -> str:
+    """计算文件内容摘要"""
+
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def is_blocked(name: str, patterns: Iterable[str]) -> bool:
+    """模块或其任一父包是否匹配 --nofollow-import-to 的模式"""
+
+    parts: List[str] = name.split(".")
+    prefixes: List[str] = [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+    return any(fnmatch.fnmatchcase(prefix, pattern) for pattern in patterns for prefix in prefixes)
+
+
+class ModuleFinder:
+    """在项目目录与 site-packages 中查找模块文件, 缓存目录列表以减少文件系统访问"""
+
+    def __init__(self: Self, roots: List[Path]) -> None:
+        self.roots: List[Path] = roots
+        self.listings: Dict[Path, Set[str]] = {}
+        self.found: Dict[str, Optional[Tuple[Path, bool]]] = {}
+
+    def listdir(self: Self, directory: Path) -> Set[str]:
+        if directory not in self.listings:
+            try:
+                self.listings[directory] = set(os.listdir(directory))
+            except OSError:
+                self.listings[directory] = set()
+        return self.listings[directory]
+
+    def find(self: Self, name: str) -> Optional[Tuple[Path, bool]]:
+        """返回 (文件路径, 是否为包), 命名空间包返回目录, 找不到(标准库或未安装)时返回 None"""
+
+        if name in self.found:
+            return self.found[name]
+        result: Optional[Tuple[Path, bool]] = None
+        namespace: Optional[Path] = None
+        parts: List[str] = name.split(".")
+        for root in self.roots:
+            directory: Path = root.joinpath(*parts[:-1])
+            names: Set[str] = self.listdir(directory)
+            last: str = parts[-1]
+            if last in names and "__init__.py" in self.listdir(directory / last):
+                result = (directory / last / "__init__.py", True)
+            elif f"{last}.py" in names:
+                result = (directory / f"{last}.py", False)
+            elif extension := next((n for n in names if n.startswith(f"{last}.") and n.endswith(EXTENSION_SUFFIXES)), None):
+                result = (directory / extension, False)
+            elif last in names and namespace is None and (directory / last).is_dir():
+                namespace = directory / last
+            if result:
+                break
+        self.found[name] = result or ((namespace, True) if namespace else None)
+        return self.found[name]
+
+
+class ModuleNode:
+    """导入图中的一个模块"""
+
+    def __init__(self: Self, name: str, path: Path, package: bool) -> None:
+        self.name: str = name
+        self.path: Path = path
+        self.package: bool = package
+        # 目标模块 -> 是否为必需导入(任一处非可选导入即为必需)
+        self.edges: Dict[str, bool] = {}
+        self.dynamic: List[str] = []
+        self.size: int = 0
+
+
+class Proposal:
+    """一条配置建议"""
+
+    def __init__(self: Self, field: str, name: str, size: int, modules: int, reason: str) -> None:
+        # 写入的配置字段: no_imports(--nofollow-import-to) 或 packages(--include-package)
+        self.field: str = field
+        self.name: str = name
+        # 排除建议为预计节省的体积, 包含建议为预计增加的体积
+        self.size: int = size
+        self.modules: int = modules
+        self.reason: str = reason
+
+
+class ImportReport:
+    """导入分析结果"""
+
+    def __init__(self: Self) -> None:
+        self.modules: int = 0
+        self.total_size: int = 0
+        self.parsed: int = 0
+        self.cached: int = 0
+        self.elapsed: float = 0.0
+        self.package_sizes: List[Tuple[str, int]] = []
+        self.proposals: List[Proposal] = []
+
+
+class ImportGraph:
+    """从入口文件出发构建导入图, 并估算各子树的编译体积"""
+
+    def __init__(self: Self, entry: Path, roots: List[Path], no_imports: List[str], extra_modules: List[str]) -> None:
+        self.entry: Path = entry
+        self.finder: ModuleFinder = ModuleFinder(roots)
+        self.no_imports: List[str] = no_imports
+        self.extra_modules: List[str] = extra_modules
+        self.nodes: Dict[str, ModuleNode] = {}
+        self.cache: Dict[str, Any] = {"version": CACHE_VERSION, "files": {}, "parsed": {}}
+        self.parsed: int = 0
+        self.cached: int = 0
+
+    def load_cache(self: Self) -> None:
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cache: Dict[str, Any] = json.load(f)
+        except (OSError, ValueError):
+            return
+        if cache.get("version") == CACHE_VERSION:
+            self.cache = cache
+
+    def save_cache(self: Self) -> None:
+        """只保留本次用到的文件, 避免缓存无限增长"""
+
+        files: Dict[str, List[Any]] = {str(n.path): self.cache["files"][str(n.path)] for n in self.nodes.values() if str(n.path) in self.cache["files"]}
+        digests: Set[str] = {entry[2] for entry in files.values()}
+        cache: Dict[str, Any] = {"version": CACHE_VERSION, "files": files, "parsed": {k: v for k, v in self.cache["parsed"].items() if k in digests}}
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, separators=(",", ":"))
+
+    def roots(self: Self) -> List[str]:
+        return [MAIN_MODULE, *(m for m in self.extra_modules if m in self.nodes)]
+
+    def add_node(self: Self, name: str) -> Optional[ModuleNode]:
+        """登记模块, 被排除、找不到或已登记时返回 None"""
+
+        if name in self.nodes or is_blocked(name, self.no_imports):
+            return None
+        found: Optional[Tuple[Path, bool]] = (self.entry, False) if name == MAIN_MODULE else self.finder.find(name)
+        if not found:
+            return None
+        node: ModuleNode = ModuleNode(name, *found)
+        if node.path.is_file():
+            size: int = node.path.stat().st_size
+            node.size = size if node.path.name.endswith(EXTENSION_SUFFIXES) else int(size * COMPILED_SIZE_FACTOR)
+        self.nodes[name] = node
+        return node
+
+    def parse(self: Self, nodes: List[ModuleNode], executor: Callable[[], Executor]) -> None:
+        """读取一批模块的导入, 按文件状态与内容摘要命中缓存, 未命中的在进程池中解析"""
+
+        files: Dict[str, List[Any]] = self.cache["files"]
+        parsed: Dict[str, Any] = self.cache["parsed"]
+        pending: Dict[str, str] = {}
+        results: Dict[str, Dict[str, List[Any]]] = {}
+        for node in nodes:
+            if not node.path.name.endswith(".py"):
+                continue
+            key: str = str(node.path)
+            stat: os.stat_result = node.path.stat()
+            entry: Optional[List[Any]] = files.get(key)
+            if not entry or entry[0] != stat.st_size or entry[1] != stat.st_mtime_ns:
+                entry = [stat.st_size, stat.st_mtime_ns, digest_file(node.path)]
+                files[key] = entry
+            if entry[2] in parsed:
+                results[key] = parsed[entry[2]]
+                self.cached += 1
+            else:
+                pending[key] = entry[2]
+        if pending:
+            paths: List[str] = list(pending)
+            cpu_count: int = os.cpu_count() or 1
+            # 单核时进程池只有额外开销
+            if len(paths) >= POOL_THRESHOLD and cpu_count > 1:
+                pool: Executor = executor()
+                chunksize: int = max(len(paths) // (cpu_count * 4), 1)
+                outputs: Iterable[Dict[str, List[Any]]] = pool.map(parse_source, paths, chunksize=chunksize)
+            else:
+                outputs = map(parse_source, paths)
+            for path, output in zip(paths, outputs):
+                parsed[pending[path]] = output
+                results[path] = output
+                self.parsed += 1
+        for node in nodes:
+            if output := results.get(str(node.path)):
+                self.link(node, output)
+
+    def link(self: Self, node: ModuleNode, output: Dict[str, List[Any]]) -> None:
+        """将解析出的导入解析为模块名并连边"""
+
+        package_parts: List[str] = [] if node.name == MAIN_MODULE else node.name.split(".") if node.package else node.name.split(".")[:-1]
+        for module, level, names, optional in output["imports"]:
+            if level:
+                if level > len(package_parts) + 1:
+                    continue
+                module = ".".join(package_parts[: len(package_parts) - level + 1] + ([module] if module else []))
+            targets: List[str] = [module] if module else []
+            # from x import y 中的 y 可能是子模块
+            for name in names:
+                full: str = f"{module}.{name}" if module else name
+                if name != "*" and self.finder.find(full):
+                    targets.append(full)
+            for target in targets:
+                parts: List[str] = target.split(".")
+                # 导入子模块会先执行各级父包
+                for i in range(1, len(parts) + 1):
+                    name = ".".join(parts[:i])
+                    node.edges[name] = node.edges.get(name, False) or not optional
+        node.dynamic = output["dynamic"]
+
+    def build(self: Self) -> None:
+        """按层扩展导入图, 每层的待解析文件一次性交给进程池"""
+
+        pool: Optional[ProcessPoolExecutor] = None
+
+        def get_executor() -> Executor:
+            nonlocal pool
+            if pool is None:
+                # 图形界面中存在多个线程, 不直接 fork
+                context = multiprocessing.get_context("spawn" if is_windows() else "forkserver")
+                pool = ProcessPoolExecutor(mp_context=context)
+            return pool
+
+        self.load_cache()
+        try:
+            wave: List[ModuleNode] = [n for n in (self.add_node(name) for name in [MAIN_MODULE, *self.extra_modules]) if n]
+            while wave:
+                self.parse(wave, get_executor)
+                wave = [n for n in (self.add_node(t) for node in wave for t in node.edges) if n]
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        self.save_cache()
+
+    def reachable(self: Self, required_only: bool = False, excluded: Optional[Callable[[str], bool]] = None) -> Set[str]:
+        """从入口(及显式包含的模块)可达的模块"""
+
+        seen: Set[str] = set()
+        stack: List[str] = self.roots()
+        while stack:
+            name: str = stack.pop()
+            if name in seen or name not in self.nodes or (excluded and excluded(name)):
+                continue
+            seen.add(name)
+            stack.extend(t for t, required in self.nodes[name].edges.items() if (required or not required_only) and t not in seen)
+        return seen
+
+    def size_of(self: Self, names: Iterable[str]) -> int:
+        return sum(self.nodes[name].size for name in names)
+
+    def package_sizes(self: Self) -> List[Tuple[str, int]]:
+        """按顶层包汇总的编译体积, 从大到小"""
+
+        sizes: Dict[str, int] = {}
+        for node in self.nodes.values():
+            top: str = node.name.split(".")[0]
+            sizes[top] = sizes.get(top, 0) + node.size
+        return sorted(sizes.items(), key=lambda item: item[1], reverse=True)
+
+    def removed_by(self: Self, excluded: Callable[[str], bool]) -> Set[str]:
+        """排除某些模块后不再被包含的模块"""
+
+        return set(self.nodes) - self.reachable(excluded=excluded)
+
+    def propose(self: Self, packages: List[str]) -> List[Proposal]:
+        """生成排除测试代码、排除仅被可选导入引用的子树、包含动态导入的包的建议"""
+
+        # 候选项 -> (排除后不再包含的模块, 原因)
+        candidates: Dict[str, Tuple[Set[str], str]] = {}
+        # 测试代码
+        for test_name in TEST_PACKAGE_NAMES:
+            pattern: str = f"*.{test_name}"
+            if any(test_name in node.name.split(".")[1:] for node in self.nodes.values()):
+                candidates[pattern] = (self.removed_by(lambda name, p=pattern: is_blocked(name, [p])), "测试代码")
+        # 只经由可选导入(try/except ImportError)到达的子树, 以最短的非必需前缀分组
+        required: Set[str] = self.reachable(required_only=True)
+        groups: Dict[str, int] = {}
+        for node in self.nodes.values():
+            if node.name in required:
+                continue
+            parts: List[str] = node.name.split(".")
+            prefix: str = next(p for p in (".".join(parts[:i]) for i in range(1, len(parts) + 1)) if p not in required)
+            groups[prefix] = groups.get(prefix, 0) + node.size
+        for prefix in sorted(groups, key=lambda p: groups[p], reverse=True)[:MAX_CANDIDATES]:
+            candidates[prefix] = (self.removed_by(lambda name, p=prefix: name == p or name.startswith(f"{p}.")), "仅被可选导入引用")
+        # 入口文件直接导入的模块不能排除, 否则程序无法启动
+        direct: List[str] = list(self.nodes[MAIN_MODULE].edges) if MAIN_MODULE in self.nodes else []
+        # 从节省最多的开始, 跳过已被更大的建议覆盖的候选项
+        proposals: List[Proposal] = []
+        covered: Set[str] = set()
+        for name, (removed, reason) in sorted(candidates.items(), key=lambda item: self.size_of(item[1][0]), reverse=True):
+            if any(is_blocked(module, [name]) for module in direct):
+                continue
+            size: int = self.size_of(removed - covered)
+            if size >= MIN_SAVING:
+                proposals.append(Proposal("no_imports", name, size, len(removed - covered), reason))
+                covered |= removed
+        # 动态导入的包: Nuitka 无法静态跟随, 需要整包包含
+        dynamic: Set[str] = {prefix for node in self.nodes.values() for prefix in node.dynamic}
+        for prefix in sorted(dynamic):
+            found: Optional[Tuple[Path, bool]] = self.finder.find(prefix)
+            if not found or not found[1] or prefix in packages or is_blocked(prefix, self.no_imports):
+                continue
+            added, count = package_disk_size(found[0] if found[0].is_dir() else found[0].parent)
+            proposals.append(Proposal("packages", prefix, added, count, "存在动态导入"))
+        return proposals
+
+
+def package_disk_size(directory: Path) -> Tuple[int, int]:
+    """估算整包包含时的编译体积与模块数"""
+
+    size: int = 0
+    count: int = 0
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename.endswith(".py"):
+                size += int(os.path.getsize(os.path.join(dirpath, filename)) * COMPILED_SIZE_FACTOR)
+                count += 1
+            elif filename.endswith(EXTENSION_SUFFIXES):
+                size += os.path.getsize(os.path.join(dirpath, filename))
+                count += 1
+    return size, count
+
+
+def analyze(nuitka_config: Dict[str, Any], python_path: str, root: Optional[Path] = None) -> ImportReport:
+    """分析入口文件的导入图并生成 no_imports / packages 建议"""
+
+    start: float = time.perf_counter()
+    root = (root or Path.cwd()).resolve()
+    entry: Path = (root / nuitka_config.get("entry", "main.py")).resolve()
+    if not entry.is_file():
+        raise FileNotFoundError(f"未找到入口文件: {entry}")
+    # 入口所在目录优先, 与运行时 sys.path[0] 一致
+    roots: List[Path] = list(dict.fromkeys([entry.parent, root, *(p.resolve() for p in find_site_packages(Path(python_path)))]))
+    packages: List[str] = list(nuitka_config.get("packages", []))
+    graph: ImportGraph = ImportGraph(entry, roots, list(nuitka_config.get("no_imports", [])), packages + list(nuitka_config.get("modules", [])))
+    graph.build()
+    report: ImportReport = ImportReport()
+    report.modules = len(graph.nodes)
+    report.total_size = graph.size_of(graph.nodes)
+    report.parsed = graph.parsed
+    report.cached = graph.cached
+    report.package_sizes = graph.package_sizes()[:TOP_PACKAGES]
+    report.proposals = graph.propose(packages)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def apply_proposals(nuitka_config: Dict[str, Any], proposals: List[Proposal]) -> List[Proposal]:
+    """将建议追加到配置中, 返回实际新增的建议"""
+
+    applied: List[Proposal] = []
+    for proposal in proposals:
+        items: List[str] = list(nuitka_config.get(proposal.field, []))
+        if proposal.name not in items:
+            nuitka_config[proposal.field] = items + [proposal.name]
+            applied.append(proposal)
+    return applied
+
+
+def format_report(report: ImportReport) -> str:
+    """格式化分析结果"""
+
+    lines: List[str] = [
+        f"可达模块 {report.modules} 个, 预计编译体积 {format_bytes(report.total_size)}, 解析 {report.parsed} 个文件, 缓存命中 {report.cached} 个, 耗时 {report.elapsed:.1f}s",
+        "体积最大的包:",
+    ]
+    lines.extend(f"  {name}: {format_bytes(size)}" for name, size in report.package_sizes)
+    if not report.proposals:
+        lines.append("没有建议")
+        return "\n".join(lines)
+    lines.append("建议:")
+    for proposal in report.proposals:
+        option: str = "--nofollow-import-to" if proposal.field == "no_imports" else "--include-package"
+        effect: str = "节省" if proposal.field == "no_imports" else "增加"
+        lines.append(f"  {option}={proposal.name}  {effect} {format_bytes(proposal.size)} / {proposal.modules} 个模块 ({proposal.reason})")
+    return "\n".join(lines)
@@ -0,0 +1,173 @@
+# utils/inventory_util.py
+import re
+import csv
+import json
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Self, Set, Tuple
+
+from utils.python_path_util import dir_mtime
+from utils.build_history_util import format_bytes
+
+
+# 并行读取包元数据的线程数
+INVENTORY_WORKERS: int = 8
+# 显式 conda spec 的文件名(conda create --file 可直接使用)
+SPEC_FILE_NAME: str = "spec-file.txt"
+# 与 pip freeze 一致, 不导出到 requirements.txt 的包
+FREEZE_EXCLUDES: Set[str] = {"pip"}
+
+
+def normalize_name(name: str) -> str:
+    """PEP 503 规范化的包名, 用于比较 dist-info 与 conda 记录"""
+
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+class Package:
+    """已安装的包: 名称, 版本, 安装者(pip / uv / conda 等), 安装后大小(字节)"""
+
+    def __init__(self: Self, name: str, version: str, installer: str, size: int, record: Optional[Dict[str, Any]] = None) -> None:
+        self.name: str = name
+        self.version: str = version
+        self.installer: str = installer
+        self.size: int = size
+        # conda 包的构建号、渠道、下载地址等, 用于生成显式 spec
+        self.record: Dict[str, Any] = record or {}
+
+    @property
+    def key(self: Self) -> str:
+        return normalize_name(self.name)
+
+
+def read_dist_info(dist_info: Path) -> Optional[Package]:
+    """读取 dist-info(或旧式 egg-info): 元数据头部的名称与版本, INSTALLER, RECORD 中记录的文件大小"""
+
+    name: str = ""
+    version: str = ""
+    try:
+        with open(dist_info / ("PKG-INFO" if dist_info.suffix == ".egg-info" else "METADATA"), encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if not line.strip():
+                    break
+                if line.startswith("Name:"):
+                    name = line.split(":", 1)[1].strip()
+                elif line.startswith("Version:"):
+                    version = line.split(":", 1)[1].strip()
+    except OSError:
+        return None
+    try:
+        installer: str = (dist_info / "INSTALLER").read_text(encoding="utf-8", errors="replace").strip()
+    except OSError:
+        installer = ""
+    size: int = 0
+    try:
+        with open(dist_info / "RECORD", encoding="utf-8", errors="replace", newline="") as f:
+            # 路径,哈希,大小; 字节码等文件没有记录大小
+            size = sum(int(row[2]) for row in csv.reader(f) if len(row) > 2 and row[2].isdigit())
+    except OSError:
+        pass
+    return Package(name, version, installer, size) if name else None
+
+
+def read_conda_record(path: Path) -> Optional[Package]:
+    """读取 conda-meta/<名称>-<版本>-<构建>.json, 大小为安装后的文件大小之和"""
+
+    try:
+        record: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    paths: List[Dict[str, Any]] = record.get("paths_data", {}).get("paths", [])
+    size: int = sum(p.get("size_in_bytes", 0) for p in paths) if paths else record.get("size", 0)
+    spec: Dict[str, Any] = {key: record.get(key, "") for key in ("build", "channel", "url", "md5", "subdir")}
+    return Package(record.get("name", ""), record.get("version", ""), "conda", size, spec)
+
+
+class Inventory:
+    """一个环境的包清单: site-packages 中的 Python 发行包与 conda-meta 中的 conda 包"""
+
+    def __init__(self: Self, prefix: Path, distributions: List[Package], conda_packages: List[Package]) -> None:
+        self.prefix: Path = prefix
+        self.distributions: List[Package] = distributions
+        self.conda_packages: List[Package] = conda_packages
+
+    @property
+    def packages(self: Self) -> List[Package]:
+        """合并的清单: conda 包, 加上不由 conda 安装的 Python 发行包"""
+
+        conda_names: Set[str] = {package.key for package in self.conda_packages}
+        extra: List[Package] = [package for package in self.distributions if package.installer != "conda" and package.key not in conda_names]
+        return sorted(self.conda_packages + extra, key=lambda package: package.key)
+
+    def format_requirements(self: Self) -> str:
+        """requirements.txt: site-packages 中的每个发行包, 格式同 pip freeze"""
+
+        packages: List[Package] = sorted((package for package in self.distributions if package.key not in FREEZE_EXCLUDES), key=lambda package: package.key)
+        return "".join(f"{package.name}=={package.version}\n" for package in packages)
+
+    def format_conda_spec(self: Self) -> str:
+        """显式 conda spec(同 conda list --explicit --md5), 没有 conda 包时为空"""
+
+        records: List[Dict[str, Any]] = [package.record for package in sorted(self.conda_packages, key=lambda package: package.key) if package.record.get("url")]
+        if not records:
+            return ""
+        platform: str = next((record["subdir"] for record in records if record.get("subdir") not in ("", "noarch")), "noarch")
+        lines: List[str] = [f"# platform: {platform}", "@EXPLICIT"]
+        lines.extend(f"{record['url']}#{record['md5']}" if record.get("md5") else record["url"] for record in records)
+        return "\n".join(lines) + "\n"
+
+
+class PackageInventory:
+    """包清单缓存: 按 site-packages 与 conda-meta 目录的修改时间缓存读取结果, 安装或卸载后才重新读取"""
+
+    def __init__(self: Self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        # 目录 -> (修改时间, 读取的包)
+        self.scans: Dict[str, Tuple[Optional[int], List[Package]]] = {}
+
+    def scan(self: Self, directory: Path, patterns: Tuple[str, ...], reader: Any) -> List[Package]:
+        """目录未变化时返回缓存, 否则并行读取其中每个元数据"""
+
+        stamp: Optional[int] = dir_mtime(directory)
+        with self.lock:
+            cached: Optional[Tuple[Optional[int], List[Package]]] = self.scans.get(str(directory))
+        if cached and cached[0] == stamp:
+            return cached[1]
+        paths: List[Path] = sorted(path for pattern in patterns for path in directory.glob(pattern)) if stamp is not None else []
+        with ThreadPoolExecutor(INVENTORY_WORKERS) as executor:
+            packages: List[Package] = [package for package in executor.map(reader, paths) if package]
+        with self.lock:
+            self.scans[str(directory)] = (stamp, packages)
+        return packages
+
+    def get(self: Self, prefix: Path) -> Inventory:
+        """环境前缀(如 .venv、conda 环境目录)的包清单"""
+
+        distributions: List[Package] = []
+        for site_packages in [prefix / "Lib" / "site-packages", *prefix.glob("lib/python*/site-packages")]:
+            if site_packages.is_dir():
+                distributions.extend(self.scan(site_packages, ("*.dist-info", "*.egg-info"), read_dist_info))
+        conda_packages: List[Package] = self.scan(prefix / "conda-meta", ("*.json",), read_conda_record)
+        return Inventory(prefix, distributions, conda_packages)
+
+
+package_inventory: PackageInventory = PackageInventory()
+
+
+def get_rows(inventory: Inventory) -> List[List[Tuple[str, Any]]]:
+    """清单表格的行: 名称, 版本, 安装者, 大小, 每列为 (显示文本, 排序键)"""
+
+    return [
+        [(package.name, package.key), (package.version, package.version), (package.installer or "-", package.installer), (format_bytes(package.size), package.size)]
+        for package in inventory.packages
+    ]
+
+
+def format_summary(inventory: Inventory, duration: float) -> str:
+    """清单摘要: 环境, 包数, 总大小与读取耗时"""
+
+    packages: List[Package] = inventory.packages
+    if not packages:
+        return f"{inventory.prefix}: 未找到已安装的包"
+    return f"{inventory.prefix}: 共 {len(packages)} 个包, {format_bytes(sum(package.size for package in packages))}, 读取耗时 {duration * 1000:.1f}ms"
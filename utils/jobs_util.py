@@ -0,0 +1,122 @@
+# utils/jobs_util.py
+import ctypes
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils import build_history_util
+from utils.platform_util import is_linux, is_windows
+
+
+# 自动并行任务数的配置值
+AUTO_JOBS: str = "Auto"
+# C 编译阶段名(与构建历史一致)
+C_COMPILE_PHASE: str = "C 编译"
+# 没有历史数据时假设每个编译进程占用的内存
+DEFAULT_RSS_PER_JOB: int = 1024 * 1024 * 1024
+# 只使用可用内存的一部分, 给系统与其他进程留余量
+MEMORY_HEADROOM: float = 0.8
+# 增加并行数后 C 编译至少要快这么多才算有效
+MIN_SPEEDUP: float = 0.05
+# 参考的最近构建数
+HISTORY_SIZE: int = 10
+
+
+def get_available_memory() -> Optional[int]:
+    """获取当前可用物理内存(字节), 无法获取时返回 None"""
+
+    if is_linux():
+        try:
+            with open("/proc/meminfo", "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            return None
+    if is_windows():
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status: MemoryStatus = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):  # pyright: ignore[reportAttributeAccessIssue]
+            return int(status.ullAvailPhys)
+        return None
+    if build_history_util.psutil is not None:
+        return int(build_history_util.psutil.virtual_memory().available)
+    return None
+
+
+def get_phase(record: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """取出构建记录中的某个阶段"""
+
+    for phase in record.get("phases", []):
+        if phase["name"] == name:
+            return phase
+    return None
+
+
+def rss_per_job(record: Dict[str, Any]) -> Optional[int]:
+    """由 C 编译阶段的峰值内存估算单个编译进程的内存占用"""
+
+    phase: Optional[Dict[str, Any]] = get_phase(record, C_COMPILE_PHASE)
+    if not phase or not phase.get("peak_rss") or not record.get("jobs"):
+        return None
+    return int(phase["peak_rss"] / record["jobs"])
+
+
+def choose_jobs(profile: str, cpu_count: Optional[int] = None, memory: Optional[int] = None) -> Tuple[int, str]:
+    """根据核心数、可用内存与历史 C 编译耗时选择并行任务数, 返回 (任务数, 原因)"""
+
+    cores: int = cpu_count or multiprocessing.cpu_count()
+    records: List[Dict[str, Any]] = build_history_util.load_history(profile, HISTORY_SIZE)
+    memory = memory if memory is not None else get_available_memory()
+    # 内存上限: 取近期观测到的最大单进程占用, 保守估计
+    observed: List[int] = [rss for r in records if (rss := rss_per_job(r))]
+    per_job: int = max(observed) if observed else DEFAULT_RSS_PER_JOB
+    memory_cap: int = max(int(memory * MEMORY_HEADROOM / per_job), 1) if memory else cores
+    limit: int = max(min(cores, memory_cap), 1)
+    reasons: List[str] = [
+        f"{cores} 核",
+        f"可用内存 {build_history_util.format_bytes(memory)}" if memory else "可用内存未知",
+        f"单编译进程 {build_history_util.format_bytes(per_job)}{'(观测)' if observed else '(默认)'}",
+    ]
+    # 只参考自动模式下成功且有 C 编译阶段的构建
+    auto_records: List[Dict[str, Any]] = [r for r in records if r.get("jobs_auto") and r.get("returncode") == 0 and get_phase(r, C_COMPILE_PHASE)]
+    # 相邻两次并行数不同的构建: 较少并行数不明显变慢, 说明更高的并行数没有收益
+    ceiling: Optional[int] = None
+    compared: bool = False
+    for a, b in zip(auto_records, auto_records[1:]):
+        if a["jobs"] == b["jobs"]:
+            continue
+        low, high = sorted((a, b), key=lambda r: r["jobs"])
+        compared = True
+        low_time: float = get_phase(low, C_COMPILE_PHASE)["duration"]  # pyright: ignore[reportOptionalSubscript]
+        high_time: float = get_phase(high, C_COMPILE_PHASE)["duration"]  # pyright: ignore[reportOptionalSubscript]
+        if low_time <= high_time * (1 + MIN_SPEEDUP):
+            ceiling = min(ceiling or low["jobs"], low["jobs"])
+            reasons.append(f"{low['jobs']} 并行的 C 编译({low_time:.0f}s)不慢于 {high['jobs']} 并行({high_time:.0f}s)")
+    if ceiling:
+        limit = min(limit, ceiling)
+    last_record: List[Dict[str, Any]] = records[-1:]
+    if last_record and last_record[0].get("jobs_auto") and (last_record[0].get("oom") or last_record[0].get("returncode") in (-9, 137)):
+        jobs: int = max(min(last_record[0]["jobs"] // 2, limit), 1)
+        reasons.append(f"上次构建疑似被 OOM 终止, 并行数减半为 {jobs}")
+    elif not compared and len(auto_records) >= 2 and auto_records[-1]["jobs"] == limit and limit > 1:
+        # 连续以上限运行且没有对照数据, 试探较低的并行数
+        jobs = max(limit * 3 // 4, 1)
+        reasons.append(f"试探 {jobs} 并行以对比 C 编译耗时")
+    else:
+        jobs = limit
+        reasons.append(f"取上限 {jobs}")
+    return jobs, ", ".join(reasons)
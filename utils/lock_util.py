@@ -0,0 +1,251 @@
+# utils/lock_util.py
+import sys
+import json
+import hashlib
+import platform
+import threading
+import tomllib
+from pathlib import Path
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Self, Set, Tuple
+
+from utils.config_util import ConfigStore, atomic_write
+
+
+# uv 的锁文件
+lock_path: Path = Path.cwd() / "uv.lock"
+# 索引缓存: 锁文件内容摘要未变时直接读取, 不再解析 TOML
+index_path: Path = Path.cwd() / ".ouroboros" / "lock_index.json"
+# 索引格式版本, 修改格式时递增以废弃旧索引
+INDEX_VERSION: int = 1
+# "为何安装"最多列出的依赖链数
+MAX_CHAINS: int = 20
+
+
+def get_platform() -> str:
+    """当前平台, 轮子大小按平台选择, 索引随平台区分"""
+
+    return f"{sys.platform}-{platform.machine().lower()}"
+
+
+def is_compatible(wheel: str) -> bool:
+    """按文件名中的平台标签粗略判断轮子能否在当前平台安装"""
+
+    tag: str = wheel.removesuffix(".whl").rsplit("-", 1)[-1]
+    if tag == "any":
+        return True
+    machine: str = platform.machine().lower()
+    if sys.platform == "win32":
+        return ("win_amd64" in tag) if machine in ("amd64", "x86_64") else ("win_arm64" in tag if machine == "arm64" else "win32" in tag)
+    if sys.platform == "darwin":
+        return "macosx" in tag and (machine in tag or "universal" in tag)
+    return "linux" in tag and machine in tag
+
+
+def pick_size(package: Dict[str, Any]) -> int:
+    """包在当前平台的下载大小: 兼容轮子中最大的一个, 有轮子但都不兼容时为 0(不会安装), 没有轮子时为源码包大小"""
+
+    wheels: List[Dict[str, Any]] = package.get("wheels", [])
+    if wheels:
+        sizes: List[int] = [wheel.get("size", 0) for wheel in wheels if is_compatible(wheel.get("url", wheel.get("path", "")).rsplit("/", 1)[-1])]
+        return max(sizes, default=0)
+    return package.get("sdist", {}).get("size", 0)
+
+
+class LockIndex:
+    """uv.lock 的索引: 包按编号存储, 正向与反向依赖表, 查询结果按编号缓存"""
+
+    def __init__(self: Self, names: List[str], versions: List[str], sizes: List[int], deps: List[List[Any]], roots: List[int]) -> None:
+        self.names: List[str] = names
+        self.versions: List[str] = versions
+        self.sizes: List[int] = sizes
+        # 依赖: 编号, 或 [编号, 说明] (marker / extra / 依赖组)
+        self.raw_deps: List[List[Any]] = deps
+        self.deps: List[List[int]] = [[dep if isinstance(dep, int) else dep[0] for dep in entries] for entries in deps]
+        self.roots: List[int] = roots
+        self.ids: Dict[str, List[int]] = {}
+        for i, name in enumerate(names):
+            self.ids.setdefault(name, []).append(i)
+        self.reverse: List[List[int]] = [[] for _ in names]
+        for i, targets in enumerate(self.deps):
+            for target in targets:
+                self.reverse[target].append(i)
+        # 子树(包数, 大小)与根出发的最短路径树, 首次查询时计算
+        self.subtrees: Dict[int, Tuple[int, int]] = {}
+        self.parents: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_lock(cls: Any, data: Dict[str, Any]) -> "LockIndex":
+        packages: List[Dict[str, Any]] = data.get("package", [])
+        names: List[str] = [package["name"] for package in packages]
+        ids: Dict[str, List[int]] = {}
+        for i, name in enumerate(names):
+            ids.setdefault(name, []).append(i)
+
+        def resolve(dep: Dict[str, Any], note: str) -> List[Any]:
+            """依赖项指向的包(同名多版本时按 version 区分)"""
+            targets: List[int] = [i for i in ids.get(dep["name"], []) if "version" not in dep or packages[i]["version"] == dep["version"]]
+            notes: List[str] = [text for text in [note, ", ".join(f"[{extra}]" for extra in dep.get("extra", [])), dep.get("marker", "")] if text]
+            return [[target, "; ".join(notes)] if notes else target for target in targets]
+
+        deps: List[List[Any]] = []
+        for package in packages:
+            entries: List[Any] = []
+            for dep in package.get("dependencies", []):
+                entries.extend(resolve(dep, ""))
+            for extra, items in package.get("optional-dependencies", {}).items():
+                for dep in items:
+                    entries.extend(resolve(dep, f"可选 {extra}"))
+            for group, items in package.get("dev-dependencies", {}).items():
+                for dep in items:
+                    entries.extend(resolve(dep, f"依赖组 {group}"))
+            deps.append(entries)
+        # 项目本身(及工作区成员)为根
+        roots: List[int] = [i for i, package in enumerate(packages) if {"virtual", "editable"} & set(package.get("source", {}))]
+        return cls(names, [package.get("version", "") for package in packages], [pick_size(package) for package in packages], deps, roots)
+
+    def to_json(self: Self) -> Dict[str, Any]:
+        return {"names": self.names, "versions": self.versions, "sizes": self.sizes, "deps": self.raw_deps, "roots": self.roots}
+
+    def find(self: Self, name: str) -> List[int]:
+        """按包名查找编号(忽略大小写与 -_. 的差异)"""
+
+        return self.ids.get(name.strip().lower().replace("_", "-").replace(".", "-"), [])
+
+    def label(self: Self, i: int) -> str:
+        return f"{self.names[i]} {self.versions[i]}".strip()
+
+    def get_deps(self: Self, i: int) -> List[Tuple[int, str]]:
+        """直接依赖: (编号, 说明)"""
+
+        return [(dep, "") if isinstance(dep, int) else (dep[0], dep[1]) for dep in self.raw_deps[i]]
+
+    def reach(self: Self, starts: List[int], blocked: Optional[Set[int]] = None) -> Set[int]:
+        """从 starts 出发可达的包(不经过 blocked)"""
+
+        blocked = blocked or set()
+        seen: Set[int] = {i for i in starts if i not in blocked}
+        queue: Deque[int] = deque(seen)
+        while queue:
+            for dep in self.deps[queue.popleft()]:
+                if dep not in seen and dep not in blocked:
+                    seen.add(dep)
+                    queue.append(dep)
+        return seen
+
+    def subtree(self: Self, i: int) -> Tuple[int, int]:
+        """包及其全部传递依赖的 (包数, 下载大小)"""
+
+        if i not in self.subtrees:
+            closure: Set[int] = self.reach([i])
+            self.subtrees[i] = (len(closure), sum(self.sizes[j] for j in closure))
+        return self.subtrees[i]
+
+    def path_to(self: Self, i: int) -> List[int]:
+        """从根到 i 的最短依赖链, 不可达时为空"""
+
+        if self.parents is None:
+            self.parents = {root: -1 for root in self.roots}
+            queue: Deque[int] = deque(self.roots)
+            while queue:
+                current: int = queue.popleft()
+                for dep in self.deps[current]:
+                    if dep not in self.parents:
+                        self.parents[dep] = current
+                        queue.append(dep)
+        if i not in self.parents:
+            return []
+        chain: List[int] = [i]
+        while self.parents[chain[-1]] != -1:
+            chain.append(self.parents[chain[-1]])
+        return chain[::-1]
+
+    def why(self: Self, name: str) -> List[List[int]]:
+        """为何安装: 经由每个直接依赖者的最短依赖链(根 -> ... -> 依赖者 -> 包)"""
+
+        chains: List[List[int]] = []
+        for i in self.find(name):
+            if i in self.roots:
+                chains.append([i])
+            for dependent in sorted(set(self.reverse[i]), key=lambda j: self.names[j]):
+                if chain := self.path_to(dependent):
+                    chains.append(chain + [i])
+        return sorted(chains, key=len)[:MAX_CHAINS]
+
+    def removal(self: Self, name: str) -> List[int]:
+        """移除该包后不再被任何根依赖的包(含其本身)"""
+
+        targets: Set[int] = set(self.find(name))
+        if not targets:
+            return []
+        before: Set[int] = self.reach(self.roots)
+        after: Set[int] = self.reach(self.roots, blocked=targets)
+        return sorted(before - after, key=lambda i: self.names[i])
+
+
+def hash_lock(path: Path) -> str:
+    """锁文件内容与平台的摘要"""
+
+    hasher: Any = hashlib.sha256(get_platform().encode())
+    hasher.update(path.read_bytes())
+    return hasher.hexdigest()
+
+
+class LockIndexCache:
+    """锁文件索引缓存: 进程内按文件状态缓存, 磁盘上按内容摘要缓存, 都未命中时才解析 TOML"""
+
+    def __init__(self: Self, path: Path = index_path) -> None:
+        self.path: Path = path
+        self.lock: threading.Lock = threading.Lock()
+        # 锁文件路径 -> (文件状态, 索引)
+        self.entries: Dict[str, Tuple[Any, LockIndex]] = {}
+        # 最近一次加载的来源: 内存 / 磁盘索引 / 解析
+        self.source: str = ""
+
+    def load(self: Self, lock: Path = lock_path) -> Optional[LockIndex]:
+        """锁文件的索引, 锁文件不存在时为 None"""
+
+        key: Optional[Tuple[int, int, int]] = ConfigStore.stat_key(lock)
+        if key is None:
+            return None
+        with self.lock:
+            entry: Optional[Tuple[Any, LockIndex]] = self.entries.get(str(lock))
+            if entry and entry[0] == key:
+                self.source = "内存"
+                return entry[1]
+            digest: str = hash_lock(lock)
+            index: Optional[LockIndex] = self.read(digest)
+            self.source = "磁盘索引"
+            if index is None:
+                with open(lock, "rb") as f:
+                    index = LockIndex.from_lock(tomllib.load(f))
+                self.write(digest, index)
+                self.source = "解析"
+            self.entries[str(lock)] = (key, index)
+            return index
+
+    def read(self: Self, digest: str) -> Optional[LockIndex]:
+        """摘要一致时读取磁盘上的索引"""
+
+        try:
+            data: Dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") != INDEX_VERSION or data.get("hash") != digest:
+                return None
+            return LockIndex(data["names"], data["versions"], data["sizes"], data["deps"], data["roots"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def write(self: Self, digest: str, index: LockIndex) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, json.dumps({"version": INDEX_VERSION, "hash": digest, **index.to_json()}, ensure_ascii=False, separators=(",", ":")))
+        except OSError:
+            # 缓存目录不可写时只在内存中缓存
+            pass
+
+
+lock_index_cache: LockIndexCache = LockIndexCache()
+
+
+def format_chain(index: LockIndex, chain: List[int]) -> str:
+    return " -> ".join(index.label(i) for i in chain)
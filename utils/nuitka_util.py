@@ -0,0 +1,79 @@
+# utils/nuitka_util.py
+from typing import Any, Dict, List, Mapping, Optional
+
+# 本模块不能导入 Qt: 命令行打包(main.py -b)只依赖这里的命令生成与配置读取
+from utils import config_util, build_matrix_util, python_path_util
+
+
+def load_nuitka_config() -> Mapping[str, Any]:
+    """读取 [tool.ouroboros.nuitka] 配置(只读视图, 含全局默认值)"""
+
+    return config_util.config_store.section("nuitka")
+
+
+def generate_command_string(profile: Optional[str] = None, overrides: Optional[Dict[str, Any]] = None) -> str:
+    """生成命令字符串, overrides 为叠加在已保存配置上的值"""
+
+    base_config: Mapping[str, Any] = load_nuitka_config()
+    nuitka_config: Dict[str, Any] = build_matrix_util.resolve_profile({**base_config, **overrides} if overrides else base_config, profile)
+    build_matrix_util.resolve_auto_jobs(nuitka_config, profile or build_matrix_util.DEFAULT_PROFILE_NAME)
+    nuitka_args: List[str] = generate_nuitka_args(nuitka_config)
+    python_path: str | None = python_path_util.get_python_path(nuitka_config)
+    if python_path:
+        return f'"{python_path}" {" ".join(nuitka_args)}'
+    return ""
+
+
+def generate_nuitka_args(nuitka_config: Dict[str, Any]) -> List[str]:
+    """根据配置生成 Nuitka 参数列表"""
+
+    nuitka_args: List[str] = ["-m", "nuitka"]
+    if entry := nuitka_config.get("entry"):
+        nuitka_args.append(entry)
+    if output_name := nuitka_config.get("output_name"):
+        nuitka_args.append(f"--output-filename={output_name}")
+    if output_dir := nuitka_config.get("output_dir"):
+        nuitka_args.append(f"--output-dir={output_dir}")
+    build_mode: str = nuitka_config.get("build_mode", "独立模式")
+    mode_map: Dict[str, str] = {
+        "独立模式": "--standalone",
+        "单文件模式": "--onefile",
+        "模块模式": "--module",
+    }
+    if build_mode in mode_map:
+        nuitka_args.append(mode_map[build_mode])
+    if nuitka_config.get("disable_console"):
+        nuitka_args.append("--windows-console-mode=disable")
+    if nuitka_config.get("remove_output"):
+        nuitka_args.append("--remove-output")
+    if nuitka_config.get("show_scons"):
+        nuitka_args.append("--show-scons")
+    if nuitka_config.get("assume_yes"):
+        nuitka_args.append("--assume-yes-for-downloads")
+    compiler: str = nuitka_config.get("compiler", "Auto")
+    compiler_map: Dict[str, str] = {
+        "MSVC": "--msvc=latest",
+        "MinGW64": "--mingw64",
+        "Clang": "--clang",
+    }
+    if compiler in compiler_map:
+        nuitka_args.append(compiler_map[compiler])
+    if not nuitka_config.get("ccache", True):
+        nuitka_args.append("--disable-ccache")
+    if jobs := nuitka_config.get("jobs"):
+        nuitka_args.append(f"--jobs={jobs}")
+    for plugin in nuitka_config.get("plugins", []):
+        nuitka_args.append(f"--enable-plugin={plugin}")
+    for pkg in nuitka_config.get("packages", []):
+        nuitka_args.append(f"--include-package={pkg}")
+    for module in nuitka_config.get("modules", []):
+        nuitka_args.append(f"--include-module={module}")
+    for no_import in nuitka_config.get("no_imports", []):
+        nuitka_args.append(f"--nofollow-import-to={no_import}")
+    for file_item in nuitka_config.get("files", []):
+        nuitka_args.append(f"--include-data-files={file_item}")
+    for dir_item in nuitka_config.get("dirs", []):
+        nuitka_args.append(f"--include-data-dir={dir_item}")
+    for extra_arg in nuitka_config.get("extra_args", []):
+        nuitka_args.append(extra_arg)
+    return nuitka_args
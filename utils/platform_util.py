@@ -2,6 +2,7 @@
 import os
 import platform
 import subprocess
+from pathlib import Path
 from typing import Optional
 
 
@@ -29,6 +30,16 @@ def is_linux() -> bool:
     return get_system() == "Linux"
 
 
+def user_cache_dir() -> Path:
+    """用户级缓存目录"""
+
+    if is_windows():
+        return Path(os.environ.get("LOCALAPPDATA", Path.home()))
+    if get_system() == "Darwin":
+        return Path.home() / "Library" / "Caches"
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+
+
 def run_command(command: str) -> None:
     """在后台线程中执行命令, GUI 退出后命令会继续运行"""
 
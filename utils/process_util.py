@@ -0,0 +1,361 @@
+# utils/process_util.py
+import os
+import re
+import time
+import shlex
+import signal
+import shutil
+import itertools
+import threading
+import subprocess
+import multiprocessing
+from enum import Enum
+from pathlib import Path
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Self, Set, TextIO
+
+from utils.platform_util import is_windows
+
+
+# 每个任务在内存中保留的最大输出行数
+DEFAULT_MAX_LINES: int = 5000
+# 保留的已结束任务数, 更早的任务连同输出一起丢弃
+DEFAULT_MAX_JOBS: int = 50
+
+
+class JobState(Enum):
+    PENDING = "等待中"
+    RUNNING = "运行中"
+    SUCCEEDED = "成功"
+    FAILED = "失败"
+    CANCELLED = "已取消"
+
+
+class OutputBuffer:
+    """固定容量的输出环形缓冲区, 可选地将全部输出写入日志文件"""
+
+    def __init__(self: Self, max_lines: int = DEFAULT_MAX_LINES, log_path: Optional[Path] = None) -> None:
+        self.lines: Deque[str] = deque(maxlen=max_lines)
+        self.total_lines: int = 0
+        self.log_path: Optional[Path] = log_path
+        self._log_file: Optional[TextIO] = None
+        if log_path:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._log_file = open(log_path, "w", encoding="utf-8")
+
+    def append(self: Self, line: str) -> None:
+        """追加一行, 超出容量时丢弃最旧的行"""
+
+        self.lines.append(line)
+        self.total_lines += 1
+        if self._log_file:
+            self._log_file.write(line + "\n")
+
+    def text(self: Self) -> str:
+        """缓冲区中的全部文本"""
+
+        return "\n".join(self.lines)
+
+    def close(self: Self) -> None:
+        """关闭日志文件"""
+
+        if self._log_file:
+            self._log_file.close()
+            self._log_file = None
+
+
+class Job:
+    """一个由若干条命令顺序组成的后台任务"""
+
+    _ids = itertools.count(1)
+
+    def __init__(
+        self: Self,
+        name: str,
+        commands: List[List[str]],
+        cpus: int = 0,
+        cwd: Optional[Path] = None,
+        stdout_path: Optional[Path] = None,
+        group: str = "",
+        max_lines: int = DEFAULT_MAX_LINES,
+        log_dir: Optional[Path] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.id: int = next(self._ids)
+        self.name: str = name
+        self.group: str = group
+        self.commands: List[List[str]] = commands
+        self.cpus: int = cpus
+        self.cwd: Path = cwd or Path.cwd()
+        self.stdout_path: Optional[Path] = stdout_path
+        # 在当前环境变量基础上追加的变量
+        self.env: Dict[str, str] = env or {}
+        safe_name: str = re.sub(r"[^\w.-]+", "_", name)
+        log_path: Optional[Path] = log_dir / f"{time.strftime('%Y%m%d-%H%M%S')}-{self.id}-{safe_name}.log" if log_dir else None
+        self.output: OutputBuffer = OutputBuffer(max_lines, log_path)
+        self.state: JobState = JobState.PENDING
+        self.returncode: Optional[int] = None
+        self.start_time: Optional[float] = None
+        self.end_time: Optional[float] = None
+        self.process: Optional[subprocess.Popen] = None
+        self.cancel_requested: bool = False
+        self.on_output: Optional[Callable[[str], None]] = None
+        self.done: threading.Event = threading.Event()
+
+    @property
+    def duration(self: Self) -> float:
+        """运行耗时(秒), 未开始时为 0"""
+
+        if self.start_time is None:
+            return 0.0
+        return (self.end_time or time.perf_counter()) - self.start_time
+
+    @property
+    def finished(self: Self) -> bool:
+        return self.done.is_set()
+
+    def wait(self: Self, timeout: Optional[float] = None) -> Optional[int]:
+        """等待任务结束并返回退出码"""
+
+        self.done.wait(timeout)
+        return self.returncode
+
+
+def resolve_executable(argv: List[str]) -> List[str]:
+    """在 PATH 中解析可执行文件(Windows 下可找到 conda.bat 等脚本)"""
+
+    if argv and not os.path.dirname(argv[0]):
+        if found := shutil.which(argv[0]):
+            return [found, *argv[1:]]
+    return argv
+
+
+def popen_group_kwargs() -> Dict[str, int | bool]:
+    """让子进程成为新进程组的组长, 以便整组终止"""
+
+    if is_windows():
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}  # pyright: ignore[reportAttributeAccessIssue]
+    return {"start_new_session": True}
+
+
+def kill_process_tree(process: subprocess.Popen, grace: float = 3.0) -> None:
+    """终止进程及其全部子进程(如编译器的 SCons 与 gcc 进程)"""
+
+    if process.poll() is not None:
+        return
+    if is_windows():
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(grace)
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+class ProcessManager:
+    """集中管理子进程: 不经过 shell 启动, 按 CPU 预算限制重型任务并发"""
+
+    def __init__(self: Self, cpu_budget: Optional[int] = None, max_lines: int = DEFAULT_MAX_LINES, log_dir: Optional[Path] = None, max_jobs: int = DEFAULT_MAX_JOBS) -> None:
+        self.cpu_budget: int = cpu_budget or multiprocessing.cpu_count()
+        self.cpus_in_use: int = 0
+        self.max_lines: int = max_lines
+        self.max_jobs: int = max_jobs
+        self.log_dir: Optional[Path] = log_dir
+        self.jobs: List[Job] = []
+        self.listeners: List[Callable[[Job], None]] = []
+        self.output_listeners: List[Callable[[Job, str], None]] = []
+        self._condition: threading.Condition = threading.Condition()
+
+    def configure(self: Self, config: Dict[str, Any]) -> None:
+        """读取 [tool.ouroboros.console] 中的缓冲区大小、保留的任务数与日志目录"""
+
+        console_config: Dict[str, Any] = config.get("tool", {}).get("ouroboros", {}).get("console", {})
+        self.max_lines = int(console_config.get("max_lines", DEFAULT_MAX_LINES))
+        self.max_jobs = int(console_config.get("max_jobs", DEFAULT_MAX_JOBS))
+        log_dir: str = console_config.get("log_dir", "")
+        self.log_dir = Path(log_dir).expanduser() if log_dir else None
+
+    def add_listener(self: Self, listener: Callable[[Job], None]) -> None:
+        """注册任务状态变化回调(在工作线程中调用)"""
+
+        self.listeners.append(listener)
+
+    def remove_listener(self: Self, listener: Callable[[Job], None]) -> None:
+        """移除任务状态变化回调"""
+
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def add_output_listener(self: Self, listener: Callable[[Job, str], None]) -> None:
+        """注册逐行输出回调(在读取线程中调用, 回调应尽快返回)"""
+
+        self.output_listeners.append(listener)
+
+    def remove_output_listener(self: Self, listener: Callable[[Job, str], None]) -> None:
+        """移除逐行输出回调"""
+
+        if listener in self.output_listeners:
+            self.output_listeners.remove(listener)
+
+    def submit(
+        self: Self,
+        name: str,
+        commands: List[List[str]],
+        cpus: int = 0,
+        cwd: Optional[Path] = None,
+        stdout_path: Optional[Path] = None,
+        on_finish: Optional[Callable[[Job], None]] = None,
+        group: str = "",
+        on_output: Optional[Callable[[str], None]] = None,
+        env: Optional[Dict[str, str]] = None,
+    ) -> Job:
+        """提交任务, cpus 为任务占用的核心数(0 表示轻量任务不受限制), group 标识任务所属页面"""
+
+        job: Job = Job(name, commands, min(cpus, self.cpu_budget), cwd, stdout_path, group, self.max_lines, self.log_dir, env)
+        job.on_output = on_output
+        self.prune()
+        self.jobs.append(job)
+        thread: threading.Thread = threading.Thread(target=self._run, args=(job, on_finish), name=f"job-{job.id}", daemon=True)
+        thread.start()
+        return job
+
+    def cancel(self: Self, job: Job) -> None:
+        """取消任务: 未开始的直接取消, 运行中的终止整个进程树"""
+
+        job.cancel_requested = True
+        with self._condition:
+            self._condition.notify_all()
+        if job.process is not None:
+            kill_process_tree(job.process)
+
+    def cancel_all(self: Self) -> None:
+        """取消所有未结束的任务"""
+
+        for job in self.active_jobs():
+            self.cancel(job)
+
+    def prune(self: Self) -> None:
+        """只保留最近的 max_jobs 个已结束任务, 未结束的任务全部保留"""
+
+        finished: List[Job] = [job for job in self.jobs if job.finished]
+        if len(finished) > self.max_jobs:
+            dropped: Set[int] = {job.id for job in finished[: len(finished) - self.max_jobs]}
+            self.jobs = [job for job in self.jobs if job.id not in dropped]
+
+    def active_jobs(self: Self) -> List[Job]:
+        """未结束的任务"""
+
+        return [job for job in self.jobs if not job.finished]
+
+    def _notify(self: Self, job: Job) -> None:
+        for listener in list(self.listeners):
+            listener(job)
+
+    def _acquire(self: Self, job: Job) -> bool:
+        """等待足够的 CPU 预算, 期间被取消则返回 False"""
+
+        with self._condition:
+            while self.cpus_in_use + job.cpus > self.cpu_budget and not job.cancel_requested:
+                self._condition.wait()
+            if job.cancel_requested:
+                return False
+            self.cpus_in_use += job.cpus
+            return True
+
+    def _release(self: Self, job: Job) -> None:
+        with self._condition:
+            self.cpus_in_use -= job.cpus
+            self._condition.notify_all()
+
+    def _run(self: Self, job: Job, on_finish: Optional[Callable[[Job], None]]) -> None:
+        acquired: bool = False
+        try:
+            self._notify(job)
+            acquired = self._acquire(job)
+            if acquired:
+                job.state = JobState.RUNNING
+                job.start_time = time.perf_counter()
+                self._notify(job)
+                job.returncode = self._run_commands(job)
+        except OSError as e:
+            self._emit(job, f"启动失败: {e}")
+            job.returncode = -1
+        except Exception as e:
+            self._emit(job, f"任务异常: {type(e).__name__}: {e}")
+            job.returncode = -1
+        finally:
+            # 任何异常都要释放 CPU 预算并结束任务, 否则等待者会一直阻塞
+            if acquired:
+                job.end_time = time.perf_counter()
+                self._release(job)
+            if job.cancel_requested:
+                job.state = JobState.CANCELLED
+            else:
+                job.state = JobState.SUCCEEDED if job.returncode == 0 else JobState.FAILED
+            job.output.close()
+            job.done.set()
+        if on_finish:
+            on_finish(job)
+        self._notify(job)
+
+    def _emit(self: Self, job: Job, line: str) -> None:
+        """记录一行输出并通知监听者"""
+
+        job.output.append(line)
+        if job.on_output:
+            job.on_output(line)
+        for listener in list(self.output_listeners):
+            listener(job, line)
+
+    def _run_commands(self: Self, job: Job) -> int:
+        """顺序执行任务中的命令并逐行读取输出, 遇到失败立即停止"""
+
+        returncode: int = 0
+        env: Dict[str, str] = dict(os.environ, PYTHONUNBUFFERED="1", **job.env)
+        for argv in job.commands:
+            if job.cancel_requested:
+                break
+            self._emit(job, f"$ {shlex.join(argv)}")
+            # 重定向到文件时只捕获错误输出
+            stdout = open(job.stdout_path, "w", encoding="utf-8") if job.stdout_path else subprocess.PIPE
+            try:
+                job.process = subprocess.Popen(
+                    resolve_executable(argv),
+                    cwd=job.cwd,
+                    env=env,
+                    stdout=stdout,
+                    stderr=subprocess.PIPE if job.stdout_path else subprocess.STDOUT,
+                    stdin=subprocess.DEVNULL,
+                    text=True,
+                    encoding="utf-8",
+                    errors="replace",
+                    **popen_group_kwargs(),  # pyright: ignore[reportArgumentType]
+                )
+                # 启动前一刻被取消
+                if job.cancel_requested:
+                    kill_process_tree(job.process)
+                stream: Optional[TextIO] = job.process.stderr if job.stdout_path else job.process.stdout
+                if stream:
+                    for line in stream:
+                        self._emit(job, line.rstrip("\r\n"))
+                returncode = job.process.wait()
+            finally:
+                if job.stdout_path and stdout:
+                    stdout.close()  # pyright: ignore[reportAttributeAccessIssue]
+            if returncode != 0:
+                break
+        return returncode
+
+
+def format_job(job: Job) -> str:
+    """单行描述任务状态"""
+
+    code: str = "-" if job.returncode is None else str(job.returncode)
+    return f"#{job.id} {job.name}: {job.state.value}, 退出码 {code}, 耗时 {job.duration:.1f}s"
+
+
+# 全局进程管理器
+process_manager: ProcessManager = ProcessManager()
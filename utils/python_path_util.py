@@ -1,24 +1,255 @@
 # utils/python_path_util.py
-import platform
-from typing import List
+import os
+import threading
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Self, Set, Tuple
 
+from utils import config_util
+from utils.platform_util import is_windows
+from utils.tool_util import find_dist_info, read_dist_version
 
-def get_python_path() -> str:
-    """获取可能的 Python 解释器路径"""
 
-    if platform.system() == "Windows":
-        possible_paths: List[Path] = [
-            Path.cwd() / ".venv" / "python.exe",
-            Path.cwd() / ".venv" / "Scripts" / "python.exe",
-        ]
-    elif platform.system() == "Linux":
-        possible_paths: List[Path] = [
-            Path.cwd() / ".venv" / "bin" / "python",
+# 配置中表示自动选择解释器的值
+AUTO_INTERPRETER: str = "Auto"
+# 自动选择时优先使用的项目虚拟环境
+DEFAULT_VENV: str = ".venv"
+# 环境前缀中解释器的相对路径, 按顺序查找
+INTERPRETER_PATHS: List[str] = ["Scripts/python.exe", "python.exe", "bin/python", "bin/python3"]
+# 并行检查候选环境的线程数
+DISCOVERY_WORKERS: int = 8
+
+
+class Interpreter:
+    """发现的解释器: 路径, 所在环境, 来源, 版本, ABI 与环境中的 Nuitka"""
+
+    def __init__(self: Self, path: Path, prefix: Path, kind: str, version: str, abi: str) -> None:
+        self.path: Path = path
+        self.prefix: Path = prefix
+        self.kind: str = kind
+        self.version: str = version
+        self.abi: str = abi
+        # 去重用的真实路径(conda 的 environments.txt 可能以其他形式记录同一环境)
+        self.real_prefix: Path = prefix.resolve()
+        self.site_packages: Optional[Path] = next((path for path in [prefix / "Lib" / "site-packages", *prefix.glob("lib/python*/site-packages")] if path.is_dir()), None)
+        # 环境中 Nuitka 的版本, 未安装时为空
+        self.nuitka: str = ""
+        # site-packages 的修改时间, 安装或卸载包后变化
+        self.packages_stamp: Optional[int] = None
+
+    def refresh_packages(self: Self) -> None:
+        """site-packages 变化时重新读取 Nuitka 版本"""
+
+        stamp: Optional[int] = dir_mtime(self.site_packages) if self.site_packages else None
+        if stamp == self.packages_stamp:
+            return
+        self.packages_stamp = stamp
+        metadata: Optional[Path] = find_dist_info(self.prefix, "nuitka")
+        self.nuitka = (read_dist_version(metadata) or "") if metadata else ""
+
+    def describe(self: Self) -> str:
+        """单行描述: 版本、ABI、来源与 Nuitka"""
+
+        nuitka: str = f"Nuitka {self.nuitka}" if self.nuitka else "未安装 Nuitka"
+        return f"Python {self.version or '未知版本'} ({self.abi or '-'}) · {self.kind} · {nuitka}"
+
+
+def dir_mtime(path: Path) -> Optional[int]:
+    """目录(或文件)的修改时间, 不存在时为 None"""
+
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def find_interpreter(prefix: Path) -> Optional[Path]:
+    """环境前缀中的解释器"""
+
+    for relative in INTERPRETER_PATHS:
+        path: Path = prefix / relative
+        if path.is_file():
+            return path
+    return None
+
+
+def read_version(prefix: Path) -> Tuple[str, bool]:
+    """不启动解释器读取版本: pyvenv.cfg、conda-meta 或 uv 的目录名, 返回 (版本, 是否自由线程)"""
+
+    free_threaded: bool = any(prefix.glob("lib/python3.*t")) or any(prefix.glob("python3.*t.exe"))
+    pyvenv: Path = prefix / "pyvenv.cfg"
+    if pyvenv.is_file():
+        for line in pyvenv.read_text(encoding="utf-8", errors="replace").splitlines():
+            key, _, value = line.partition("=")
+            if key.strip() in ("version", "version_info"):
+                return ".".join(value.strip().split(".")[:3]), free_threaded
+    for record in (prefix / "conda-meta").glob("python-3*.json"):
+        parts: List[str] = record.stem.rsplit("-", 2)
+        if len(parts) == 3 and parts[0] == "python":
+            return parts[1], free_threaded
+    # uv: cpython-3.13.1+freethreaded-linux-x86_64-gnu
+    parts = prefix.name.split("-")
+    if len(parts) > 1 and parts[0] in ("cpython", "pypy"):
+        version, _, variant = parts[1].partition("+")
+        return version, free_threaded or variant == "freethreaded"
+    return "", free_threaded
+
+
+def get_abi(version: str, free_threaded: bool) -> str:
+    """CPython 的 ABI 标签, 如 cp313 / cp313t"""
+
+    numbers: List[str] = version.split(".")
+    if len(numbers) < 2:
+        return ""
+    return f"cp{numbers[0]}{numbers[1]}{'t' if free_threaded else ''}"
+
+
+def inspect(prefix: Path, kind: str) -> Optional[Interpreter]:
+    """检查一个候选环境, 不是 Python 环境时返回 None"""
+
+    path: Optional[Path] = find_interpreter(prefix)
+    if path is None:
+        return None
+    version, free_threaded = read_version(prefix)
+    interpreter: Interpreter = Interpreter(path, prefix, kind, version, get_abi(version, free_threaded))
+    interpreter.refresh_packages()
+    return interpreter
+
+
+def list_project(root: Path) -> List[Path]:
+    """项目中的虚拟环境与 conda 环境(conda env create --prefix ./<名称>)"""
+
+    try:
+        children: List[Path] = sorted(path for path in root.iterdir() if path.is_dir())
+    except OSError:
+        return []
+    return [path for path in children if (path / "pyvenv.cfg").is_file() or (path / "conda-meta").is_dir()]
+
+
+def list_children(root: Path) -> List[Path]:
+    """目录中的每个子目录都是一个环境(~/.conda/envs、uv 的 Python 目录)"""
+
+    try:
+        return sorted(path for path in root.iterdir() if path.is_dir())
+    except OSError:
+        return []
+
+
+def list_conda_environments(file: Path) -> List[Path]:
+    """conda 记录的所有环境(含根环境与以 --prefix 创建的环境)"""
+
+    try:
+        lines: List[str] = file.read_text(encoding="utf-8", errors="replace").splitlines()
+    except OSError:
+        return []
+    return [Path(line.strip()) for line in lines if line.strip()]
+
+
+def uv_python_dir() -> Path:
+    """uv 安装 Python 的目录(可用 UV_PYTHON_INSTALL_DIR 覆盖)"""
+
+    if override := os.environ.get("UV_PYTHON_INSTALL_DIR"):
+        return Path(override)
+    if is_windows():
+        return Path(os.environ.get("APPDATA", Path.home())) / "uv" / "data" / "python"
+    return Path(os.environ.get("XDG_DATA_HOME", Path.home() / ".local" / "share")) / "uv" / "python"
+
+
+class InterpreterRegistry:
+    """解释器登记: 按来源目录的修改时间缓存扫描结果, 目录未变化时不重新扫描"""
+
+    def __init__(self: Self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        # 来源目录 -> (修改时间, 发现的解释器)
+        self.scans: Dict[str, Tuple[Optional[int], List[Interpreter]]] = {}
+
+    @staticmethod
+    def get_sources() -> List[Tuple[Path, str, Any]]:
+        """来源: (目录或文件, 来源名称, 列出候选环境的函数), 按优先级排列"""
+
+        home: Path = Path.home()
+        return [
+            (Path.cwd(), "项目环境", list_project),
+            (home / ".conda" / "envs", "conda 环境", list_children),
+            (home / ".conda" / "environments.txt", "conda 环境", list_conda_environments),
+            (uv_python_dir(), "uv Python", list_children),
         ]
-    else:
-        possible_paths: List[Path] = []
-    for path in possible_paths:
-        if path.exists():
-            return str(path)
-    return ""
+
+    def get_interpreters(self: Self, project_only: bool = False) -> List[Interpreter]:
+        """所有发现的解释器(同一环境只出现一次), 只重新扫描修改时间变化的来源"""
+
+        sources: List[Tuple[Path, str, Any]] = self.get_sources()[:1] if project_only else self.get_sources()
+        with self.lock:
+            stale: List[Tuple[Path, str, Any]] = [source for source in sources if self.scans.get(str(source[0]), (False,))[0] != dir_mtime(source[0])]
+            if stale:
+                self.rescan(stale)
+            found: List[Interpreter] = []
+            seen: Set[Path] = set()
+            for root, _, _ in sources:
+                for interpreter in self.scans[str(root)][1]:
+                    if interpreter.real_prefix not in seen:
+                        seen.add(interpreter.real_prefix)
+                        interpreter.refresh_packages()
+                        found.append(interpreter)
+            return found
+
+    def rescan(self: Self, sources: List[Tuple[Path, str, Any]]) -> None:
+        """并行列出候选环境并逐个检查"""
+
+        with ThreadPoolExecutor(DISCOVERY_WORKERS) as executor:
+            stamps: List[Optional[int]] = [dir_mtime(root) for root, _, _ in sources]
+            listed: List[List[Path]] = list(executor.map(lambda source: source[2](source[0]), sources))
+            inspected: List[List[Any]] = [[executor.submit(inspect, prefix, kind) for prefix in prefixes] for (_, kind, _), prefixes in zip(sources, listed)]
+            for (root, _, _), stamp, futures in zip(sources, stamps, inspected):
+                self.scans[str(root)] = (stamp, [interpreter for future in futures if (interpreter := future.result())])
+
+    def default(self: Self) -> Optional[Interpreter]:
+        """自动选择: 项目的 .venv, 其次是装有 Nuitka 的项目环境, 最后是任意项目环境"""
+
+        project: List[Interpreter] = self.get_interpreters(project_only=True)
+        for interpreter in project:
+            if interpreter.prefix.name == DEFAULT_VENV:
+                return interpreter
+        with_nuitka: List[Interpreter] = [interpreter for interpreter in project if interpreter.nuitka]
+        return (with_nuitka or project or [None])[0]
+
+    def find(self: Self, path: str) -> Optional[Interpreter]:
+        """按路径查找已发现的解释器"""
+
+        target: Path = resolve_path(path)
+        for interpreter in self.get_interpreters():
+            if interpreter.path == target:
+                return interpreter
+        return None
+
+
+interpreter_registry: InterpreterRegistry = InterpreterRegistry()
+
+
+def resolve_path(path: str) -> Path:
+    """配置中的解释器路径, 相对路径以项目根目录为准"""
+
+    resolved: Path = Path(path).expanduser()
+    return resolved if resolved.is_absolute() else Path.cwd() / resolved
+
+
+def display_path(path: Path) -> str:
+    """写入配置的解释器路径, 项目内的使用相对路径"""
+
+    try:
+        return path.relative_to(Path.cwd()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def get_python_path(nuitka_config: Optional[Mapping[str, Any]] = None) -> str:
+    """获取构建使用的解释器路径: 配置(或方案)中的 interpreter, 为 Auto 时自动选择项目环境"""
+
+    if nuitka_config is None:
+        nuitka_config = config_util.config_store.section("nuitka")
+    chosen: str = str(nuitka_config.get("interpreter") or AUTO_INTERPRETER)
+    if chosen != AUTO_INTERPRETER:
+        path: Path = resolve_path(chosen)
+        return str(path) if path.exists() else ""
+    interpreter: Optional[Interpreter] = interpreter_registry.default()
+    return str(interpreter.path) if interpreter else ""
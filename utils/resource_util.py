@@ -0,0 +1,71 @@
+# utils/resource_util.py
+import sys
+import shutil
+import hashlib
+import subprocess
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, List
+
+from utils.build_cache_util import hash_file
+
+
+# 资源目录
+resources_dir: Path = Path(__file__).resolve().parent.parent / "resources"
+# 资源描述文件
+qrc_path: Path = resources_dir / "icon.qrc"
+# 压缩后的二进制资源, 首次使用图标时加载
+rcc_path: Path = resources_dir / "icon.rcc"
+# 生成的 Python 资源模块, 找不到 icon.rcc 时导入
+module_path: Path = resources_dir / "icon.py"
+# 记录上次生成时输入的指纹
+stamp_path: Path = resources_dir / "icon.rcc.sha256"
+# 二进制资源的压缩参数(zlib 不依赖 Qt 是否编译了 zstd)
+RCC_OPTIONS: List[str] = ["--compress-algo", "zlib", "--compress", "9", "--threshold", "0"]
+
+
+def get_inputs(qrc: Path = qrc_path) -> List[Path]:
+    """资源描述文件中列出的文件"""
+
+    root: ET.Element = ET.parse(qrc).getroot()
+    return sorted(qrc.parent / (node.text or "").strip() for node in root.iter("file"))
+
+
+def get_fingerprint(qrc: Path = qrc_path) -> str:
+    """资源描述文件、其中列出的文件与压缩参数的摘要"""
+
+    hasher: Any = hashlib.sha256()
+    hasher.update(" ".join(RCC_OPTIONS).encode())
+    for path in [qrc, *get_inputs(qrc)]:
+        hasher.update(path.relative_to(qrc.parent).as_posix().encode())
+        hash_file(path, hasher)
+    return hasher.hexdigest()
+
+
+def get_rcc_command() -> List[str]:
+    """pyside6-rcc 的命令, 不在 PATH 中时通过当前解释器调用"""
+
+    if rcc := shutil.which("pyside6-rcc"):
+        return [rcc]
+    return [sys.executable, "-c", "from PySide6.scripts.pyside_tool import rcc; rcc()"]
+
+
+def is_up_to_date() -> bool:
+    """输出存在且输入指纹与上次生成时一致"""
+
+    if not (rcc_path.is_file() and module_path.is_file() and stamp_path.is_file()):
+        return False
+    return stamp_path.read_text(encoding="utf-8").strip() == get_fingerprint()
+
+
+def build_resources(force: bool = False) -> bool:
+    """输入变化时重新生成 icon.rcc 与 icon.py, 返回是否重新生成"""
+
+    if not force and is_up_to_date():
+        return False
+    rcc: List[str] = get_rcc_command()
+    # 相对路径以资源描述文件所在目录为准
+    subprocess.run([*rcc, *RCC_OPTIONS, "--binary", qrc_path.name, "-o", rcc_path.name], cwd=resources_dir, check=True)
+    subprocess.run([*rcc, qrc_path.name, "-o", module_path.name], cwd=resources_dir, check=True)
+    stamp_path.write_text(get_fingerprint() + "\n", encoding="utf-8")
+    return True
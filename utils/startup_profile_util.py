@@ -0,0 +1,167 @@
+# utils/startup_profile_util.py
+import sys
+import json
+import time
+import contextlib
+from pathlib import Path
+from importlib.machinery import ModuleSpec
+from typing import Any, Callable, Dict, Iterator, List, Optional, Self, Sequence
+
+from utils import build_history_util
+
+
+# 启动分析报告
+report_path: Path = Path.cwd() / ".ouroboros" / "startup_profile.json"
+# 摘要中显示的耗时最多的模块数
+TOP_IMPORTS: int = 15
+
+
+class ImportTimer:
+    """记录每个模块的导入耗时(含子模块的累计耗时与扣除子模块后的自身耗时)
+
+    作为 sys.meta_path 的第一个查找器, 找到模块后包装其加载器实例的 exec_module"""
+
+    def __init__(self: Self) -> None:
+        self.records: Dict[str, Dict[str, float]] = {}
+        # 正在导入的模块: [模块名, 子模块累计耗时]
+        self.stack: List[List[Any]] = []
+
+    def find_spec(self: Self, name: str, path: Optional[Sequence[str]], target: Any = None) -> Optional[ModuleSpec]:
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec: Optional[ModuleSpec] = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            # 内置与冻结模块的加载器是类本身, 包装会影响全局, 跳过
+            loader: Any = spec.loader
+            if loader is not None and not isinstance(loader, type) and hasattr(loader, "exec_module"):
+                loader.exec_module = self.wrap(name, loader.exec_module)
+            return spec
+        return None
+
+    def wrap(self: Self, name: str, exec_module: Callable[[Any], None]) -> Callable[[Any], None]:
+        def timed(module: Any) -> None:
+            self.stack.append([name, 0.0])
+            start: float = time.perf_counter()
+            try:
+                exec_module(module)
+            finally:
+                elapsed: float = time.perf_counter() - start
+                children: float = self.stack.pop()[1]
+                if self.stack:
+                    self.stack[-1][1] += elapsed
+                self.records[name] = {"cumulative": elapsed, "self": elapsed - children}
+
+        return timed
+
+    def install(self: Self) -> None:
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self: Self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+class StartupProfiler:
+    """记录 GUI 启动各阶段的耗时, 时间均相对于 begin(time.perf_counter)"""
+
+    def __init__(self: Self, begin: float) -> None:
+        self.begin: float = begin
+        self.imports: ImportTimer = ImportTimer()
+        # 阶段: 名称, 类别, 开始时间与耗时(秒)
+        self.phases: List[Dict[str, Any]] = []
+        # 时间点: 名称 -> 距 begin 的秒数
+        self.marks: Dict[str, float] = {}
+        # 样式表设置: 来源包 -> [次数, 总耗时]
+        self.stylesheets: Dict[str, List[float]] = {}
+
+    @contextlib.contextmanager
+    def measure(self: Self, name: str, kind: str) -> Iterator[None]:
+        """记录一个阶段的耗时"""
+
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({"name": name, "kind": kind, "start": start - self.begin, "duration": time.perf_counter() - start})
+
+    def mark(self: Self, name: str) -> None:
+        """记录一个时间点(只记录第一次)"""
+
+        self.marks.setdefault(name, time.perf_counter() - self.begin)
+
+    def add_stylesheet(self: Self, source: str, duration: float) -> None:
+        """记录一次 setStyleSheet 调用"""
+
+        entry: List[float] = self.stylesheets.setdefault(source, [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+
+    def to_dict(self: Self) -> Dict[str, Any]:
+        imports: List[Dict[str, Any]] = [{"module": name, **record} for name, record in self.imports.records.items()]
+        imports.sort(key=lambda record: record["self"], reverse=True)
+        return {
+            "timestamp": time.time(),
+            "revision": build_history_util.get_git_revision(),
+            "platform": sys.platform,
+            "python": sys.version.split()[0],
+            "marks": self.marks,
+            "phases": self.phases,
+            "stylesheets": {source: {"calls": int(calls), "duration": duration} for source, (calls, duration) in self.stylesheets.items()},
+            "imports": imports,
+        }
+
+    def write(self: Self, path: Path = report_path) -> Dict[str, Any]:
+        """写入 JSON 报告并返回报告内容"""
+
+        report: Dict[str, Any] = self.to_dict()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        return report
+
+
+_profiler: Optional[StartupProfiler] = None
+
+
+def start(begin: float) -> StartupProfiler:
+    """开始启动分析, 之后的导入都会被计时"""
+
+    global _profiler
+    _profiler = StartupProfiler(begin)
+    _profiler.imports.install()
+    return _profiler
+
+
+@contextlib.contextmanager
+def measure(name: str, kind: str) -> Iterator[None]:
+    """未开启启动分析时不做任何事"""
+
+    if _profiler is None:
+        yield
+        return
+    with _profiler.measure(name, kind):
+        yield
+
+
+def format_summary(report: Dict[str, Any]) -> str:
+    """按耗时从高到低输出各阶段、样式表与导入最慢的模块"""
+
+    lines: List[str] = [f"启动分析 @ {report.get('revision') or '-'}"]
+    for name, at in sorted(report["marks"].items(), key=lambda item: item[1]):
+        lines.append(f"  {name}: {at * 1000:.0f}ms")
+    # 首次空闲之后的阶段(其余页面的创建)不计入启动时间
+    idle: float = report["marks"].get("首次空闲", float("inf"))
+    lines.append("阶段(按耗时排序, * 为首次空闲之后):")
+    for phase in sorted(report["phases"], key=lambda phase: phase["duration"], reverse=True):
+        lines.append(f"  {phase['duration'] * 1000:>7.1f}ms {'*' if phase['start'] >= idle else ' '}[{phase['kind']}] {phase['name']}")
+    if report["stylesheets"]:
+        lines.append("样式表:")
+        for source, entry in sorted(report["stylesheets"].items(), key=lambda item: item[1]["duration"], reverse=True):
+            lines.append(f"  {entry['duration'] * 1000:>7.1f}ms  {source} ({entry['calls']} 次)")
+    imports: List[Dict[str, Any]] = report["imports"]
+    lines.append(f"导入(共 {len(imports)} 个模块, 自身耗时前 {TOP_IMPORTS} 个):")
+    for record in imports[:TOP_IMPORTS]:
+        lines.append(f"  {record['self'] * 1000:>7.1f}ms  {record['module']} (累计 {record['cumulative'] * 1000:.1f}ms)")
+    return "\n".join(lines)
@@ -1,5 +1,6 @@
 # styles/default.py
-from typing import Dict, Self
+import functools
+from typing import Dict, List, Self
 
 # =============== 模板 ===============
 
@@ -19,7 +20,7 @@ LABLE_STYLE: str = """
 """
 
 GROUPBOX_STYLE: str = """
-    QGroupBox {{
+    {selector} {{
         border: 1px solid #c0c0c0;
         border-radius: 5px;
         margin-top: 1ex;
@@ -28,7 +29,7 @@ GROUPBOX_STYLE: str = """
         padding-left: 10px;
         padding-right: 10px;
     }}
-    QGroupBox::title {{
+    {selector}::title {{
         subcontrol-origin: margin;
         subcontrol-position: top left;
         left: 10px;
@@ -39,14 +40,14 @@ GROUPBOX_STYLE: str = """
 """
 
 BUTTON_STYLE: str = """
-    PushButton {{
+    {selector} {{
         background-color: {button_normal};
         color: white;
     }}
-    PushButton:hover {{
+    {selector}:hover {{
         background-color: {button_hover};
     }}
-    PushButton:pressed {{
+    {selector}:pressed {{
         background-color: {button_pressed};
     }}
 """
@@ -100,27 +101,42 @@ PURPLE_THEME: Dict[str, str] = {
     "darker": "#7b1fa2",
 }
 
+# =============== 动态属性 ===============
+
+# 控件的配色名, 全局样式表按它选择配色
+THEME_PROPERTY: str = "theme"
+# 控件的用途: 页面背景、标题等不区分配色的样式
+ROLE_PROPERTY: str = "role"
+PAGE_ROLE: str = "page"
+TITLE_ROLE: str = "title"
+
 # =============== 单例 ===============
 
 
 class Style:
-    def __init__(self: Self, theme: Dict[str, str]) -> None:
+    def __init__(self: Self, name: str, theme: Dict[str, str]) -> None:
+        self.name: str = name
         self.theme: Dict[str, str] = theme
 
+    @functools.cache
     def get_lable_style(self: Self) -> str:
         lable_style: str = LABLE_STYLE.format(
             text=self.theme["dark"],
         )
         return lable_style
 
-    def get_groupbox_style(self: Self) -> str:
+    @functools.cache
+    def get_groupbox_style(self: Self, selector: str = "QGroupBox") -> str:
         groupbox_style: str = GROUPBOX_STYLE.format(
+            selector=selector,
             groupbox=self.theme["dark"],
         )
         return groupbox_style
 
-    def get_button_style(self: Self) -> str:
+    @functools.cache
+    def get_button_style(self: Self, selector: str = "PushButton") -> str:
         button_style: str = BUTTON_STYLE.format(
+            selector=selector,
             button_normal=self.theme["dark"],
             button_hover=self.theme["light"],
             button_pressed=self.theme["darker"],
@@ -128,11 +144,30 @@ class Style:
         return button_style
 
 
-default_style: Style = Style(DEFAULT_THEME)
-red_style: Style = Style(RED_THEME)
-orange_style: Style = Style(ORANGE_THEME)
-yellow_style: Style = Style(YELLOW_THEME)
-green_style: Style = Style(GREEN_THEME)
-blue_style: Style = Style(BLUE_THEME)
-indigo_style: Style = Style(INDIGO_THEME)
-purple_style: Style = Style(PURPLE_THEME)
+default_style: Style = Style("default", DEFAULT_THEME)
+red_style: Style = Style("red", RED_THEME)
+orange_style: Style = Style("orange", ORANGE_THEME)
+yellow_style: Style = Style("yellow", YELLOW_THEME)
+green_style: Style = Style("green", GREEN_THEME)
+blue_style: Style = Style("blue", BLUE_THEME)
+indigo_style: Style = Style("indigo", INDIGO_THEME)
+purple_style: Style = Style("purple", PURPLE_THEME)
+styles: Dict[str, Style] = {style.name: style for style in [default_style, red_style, orange_style, yellow_style, green_style, blue_style, indigo_style, purple_style]}
+
+# =============== 全局样式表 ===============
+
+
+@functools.cache
+def compile_stylesheet() -> str:
+    """将页面背景、标题与全部配色编译为一份全局样式表(只编译一次), 控件通过动态属性选择"""
+
+    page: str = f'QScrollArea[{ROLE_PROPERTY}="{PAGE_ROLE}"]'
+    rules: List[str] = [
+        f"{page}, {page} QWidget {{{BACKGROUND_STYLE}}}",
+        f'QLabel[{ROLE_PROPERTY}="{TITLE_ROLE}"] {{{TITLE_STYLE}}}',
+    ]
+    for name, style in styles.items():
+        selector: str = f'[{THEME_PROPERTY}="{name}"]'
+        rules.append(style.get_groupbox_style(f"QGroupBox{selector}"))
+        rules.append(f"QLabel{selector} {{{style.get_lable_style()}}}")
+    return "\n".join(rules)
@@ -0,0 +1,241 @@
+# utils/tool_util.py
+import os
+import json
+import time
+import shutil
+import threading
+import subprocess
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Self, Tuple
+
+from utils.config_util import ConfigStore, atomic_write
+from utils.platform_util import is_windows, user_cache_dir
+from utils.process_util import kill_process_tree, popen_group_kwargs
+
+
+# 版本缓存文件
+cache_path: Path = user_cache_dir() / "ouroboros" / "tools.json"
+# 缓存格式版本, 修改格式时递增以废弃旧缓存
+CACHE_VERSION: int = 1
+# 可执行文件所在的子目录, 其上一级为环境前缀
+PREFIX_SUBDIRS: List[str] = ["bin", "Scripts", "condabin"]
+
+
+def get_prefix(executable: Path) -> Path:
+    """可执行文件所在的环境前缀(如 .venv、conda 根目录)"""
+
+    return executable.parent.parent if executable.parent.name in PREFIX_SUBDIRS else executable.parent
+
+
+def find_dist_info(prefix: Path, package: str) -> Optional[Path]:
+    """在环境的 site-packages 中查找包的 METADATA"""
+
+    for site_packages in [prefix / "Lib" / "site-packages", *prefix.glob("lib/python*/site-packages")]:
+        if not site_packages.is_dir():
+            continue
+        for dist_info in site_packages.glob("*.dist-info"):
+            if dist_info.name.split("-")[0].lower().replace("_", "-") == package and (dist_info / "METADATA").is_file():
+                return dist_info / "METADATA"
+    return None
+
+
+def read_dist_version(metadata: Path) -> Optional[str]:
+    """读取 METADATA 头部的 Version 字段"""
+
+    with open(metadata, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if not line.strip():
+                break
+            if line.startswith("Version:"):
+                return line.split(":", 1)[1].strip()
+    return None
+
+
+def read_nuitka(executable: Path) -> Optional[Tuple[Path, str]]:
+    """解释器所在环境中的 Nuitka"""
+
+    metadata: Optional[Path] = find_dist_info(get_prefix(executable), "nuitka")
+    version: Optional[str] = read_dist_version(metadata) if metadata else None
+    return (metadata, version) if metadata and version else None
+
+
+def read_uv(executable: Path) -> Optional[Tuple[Path, str]]:
+    """通过 pip 安装的 uv 与其 dist-info 在同一环境"""
+
+    metadata: Optional[Path] = find_dist_info(get_prefix(executable), "uv")
+    version: Optional[str] = read_dist_version(metadata) if metadata else None
+    return (metadata, f"uv {version}") if metadata and version else None
+
+
+def read_conda(executable: Path) -> Optional[Tuple[Path, str]]:
+    """conda 根环境 conda-meta 中的 conda-<版本>-<构建>.json"""
+
+    for record in (get_prefix(executable) / "conda-meta").glob("conda-*.json"):
+        parts: List[str] = record.stem.rsplit("-", 2)
+        if len(parts) == 3 and parts[0] == "conda":
+            return record, f"conda {parts[1]}"
+    return None
+
+
+# 可从磁盘元数据读取版本的工具: 工具名(可执行文件名或 -m 的模块名) -> 读取函数, 返回 (元数据文件, 版本输出)
+METADATA_READERS: Dict[str, Callable[[Path], Optional[Tuple[Path, str]]]] = {
+    "nuitka": read_nuitka,
+    "uv": read_uv,
+    "conda": read_conda,
+}
+
+
+def get_tool_name(command: Tuple[str, ...]) -> str:
+    """`python -m nuitka --version` 为 nuitka, 其余为可执行文件名"""
+
+    if len(command) > 2 and command[1] == "-m":
+        return command[2]
+    return Path(command[0]).stem.lower()
+
+
+def run_command(command: List[str], timeout: float) -> "ToolVersion":
+    """运行版本命令, 超时则终止整个进程树"""
+
+    kwargs: Dict[str, Any] = popen_group_kwargs()
+    if is_windows():
+        kwargs["creationflags"] |= subprocess.CREATE_NO_WINDOW  # pyright: ignore[reportAttributeAccessIssue]
+    try:
+        process: subprocess.Popen = subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            **kwargs,
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_tree(process)
+            process.communicate()
+            return ToolVersion(False, f"超时({timeout:g}s)", "命令", timed_out=True)
+    except (subprocess.SubprocessError, OSError) as e:
+        return ToolVersion(False, str(e), "命令")
+    ok: bool = process.returncode == 0
+    return ToolVersion(ok, (stdout if ok else stderr).strip() or "Unknown error", "命令")
+
+
+class ToolVersion:
+    """版本查询结果, source 为 缓存 / 元数据 / 命令"""
+
+    def __init__(self: Self, ok: bool, output: str, source: str, timed_out: bool = False) -> None:
+        self.ok: bool = ok
+        self.output: str = output
+        self.source: str = source
+        self.timed_out: bool = timed_out
+
+
+class ToolRegistry:
+    """工具版本登记: 可执行文件每个进程只在 PATH 中解析一次, 版本优先读取磁盘元数据,
+    结果按 可执行文件(与元数据文件)的路径 + 修改时间 + 大小 持久缓存, 未变化时不启动子进程"""
+
+    def __init__(self: Self, path: Path = cache_path) -> None:
+        self.path: Path = path
+        self.lock: threading.Lock = threading.Lock()
+        # 命令 -> {"stamp": 文件状态, "output": 版本输出, "source": 来源, "checked": 上次确认的时间}
+        self.entries: Optional[Dict[str, Dict[str, Any]]] = None
+        # 可执行文件名 -> 解析出的路径
+        self.executables: Dict[str, Optional[str]] = {}
+
+    @staticmethod
+    def stamp(path: Path) -> Optional[List[Any]]:
+        """路径 + 修改时间 + 大小, 文件不存在时为 None"""
+
+        key: Optional[Tuple[int, int, int]] = ConfigStore.stat_key(path)
+        return [str(path), key[0], key[1]] if key else None
+
+    def load(self: Self) -> Dict[str, Dict[str, Any]]:
+        """首次使用时读取缓存文件, 损坏或版本不符时忽略"""
+
+        with self.lock:
+            if self.entries is None:
+                try:
+                    data: Dict[str, Any] = json.loads(self.path.read_text(encoding="utf-8"))
+                    self.entries = data["entries"] if data.get("version") == CACHE_VERSION else {}
+                except (OSError, ValueError, KeyError):
+                    self.entries = {}
+            return self.entries
+
+    def save(self: Self) -> None:
+        with self.lock:
+            content: str = json.dumps({"version": CACHE_VERSION, "entries": self.entries or {}}, ensure_ascii=False, indent=2)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, content)
+        except OSError:
+            # 缓存目录不可写时只在内存中缓存
+            pass
+
+    def which(self: Self, name: str) -> Optional[str]:
+        """在 PATH 中解析可执行文件(含 Windows 的 .bat 等), 结果在进程内缓存"""
+
+        if os.path.dirname(name):
+            return name if os.path.exists(name) else None
+        with self.lock:
+            if name not in self.executables:
+                self.executables[name] = shutil.which(name)
+            return self.executables[name]
+
+    def peek(self: Self, command: Tuple[str, ...]) -> Optional[str]:
+        """不检查文件状态, 直接返回上次缓存的版本输出(页面显示时立即使用)"""
+
+        entry: Optional[Dict[str, Any]] = self.load().get(" ".join(command))
+        return entry["output"] if entry else None
+
+    def is_fresh(self: Self, command: Tuple[str, ...], ttl: float) -> bool:
+        """缓存是否仍可信: 可执行文件与元数据文件未变化, 且在 ttl 秒内确认过"""
+
+        executable: Optional[str] = self.which(command[0]) if command[0] else None
+        entry: Optional[Dict[str, Any]] = self.load().get(" ".join(command))
+        if not executable or not entry or time.time() - entry.get("checked", 0) >= ttl:
+            return False
+        return self.matches(entry, Path(executable))
+
+    def matches(self: Self, entry: Dict[str, Any], path: Path) -> bool:
+        """缓存记录的文件状态与当前一致(元数据文件随包升级而变化, 可执行文件本身可能不变)"""
+
+        return entry["stamp"] == [self.stamp(path), *(self.stamp(Path(p)) for p in entry.get("metadata", []))]
+
+    def lookup(self: Self, command: Tuple[str, ...], timeout: float, force: bool = False) -> ToolVersion:
+        """查询版本: 文件状态未变时使用缓存, 否则读取元数据, 都不可用时运行命令; force 时不使用缓存"""
+
+        key: str = " ".join(command)
+        executable: Optional[str] = self.which(command[0]) if command[0] else None
+        if not executable:
+            return ToolVersion(False, f"在 PATH 中找不到 {command[0] or '解释器'}", "命令")
+        path: Path = Path(executable)
+        reader: Optional[Callable[[Path], Optional[Tuple[Path, str]]]] = METADATA_READERS.get(get_tool_name(command))
+        entries: Dict[str, Dict[str, Any]] = self.load()
+        entry: Optional[Dict[str, Any]] = entries.get(key)
+        if entry and not force and self.matches(entry, path):
+            return ToolVersion(True, entry["output"], "缓存")
+        found: Optional[Tuple[Path, str]] = reader(path) if reader else None
+        if found:
+            result: ToolVersion = ToolVersion(True, found[1], "元数据")
+            metadata: List[str] = [str(found[0])]
+        else:
+            result = run_command([executable, *command[1:]], timeout)
+            metadata = []
+        if result.ok:
+            with self.lock:
+                entries[key] = {"stamp": [self.stamp(path), *(self.stamp(Path(p)) for p in metadata)], "metadata": metadata, "output": result.output, "source": result.source, "checked": time.time()}
+            self.save()
+        return result
+
+    def invalidate(self: Self) -> None:
+        """丢弃全部缓存与已解析的可执行文件(安装或升级工具后)"""
+
+        with self.lock:
+            self.entries = {}
+            self.executables.clear()
+        self.save()
+
+
+tool_registry: ToolRegistry = ToolRegistry()